@@ -32,3 +32,26 @@ NEW_CONTEXT = {
     "locale": None,
     "userAgent": None
 }
+
+# Network cache: "live" (default), "record" (save traffic to HAR_FILE) or "replay" (serve from HAR_FILE offline)
+NETWORK_MODE = "live"
+HAR_FILE = "resources/files/har/demoqa.har"
+HAR_URL_FILTER = ""
+# Playwright resource types (image, font, media, stylesheet...) and domains aborted by the browser context
+BLOCKED_RESOURCE_TYPES = []
+BLOCKED_DOMAINS = []
+
+# Page performance: capture Navigation/Paint Timing after opening pages and validate the budgets (ms / bytes)
+CAPTURE_PERFORMANCE = False
+PERFORMANCE_BUDGET_MODE = "warn"
+PERFORMANCE_BUDGETS = {
+    "largestContentfulPaint": 2500,
+    "firstContentfulPaint": 1800
+}
+
+# Book Store API: "live" (https://demoqa.com) or a local stand-in server: "emulate", "record" or "replay"
+API_MODE = "live"
+API_LATENCY = 0
+
+# SQLite file (relative to ${EXECDIR}) sharing API users and tokens across tests and pabot workers
+TOKEN_CACHE_FILE = ".token_cache.db"
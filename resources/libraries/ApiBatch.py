@@ -0,0 +1,225 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from robot.api import logger
+from robot.api.deco import keyword, not_keyword
+from lazy_imports import lazy_import
+
+requests = lazy_import('requests')
+
+
+class ApiBatch:
+    """Library to send many HTTP requests concurrently over a shared keep-alive connection pool.
+
+    Requests run in a thread pool limited by `max_workers`, each one with its own timeout and
+    retries (connection errors, timeouts, 429 and 5xx responses). Only idempotent methods
+    (GET, HEAD, PUT, DELETE, OPTIONS) are retried: a POST or PATCH that timed out may have been
+    processed by the server, so retrying it could create duplicates. A request opts in with
+    `retry: True` in its dictionary. The responses are returned in the same order as the input,
+    so they can be used like the RequestsLibrary responses.
+
+    = Table of contents =
+
+    - max_workers: Maximum number of concurrent requests (default: 20)
+    - timeout: Timeout in seconds of each request (default: 10)
+    - retries: Number of retries of each request (default: 2)
+    - backoff: Base wait in seconds between retries, doubled on each retry (default: 0.2)
+
+    %TOC%
+
+    = Usage =
+
+    Library    ${EXECDIR}/resources/libraries/ApiBatch.py    max_workers=50
+
+    ${responses}=    Perform Get Requests Concurrently
+    ...    https://demoqa.com/BookStore/v1/Book?ISBN=$$    ${isbn_list}    headers=${HEADERS}
+    """
+
+    ROBOT_LIBRARY_SCOPE = 'GLOBAL'
+    RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+    IDEMPOTENT_METHODS = ('GET', 'HEAD', 'PUT', 'DELETE', 'OPTIONS')
+
+    def __init__(self, max_workers=20, timeout=10, retries=2, backoff=0.2):
+        """Initialize the ApiBatch library.
+
+        Args:
+            max_workers (int): Maximum number of concurrent requests (default: 20)
+            timeout (float): Timeout in seconds of each request (default: 10)
+            retries (int): Number of retries of each request (default: 2)
+            backoff (float): Base wait in seconds between retries (default: 0.2)
+        """
+        self.max_workers = int(max_workers)
+        self.timeout = float(timeout)
+        self.retries = int(retries)
+        self.backoff = float(backoff)
+        self._sessions = {}
+
+    @not_keyword
+    def get_session(self, pool_size):
+        """Return a session whose connection pool fits the number of concurrent requests.
+
+        Sessions are kept between calls, so the connections stay alive across batches.
+
+        Args:
+            pool_size (int): Maximum number of connections kept per host
+
+        Returns:
+            requests.Session: Shared session
+        """
+        if pool_size not in self._sessions:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=0)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            self._sessions[pool_size] = session
+        return self._sessions[pool_size]
+
+    @not_keyword
+    def send_request(self, session, request, timeout, retries):
+        """Send one request, retrying on connection errors, timeouts, 429 and 5xx responses.
+
+        Requests with a non idempotent method (POST, PATCH) are sent only once, unless the
+        request dictionary has `retry: True`.
+
+        Args:
+            session (requests.Session): Session used to send the request
+            request (dict): method, url and optional json, data, params, headers and retry
+            timeout (float): Timeout in seconds
+            retries (int): Number of retries of idempotent requests
+
+        Returns:
+            requests.Response: Last response received
+
+        Raises:
+            requests.RequestException: If the request still fails after all retries
+        """
+        method = request.get('method', 'GET').upper()
+        if method not in self.IDEMPOTENT_METHODS and not request.get('retry'):
+            retries = 0
+        for attempt in range(retries + 1):
+            try:
+                response = session.request(
+                    method,
+                    request['url'],
+                    json=request.get('json'),
+                    data=request.get('data'),
+                    params=request.get('params'),
+                    headers=request.get('headers') or None,
+                    timeout=timeout
+                )
+                if response.status_code not in self.RETRY_STATUS_CODES or attempt == retries:
+                    return response
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == retries:
+                    raise
+            time.sleep(self.backoff * (2 ** attempt))
+
+    @keyword('Perform Requests Concurrently')
+    def perform_requests_concurrently(self, requests_list, expected_status=200, max_workers=None,
+                                      timeout=None, retries=None):
+        """Send a list of requests concurrently and return the responses in the input order.
+
+        Only GET, HEAD, PUT, DELETE and OPTIONS requests are retried. Add `retry=${True}` to
+        the dictionary of a POST or PATCH request that is safe to send twice.
+
+        Args:
+            requests_list (list): Dictionaries with method, url and optional json, data, params, headers and retry
+            expected_status (int|str): Expected status code of every response, or 'any' to skip the validation (default: 200)
+            max_workers (int): Maximum number of concurrent requests (default: library setting)
+            timeout (float): Timeout in seconds of each request (default: library setting)
+            retries (int): Number of retries of each idempotent request (default: library setting)
+
+        Returns:
+            list: requests.Response objects in the same order as requests_list
+
+        Raises:
+            AssertionError: If any request fails or returns an unexpected status code
+
+        Example:
+            | ${responses}= | Perform Requests Concurrently | ${requests} | expected_status=201 | max_workers=50 |
+        """
+        max_workers = int(max_workers or self.max_workers)
+        timeout = self.timeout if timeout is None else float(timeout)
+        retries = self.retries if retries is None else int(retries)
+        session = self.get_session(max_workers)
+
+        def run(request):
+            try:
+                return self.send_request(session, request, timeout, retries)
+            except requests.RequestException as error:
+                return error
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(run, requests_list))
+        elapsed = time.perf_counter() - start
+        logger.info(f"{len(results)} requests sent in {elapsed:.2f}s with {max_workers} workers")
+
+        errors = []
+        for index, (request, result) in enumerate(zip(requests_list, results)):
+            if isinstance(result, Exception):
+                errors.append(f"[{index}] {request.get('method', 'GET')} {request['url']}: {result}")
+            elif str(expected_status).lower() != 'any' and result.status_code != int(expected_status):
+                errors.append(
+                    f"[{index}] {request.get('method', 'GET')} {request['url']}: "
+                    f"expected status {expected_status} but received {result.status_code}"
+                )
+        if errors:
+            raise AssertionError(f"{len(errors)} of {len(results)} requests failed:\n" + '\n'.join(errors))
+        return results
+
+    @keyword('Perform Get Requests Concurrently')
+    def perform_get_requests_concurrently(self, url_template, values, headers=None, expected_status=200,
+                                          max_workers=None, timeout=None, retries=None):
+        """Send one GET request for each value, replacing the '$$' marker of the URL template.
+
+        Args:
+            url_template (str): URL containing the '$$' marker, e.g. https://demoqa.com/BookStore/v1/Book?ISBN=$$
+            values (list): Values that replace the '$$' marker, one request per value
+            headers (dict): Headers of every request (default: no headers)
+            expected_status (int|str): Expected status code, or 'any' (default: 200)
+            max_workers (int): Maximum number of concurrent requests (default: library setting)
+            timeout (float): Timeout in seconds of each request (default: library setting)
+            retries (int): Number of retries of each request (default: library setting)
+
+        Returns:
+            list: requests.Response objects in the same order as values
+
+        Example:
+            | ${responses}= | Perform Get Requests Concurrently | ${LIS_BOOKS_ISBN_EP} | ${isbn_list} | ${HEADERS} |
+        """
+        requests_list = [
+            {'method': 'GET', 'url': url_template.replace('$$', str(value), 1), 'headers': headers}
+            for value in values
+        ]
+        return self.perform_requests_concurrently(requests_list, expected_status, max_workers, timeout, retries)
+
+    @keyword('Perform Post Requests Concurrently')
+    def perform_post_requests_concurrently(self, url, bodies, headers=None, expected_status=200,
+                                           max_workers=None, timeout=None, retries=None, retry=False):
+        """Send one POST request with a JSON body for each body of the list.
+
+        POST requests are not retried by default: a request that timed out may already have
+        created the resource (e.g. a user or a book). Use `retry=${True}` only for endpoints
+        that are safe to call twice.
+
+        Args:
+            url (str): URL of every request
+            bodies (list): JSON bodies, one request per body
+            headers (dict): Headers of every request (default: no headers)
+            expected_status (int|str): Expected status code, or 'any' (default: 200)
+            max_workers (int): Maximum number of concurrent requests (default: library setting)
+            timeout (float): Timeout in seconds of each request (default: library setting)
+            retries (int): Number of retries of each request when retry is enabled (default: library setting)
+            retry (bool): Retry the requests on connection errors, timeouts, 429 and 5xx responses (default: False)
+
+        Returns:
+            list: requests.Response objects in the same order as bodies
+
+        Example:
+            | ${responses}= | Perform Post Requests Concurrently | ${CREATE_ACCOUNT_EP} | ${bodies} | ${HEADERS} | 201 |
+        """
+        requests_list = [
+            {'method': 'POST', 'url': url, 'json': body, 'headers': headers, 'retry': bool(retry)}
+            for body in bodies
+        ]
+        return self.perform_requests_concurrently(requests_list, expected_status, max_workers, timeout, retries)
@@ -0,0 +1,365 @@
+import json
+import os
+import secrets
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+from robot.api import logger
+from robot.api.deco import keyword, not_keyword
+from lazy_imports import lazy_import
+
+requests = lazy_import('requests')
+
+FILES_DIR = Path(__file__).resolve().parent.parent / 'files' / 'json'
+BOOKS_FILE = FILES_DIR / 'book_store_books.json'
+RECORDING_FILE = FILES_DIR / 'book_store_recording.json'
+UPSTREAM_URL = 'https://demoqa.com'
+UPSTREAM_TIMEOUT = 30
+MODES = ('emulate', 'record', 'replay')
+FORWARDED_HEADERS = ('accept', 'content-type', 'authorization')
+
+
+class BookStoreEmulator:
+    """In-memory implementation of the Book Store Account and BookStore endpoints."""
+
+    def __init__(self, books_file=BOOKS_FILE):
+        """Load the book catalog and pre-serialize the book responses.
+
+        Args:
+            books_file (Path): JSON file with the book catalog
+        """
+        with open(books_file, encoding='utf-8') as f:
+            catalog = json.load(f)
+        self.books_response = json.dumps(catalog).encode('utf-8')
+        self.book_responses = {
+            book['isbn']: json.dumps(book).encode('utf-8') for book in catalog['books']
+        }
+        self.users = {}
+        self.tokens = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def error(status, code, message):
+        return status, json.dumps({'code': code, 'message': message}).encode('utf-8')
+
+    @staticmethod
+    def ok(status, payload):
+        return status, json.dumps(payload).encode('utf-8')
+
+    def handle(self, method, path, query, body, headers):
+        """Route a request to the emulated endpoint.
+
+        Args:
+            method (str): HTTP method
+            path (str): Request path
+            query (dict): Parsed query string
+            body (bytes): Request body
+            headers (dict): Request headers with lowercase names
+
+        Returns:
+            tuple: Status code and JSON response body (bytes)
+        """
+        if method == 'GET' and path == '/BookStore/v1/Books':
+            return 200, self.books_response
+        if method == 'GET' and path == '/BookStore/v1/Book':
+            isbn = query.get('ISBN', [''])[0]
+            if isbn in self.book_responses:
+                return 200, self.book_responses[isbn]
+            return self.error(400, '1205', 'ISBN supplied is not available in Books Collection!')
+
+        if path.startswith('/Account/v1/User/'):
+            return self.handle_user(method, path.rsplit('/', 1)[-1], headers)
+
+        if method != 'POST' or path not in ('/Account/v1/User', '/Account/v1/GenerateToken', '/Account/v1/Authorized'):
+            return self.error(404, '404', f'Resource not found: {method} {path}')
+
+        try:
+            credentials = json.loads(body or b'{}')
+        except ValueError:
+            credentials = {}
+        username = credentials.get('userName')
+        password = credentials.get('password')
+        if not username or not password:
+            return self.error(400, '1200', 'UserName and Password required.')
+
+        with self.lock:
+            user = self.users.get(username)
+            if path == '/Account/v1/User':
+                if user:
+                    return self.error(406, '1204', 'User exists!')
+                user = {'userID': str(uuid.uuid4()), 'username': username, 'password': password, 'books': []}
+                self.users[username] = user
+                return self.ok(201, {'userID': user['userID'], 'username': username, 'books': []})
+
+            if path == '/Account/v1/GenerateToken':
+                if not user or user['password'] != password:
+                    return self.ok(200, {'token': None, 'expires': None, 'status': 'Failed',
+                                         'result': 'User authorization failed.'})
+                expires = datetime.now(timezone.utc) + timedelta(days=7)
+                user['token'] = secrets.token_urlsafe(32)
+                self.tokens[user['token']] = user
+                return self.ok(200, {'token': user['token'],
+                                     'expires': expires.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z',
+                                     'status': 'Success', 'result': 'User authorized successfully.'})
+
+            if not user or user['password'] != password:
+                return self.error(404, '1207', 'User not found!')
+            return self.ok(200, 'token' in user)
+
+    def handle_user(self, method, user_id, headers):
+        """Handle GET and DELETE of /Account/v1/User/{UUID}, authorized by the Bearer token."""
+        token = headers.get('authorization', '').replace('Bearer ', '', 1)
+        with self.lock:
+            user = self.tokens.get(token)
+            if not user:
+                return self.error(401, '1200', 'User not authorized!')
+            if user['userID'] != user_id:
+                return self.error(200 if method == 'DELETE' else 401, '1207', 'User Id not correct!')
+            if method == 'GET':
+                return self.ok(200, {'userId': user['userID'], 'username': user['username'], 'books': user['books']})
+            if method == 'DELETE':
+                self.users.pop(user['username'], None)
+                self.tokens.pop(token, None)
+                return 204, b''
+        return self.error(404, '404', f'Resource not found: {method} /Account/v1/User/{user_id}')
+
+
+class StandInRequestHandler(BaseHTTPRequestHandler):
+    """HTTP/1.1 keep-alive handler that delegates every request to the stand-in server."""
+
+    protocol_version = 'HTTP/1.1'
+    # Send headers and body in one buffered write, without waiting for delayed ACKs
+    wbufsize = 64 * 1024
+    disable_nagle_algorithm = True
+
+    def handle_request(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        status, content, content_type = self.server.stand_in.dispatch(
+            self.command, self.path, body, {name.lower(): value for name, value in self.headers.items()}
+        )
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_GET = do_POST = do_PUT = do_DELETE = handle_request
+
+    def log_message(self, format, *args):
+        pass
+
+
+class BookStoreStandIn:
+    """Library to run a local stand-in server for the Book Store API (Account and BookStore endpoints).
+
+    The server runs in a background thread of the Robot process (or from the command line),
+    so the API suites can run offline and in parallel without rate limits.
+
+    = Table of contents =
+
+    - mode: emulate (in-memory implementation), record (proxy to the real API and save the responses)
+      or replay (serve the recorded responses, emulating requests that were not recorded)
+    - port: Port of the server; 0 selects a free port, so each pabot worker has its own server
+    - latency: Delay in seconds injected in every response
+    - recording_file: JSON file with the recorded responses
+
+    %TOC%
+
+    = Usage =
+
+    ${url}=    Start Book Store Stand-In Server    mode=replay    latency=0.05
+    Stop Book Store Stand-In Server
+
+    From the command line:
+
+    python resources/libraries/BookStoreStandIn.py --mode emulate --port 8080
+    """
+
+    ROBOT_LIBRARY_SCOPE = 'GLOBAL'
+
+    def __init__(self):
+        """Initialize the BookStoreStandIn library."""
+        self.server = None
+        self.thread = None
+        self.mode = 'emulate'
+        self.latency = 0.0
+        self.upstream = UPSTREAM_URL
+        self.upstream_timeout = UPSTREAM_TIMEOUT
+        self.recording_file = RECORDING_FILE
+        self.recordings = {}
+        self.emulator = None
+        self.session = None
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def recording_key(method, path, body):
+        """Return the key of a request in the recordings, ignoring the JSON body formatting."""
+        try:
+            body = json.dumps(json.loads(body), sort_keys=True) if body else ''
+        except ValueError:
+            body = body.decode('utf-8', errors='replace')
+        return f"{method} {path} {body}".strip()
+
+    @not_keyword
+    def dispatch(self, method, path, body, headers):
+        """Answer a request according to the server mode.
+
+        Args:
+            method (str): HTTP method
+            path (str): Request path with query string
+            body (bytes): Request body
+            headers (dict): Request headers with lowercase names
+
+        Returns:
+            tuple: Status code, response body (bytes) and content type
+        """
+        if self.latency:
+            time.sleep(self.latency)
+        key = self.recording_key(method, path, body)
+
+        if self.mode == 'record':
+            try:
+                response = self.session.request(
+                    method, self.upstream + path, data=body or None, timeout=self.upstream_timeout,
+                    headers={name: value for name, value in headers.items() if name in FORWARDED_HEADERS}
+                )
+            except requests.RequestException as e:
+                # Upstream failures are answered as an API error and not recorded
+                print(f"Book Store upstream request {method} {path} failed: {e}")
+                status, content = BookStoreEmulator.error(502, '502', f"Upstream request failed: {e}")
+                return status, content, 'application/json; charset=utf-8'
+            content_type = response.headers.get('Content-Type', 'application/json')
+            with self.lock:
+                self.recordings[key] = {'status': response.status_code, 'content_type': content_type,
+                                        'body': response.text}
+            return response.status_code, response.content, content_type
+
+        if self.mode == 'replay':
+            recording = self.recordings.get(key)
+            if recording:
+                return recording['status'], recording['body'].encode('utf-8'), recording['content_type']
+
+        url = urlsplit(path)
+        status, content = self.emulator.handle(method, url.path, parse_qs(url.query), body, headers)
+        return status, content, 'application/json; charset=utf-8'
+
+    @not_keyword
+    def save_recordings(self):
+        """Save the recorded responses to the recording file."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.recording_file)), exist_ok=True)
+        with open(self.recording_file, 'w', encoding='utf-8') as f:
+            json.dump(self.recordings, f, indent=2, ensure_ascii=False)
+        print(f"Book Store recordings saved at: {self.recording_file}")
+
+    @keyword('Start Book Store Stand-In Server')
+    def start_book_store_stand_in_server(self, mode='emulate', port=0, latency=0, recording_file=None,
+                                         upstream=UPSTREAM_URL, host='127.0.0.1', upstream_timeout=UPSTREAM_TIMEOUT):
+        """Start the Book Store stand-in server in a background thread.
+
+        Args:
+            mode (str): emulate, record or replay (default: emulate)
+            port (int): Server port, 0 selects a free port (default: 0)
+            latency (float): Delay in seconds injected in every response (default: 0)
+            recording_file (str): JSON file with the recorded responses (default: resources/files/json/book_store_recording.json)
+            upstream (str): Real API URL used in record mode (default: https://demoqa.com)
+            host (str): Server host (default: 127.0.0.1)
+            upstream_timeout (float): Timeout in seconds of the real API requests in record mode,
+                a failed request is answered with a 502 error and not recorded (default: 30)
+
+        Returns:
+            str: Base URL of the server, to be used in place of ${DEMOQA_URL}
+
+        Raises:
+            ValueError: If the mode is invalid
+            RuntimeError: If the server is already running
+
+        Example:
+            | ${url}= | Start Book Store Stand-In Server | mode=replay | latency=0.05 |
+        """
+        mode = str(mode).lower()
+        if mode not in MODES:
+            raise ValueError(f"Invalid stand-in mode '{mode}'. Expected one of: {', '.join(MODES)}")
+        if self.server:
+            raise RuntimeError(f"Book Store stand-in server already running at {self.get_url()}")
+
+        self.mode = mode
+        self.latency = float(latency)
+        self.upstream = upstream.rstrip('/')
+        self.upstream_timeout = float(upstream_timeout)
+        self.recording_file = recording_file or RECORDING_FILE
+        self.recordings = {}
+        if mode == 'replay' and os.path.exists(self.recording_file):
+            with open(self.recording_file, encoding='utf-8') as f:
+                self.recordings = json.load(f)
+        self.emulator = BookStoreEmulator()
+        self.session = requests.Session() if mode == 'record' else None
+
+        self.server = ThreadingHTTPServer((host, int(port)), StandInRequestHandler)
+        self.server.daemon_threads = True
+        self.server.stand_in = self
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        logger.info(f"Book Store stand-in server started in {mode} mode at {self.get_url()}")
+        return self.get_url()
+
+    @keyword('Stop Book Store Stand-In Server')
+    def stop_book_store_stand_in_server(self):
+        """Stop the Book Store stand-in server, saving the recorded responses in record mode."""
+        if not self.server:
+            return
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        if self.mode == 'record':
+            self.save_recordings()
+        self.server = None
+        self.thread = None
+
+    @not_keyword
+    def get_url(self):
+        """Return the base URL of the running server."""
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def main():
+    """
+    Main function for command-line execution.
+
+    Command-line arguments:
+        --mode: emulate, record or replay (default: emulate)
+        --port: Server port (default: 8080)
+        --host: Server host (default: 127.0.0.1)
+        --latency: Delay in seconds injected in every response (default: 0)
+        --recording-file: JSON file with the recorded responses
+
+    Example usage:
+        python BookStoreStandIn.py --mode replay --port 8080 --latency 0.05
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Book Store API stand-in server')
+    parser.add_argument('--mode', choices=MODES, default='emulate', help='Server mode (default: emulate)')
+    parser.add_argument('--port', type=int, default=8080, help='Server port (default: 8080)')
+    parser.add_argument('--host', default='127.0.0.1', help='Server host (default: 127.0.0.1)')
+    parser.add_argument('--latency', type=float, default=0, help='Injected latency in seconds (default: 0)')
+    parser.add_argument('--recording-file', default=str(RECORDING_FILE), help='JSON file with the recorded responses')
+    args = parser.parse_args()
+
+    stand_in = BookStoreStandIn()
+    url = stand_in.start_book_store_stand_in_server(args.mode, args.port, args.latency, args.recording_file,
+                                                   host=args.host)
+    print(f"Book Store stand-in server running in {args.mode} mode at {url} (Ctrl+C to stop)")
+    try:
+        stand_in.thread.join()
+    except KeyboardInterrupt:
+        stand_in.stop_book_store_stand_in_server()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,12 @@
-from PIL import Image, ImageChops
-import numpy as np
-import requests
 from io import BytesIO
-from skimage.metrics import structural_similarity as ssim
 from robot.api.deco import not_keyword, keyword
+from lazy_imports import lazy_import
+
+Image = lazy_import('PIL.Image')
+ImageChops = lazy_import('PIL.ImageChops')
+np = lazy_import('numpy')
+requests = lazy_import('requests')
+skimage_metrics = lazy_import('skimage.metrics')
 
 
 class CompareTwoImages:
@@ -84,7 +87,7 @@ class CompareTwoImages:
             arr2 = np.array(img2)
 
             # Calculate similarity using SSIM
-            sim_index, _ = ssim(arr1, arr2, full=True)
+            sim_index, _ = skimage_metrics.structural_similarity(arr1, arr2, full=True)
             sim_index_perc = sim_index * 100
 
             # Check if similarity is above the threshold
@@ -0,0 +1,242 @@
+import os
+import shutil
+from robot.api import logger
+from robot.api.deco import keyword, not_keyword
+import spreadsheets
+
+
+class DataSourceCache:
+    """Library to read spreadsheet test data from a memory-mapped columnar cache.
+
+    Reading an .xlsx file parses the whole workbook XML, on every suite and every pabot
+    worker. The first read converts the spreadsheet to a columnar copy keyed by the SHA-256
+    of the file and its sheet (one data file per column, with NumPy offsets and null arrays).
+    Later reads memory-map the copy, select only the requested columns and rows, and return
+    the rows lazily: a row is decoded only when a test uses it. Editing the spreadsheet
+    changes its hash, so a new copy is converted on the next read.
+
+    Every value is returned as a string (None for empty cells).
+
+    = Table of contents =
+
+    - data_source: Path to the spreadsheet (.xlsx, .xlsm, .csv, .parquet or .xls)
+    - cache_dir: Folder of the columnar cache (default: .data_source_cache in the execution directory)
+    - sheet: Name of the Excel sheet (default: active sheet)
+
+    %TOC%
+
+    = Usage =
+
+    Library    ${EXECDIR}/resources/libraries/DataSourceCache.py    cache_dir=${EXECDIR}/.data_source_cache
+
+    ${rows}=    Get Data Source Rows    ${EXECDIR}/resources/files/spreadsheets/users.xlsx    columns=name,email    start=0    end=100
+    FOR    ${row}    IN    @{rows}
+        Log    ${row}[email]
+    END
+    """
+
+    ROBOT_LIBRARY_SCOPE = 'GLOBAL'
+
+    def __init__(self, cache_dir=spreadsheets.DEFAULT_CACHE_DIR):
+        """Initialize the DataSourceCache library.
+
+        Args:
+            cache_dir (str): Folder of the columnar cache (default: .data_source_cache)
+        """
+        self.cache_dir = cache_dir
+        self._tables = {}
+
+    @not_keyword
+    def get_table(self, data_source, sheet=None):
+        """Return the columnar copy of a spreadsheet, converting it on the first use.
+
+        The opened table is kept while the spreadsheet hash does not change. The table of a
+        previous version of the spreadsheet is closed, its entry is removed by the conversion.
+
+        Args:
+            data_source (str): Path to the spreadsheet
+            sheet (str): Name of the Excel sheet (default: active sheet)
+
+        Returns:
+            spreadsheets.ColumnarTable: Memory-mapped columnar copy
+        """
+        entry_dir = spreadsheets.cache_entry_dir(data_source, self.cache_dir, sheet)
+        key = (os.path.abspath(data_source), sheet)
+        table = self._tables.get(key)
+        if table is None or table.entry_dir != entry_dir or not os.path.isdir(entry_dir):
+            if table is not None:
+                table.close()
+            table = spreadsheets.open_table(data_source, self.cache_dir, sheet)
+            self._tables[key] = table
+        return table
+
+    @staticmethod
+    @not_keyword
+    def split_columns(columns):
+        """Convert a comma separated string of column names to a list.
+
+        Args:
+            columns (str|list): Column names, e.g. `name,email` (default: None for all columns)
+
+        Returns:
+            list: Column names, or None for all columns
+        """
+        if columns is None or isinstance(columns, (list, tuple)):
+            return columns
+        return [column.strip() for column in str(columns).split(',') if column.strip()]
+
+    @keyword('Convert Data Source')
+    def convert_data_source(self, data_source, sheet=None):
+        """Convert a spreadsheet to the columnar cache, unless it is already converted.
+
+        Converting the data sources in a suite setup, or before starting pabot, avoids every
+        worker parsing the spreadsheet at the same time.
+
+        Args:
+            data_source (str): Path to the spreadsheet
+            sheet (str): Name of the Excel sheet (default: active sheet)
+
+        Returns:
+            str: Folder of the cache entry
+
+        Example:
+            | Convert Data Source | ${EXECDIR}/resources/files/spreadsheets/users.xlsx | sheet=Users |
+        """
+        table = self.get_table(data_source, sheet)
+        logger.info(f"{data_source}: {len(table)} rows, columns {table.columns}, cached in {table.entry_dir}")
+        return table.entry_dir
+
+    @keyword('Get Data Source Columns')
+    def get_data_source_columns(self, data_source, sheet=None):
+        """Return the column names of a spreadsheet.
+
+        Args:
+            data_source (str): Path to the spreadsheet
+            sheet (str): Name of the Excel sheet (default: active sheet)
+
+        Returns:
+            list: Column names
+
+        Example:
+            | ${columns}= | Get Data Source Columns | ${EXECDIR}/resources/files/spreadsheets/users.xlsx |
+        """
+        return list(self.get_table(data_source, sheet).columns)
+
+    @keyword('Get Data Source Row Count')
+    def get_data_source_row_count(self, data_source, sheet=None):
+        """Return the number of data rows of a spreadsheet, without the header.
+
+        Args:
+            data_source (str): Path to the spreadsheet
+            sheet (str): Name of the Excel sheet (default: active sheet)
+
+        Returns:
+            int: Number of rows
+
+        Example:
+            | ${count}= | Get Data Source Row Count | ${EXECDIR}/resources/files/spreadsheets/users.xlsx |
+        """
+        return len(self.get_table(data_source, sheet))
+
+    @keyword('Get Data Source Rows')
+    def get_data_source_rows(self, data_source, columns=None, start=0, end=None, sheet=None):
+        """Return rows of a spreadsheet as a lazy list of dictionaries.
+
+        Only the selected columns are read, and a row is decoded only when it is used
+        (indexing, FOR loops, slicing), so selecting a few rows of a large sheet is cheap.
+        The rows cannot be read after `Clear Data Source Cache` or after the spreadsheet
+        changes and is converted again: get them again.
+
+        Args:
+            data_source (str): Path to the spreadsheet
+            columns (str|list): Column names, comma separated (default: all columns)
+            start (int): Index of the first row, 0 for the first data row (default: 0)
+            end (int): Index after the last row, negative to count from the end (default: last row)
+            sheet (str): Name of the Excel sheet (default: active sheet)
+
+        Returns:
+            spreadsheets.LazyRows: Rows as dictionaries of column name to value
+
+        Raises:
+            ValueError: If a column is not in the spreadsheet (or, when the rows are read, if
+                the cache was cleared or the spreadsheet converted again)
+
+        Example:
+            | ${rows}= | Get Data Source Rows | ${EXECDIR}/resources/files/spreadsheets/users.xlsx | columns=name,email | start=10 | end=20 |
+            | FOR | ${row} | IN | @{rows} |
+            |     | Log | ${row}[email] |
+            | END |
+        """
+        end = None if end in (None, '', 'None') else int(end)
+        rows = self.get_table(data_source, sheet).rows(self.split_columns(columns), int(start), end)
+        logger.info(f"Selected {len(rows)} rows of {data_source}, columns {rows.columns}")
+        return rows
+
+    @keyword('Get Data Source Row')
+    def get_data_source_row(self, data_source, index, columns=None, sheet=None):
+        """Return one row of a spreadsheet as a dictionary.
+
+        Args:
+            data_source (str): Path to the spreadsheet
+            index (int): Index of the row, 0 for the first data row, negative to count from the end
+            columns (str|list): Column names, comma separated (default: all columns)
+            sheet (str): Name of the Excel sheet (default: active sheet)
+
+        Returns:
+            dict: Column name to value
+
+        Raises:
+            IndexError: If the spreadsheet has no row with this index
+
+        Example:
+            | ${user}= | Get Data Source Row | ${EXECDIR}/resources/files/spreadsheets/users.xlsx | 0 | columns=name,email |
+        """
+        rows = self.get_table(data_source, sheet).rows(self.split_columns(columns))
+        try:
+            return rows[int(index)]
+        except IndexError:
+            raise IndexError(f"{data_source} has no row {index}, it has {len(rows)} rows") from None
+
+    @keyword('Get Data Source Column')
+    def get_data_source_column(self, data_source, column, start=0, end=None, sheet=None):
+        """Return the values of one column of a spreadsheet.
+
+        Args:
+            data_source (str): Path to the spreadsheet
+            column (str): Column name
+            start (int): Index of the first row (default: 0)
+            end (int): Index after the last row, negative to count from the end (default: last row)
+            sheet (str): Name of the Excel sheet (default: active sheet)
+
+        Returns:
+            list: Values of the column, None for empty cells
+
+        Example:
+            | ${emails}= | Get Data Source Column | ${EXECDIR}/resources/files/spreadsheets/users.xlsx | email |
+        """
+        end = None if end in (None, '', 'None') else int(end)
+        return self.get_table(data_source, sheet).column_values(column, int(start), end)
+
+    @keyword('Clear Data Source Cache')
+    def clear_data_source_cache(self):
+        """Delete the columnar cache folder.
+
+        Rows returned before by `Get Data Source Rows` can no longer be read.
+
+        Returns:
+            int: Number of deleted cache entries
+
+        Example:
+            | Clear Data Source Cache |
+        """
+        # Rows returned by the keywords keep their table alive: the tables are closed explicitly,
+        # Windows cannot delete the mapped files (reading the rows again raises a clear error)
+        for table in self._tables.values():
+            table.close()
+        self._tables.clear()
+        if not os.path.isdir(self.cache_dir):
+            return 0
+        entries = len(os.listdir(self.cache_dir))
+        shutil.rmtree(self.cache_dir)
+        logger.info(f"Deleted {entries} entries of {self.cache_dir}")
+        return entries
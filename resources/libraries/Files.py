@@ -1,77 +1,255 @@
-import pandas as pd
-import datetime
-import pathlib
+import fnmatch
 import os
-import shutil
+import pathlib
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from robot.api.deco import keyword
+import spreadsheets
 
 ROBOT_LIBRARY_DOC_FORMAT = 'text'
 
+# Paths deleted by each task of the parallel delete
+_DELETE_CHUNK_SIZE = 500
+# Directory index: path -> (mtime_ns, file names, subdirectory names)
+_DIRECTORY_INDEX = {}
+
+
+def _list_directory(path, use_index=False):
+    '''
+    Returns the file and subdirectory names of a directory with a single scandir call.
+
+    With use_index, the names are kept in the directory index and reused while the
+    modification time of the directory does not change. Adding, removing or renaming an
+    entry changes the modification time of its directory, so each directory of a tree is
+    invalidated independently.
+    '''
+    if use_index:
+        mtime = os.stat(path).st_mtime_ns
+        cached = _DIRECTORY_INDEX.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1], cached[2]
+    files, directories = [], []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            # Symbolic links to folders are listed as files: they are neither followed nor deleted recursively
+            (directories if entry.is_dir(follow_symlinks=False) else files).append(entry.name)
+    if use_index:
+        _DIRECTORY_INDEX[path] = (mtime, files, directories)
+    return files, directories
+
+
+def _iter_files(directory_path, recursive=True, use_index=False):
+    '''
+    Yields the (relative path, full path) of the files of a directory, depth first.
+
+    Directories are only read when the iteration reaches them, so a search that stops
+    early does not read the whole tree.
+    '''
+    pending = [(os.fspath(directory_path), '')]
+    while pending:
+        path, relative = pending.pop()
+        files, directories = _list_directory(path, use_index)
+        for name in files:
+            yield relative + name, os.path.join(path, name)
+        if recursive:
+            pending.extend((os.path.join(path, name), f'{relative}{name}/') for name in reversed(directories))
+
+
+def _compile_patterns(patterns):
+    '''
+    Returns the match function of a regular expression matching any of the glob patterns.
+    '''
+    expressions = [fnmatch.translate(pattern) for pattern in patterns]
+    return re.compile('|'.join(expressions)).match if expressions else None
+
+
+def _iter_column(file_path, column, sheet=None, cache_dir=None):
+    '''
+    Returns an iterator over the values of a column of a spreadsheet, without loading the whole file.
+
+    The rows are streamed by spreadsheets.read_rows, or read from the memory-mapped columnar
+    copy of the spreadsheet when a cache folder is given. The header is read before
+    returning, so a missing column fails before anything is written.
+    '''
+    if cache_dir:
+        rows = spreadsheets.open_table(file_path, cache_dir, sheet).rows([column])
+        return (row[column] for row in rows)
+    _, rows = spreadsheets.read_rows(file_path, sheet, [column])
+    return (row[0] for row in rows)
+
+
+def _write_files(batch):
+    '''
+    Writes a batch of (path, content) files and returns the number of bytes written.
+    '''
+    written = 0
+    for path, content in batch:
+        data = content.encode('utf-8')
+        with open(path, 'wb') as f:
+            f.write(data)
+        written += len(data)
+    return written
+
+
+def _delete_paths(paths):
+    '''
+    Deletes a chunk of files and returns the errors.
+    '''
+    errors = []
+    for path in paths:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            errors.append(f'{path}: {e}')
+    return errors
+
 
 @keyword
-def deleteContentOfFolder(folder_path):
+def deleteContentOfFolder(folder_path, workers=8):
     '''
     Deletes all contents of a specified folder.
 
     This keyword checks if the folder exists and then deletes all files and
-    subdirectories within it.
+    subdirectories within it, keeping the folder itself. The tree is read with
+    os.scandir and the files are deleted in parallel, so large artifact folders
+    (screenshots, videos, traces) are cleaned in seconds. Symbolic links are deleted,
+    never followed.
 
     Arguments:
         folder_path (str): Path to the folder whose contents should be deleted
+        workers (int): Number of threads deleting the files (default: 8)
+
+    Returns:
+        int: Number of deleted files and subdirectories
 
     Example:
         | Delete Content Of Folder | ${EXECDIR}/temp |
+        | ${deleted}= | Delete Content Of Folder | ${EXECDIR}/reports/screenshots | workers=16 |
     '''
-    if os.path.exists(folder_path):
-        for filename in os.listdir(folder_path):
-            file_path = os.path.join(folder_path, filename)
-            try:
-                if os.path.isfile(file_path):
-                    os.remove(file_path)
-                elif os.path.isdir(file_path):
-                    os.rmdir(file_path)
-            except Exception as e:
-                print(f"Error deleting {file_path}: {e}")
-        print("Deletion done")
+    if not os.path.isdir(folder_path):
+        return 0
+    folder_path = os.fspath(folder_path)
+    files = []
+    directories = []
+    pending = [folder_path]
+    while pending:
+        path = pending.pop()
+        names, subdirectories = _list_directory(path)
+        files.extend(os.path.join(path, name) for name in names)
+        for name in subdirectories:
+            directories.append(os.path.join(path, name))
+            pending.append(directories[-1])
+
+    chunks = [files[index:index + _DELETE_CHUNK_SIZE] for index in range(0, len(files), _DELETE_CHUNK_SIZE)]
+    errors = []
+    if len(chunks) > 1 and int(workers) > 1:
+        with ThreadPoolExecutor(max_workers=int(workers)) as executor:
+            for chunk_errors in executor.map(_delete_paths, chunks):
+                errors.extend(chunk_errors)
+    else:
+        for chunk in chunks:
+            errors.extend(_delete_paths(chunk))
+    deleted_files = len(files) - len(errors)
+
+    # Subdirectories were listed parents first, so the reverse order removes children first
+    deleted_directories = 0
+    for directory in reversed(directories):
+        try:
+            os.rmdir(directory)
+            deleted_directories += 1
+        except OSError as e:
+            errors.append(f'{directory}: {e}')
+        _DIRECTORY_INDEX.pop(directory, None)
+    for error in errors:
+        print(f"Error deleting {error}")
+    print(f"Deletion done: {deleted_files} files and {deleted_directories} folders")
+    return deleted_files + deleted_directories
 
 
 @keyword
-def createFilesBasedInExcelData(directory, excel_file_path, extension, colum):
+def createFilesBasedInExcelData(directory, excel_file_path, extension, colum, sheet=None, workers=8,
+                                batch_size=500, cache_dir=None):
     '''
     Creates files based on data from an Excel spreadsheet.
 
     This keyword reads a spreadsheet and creates files with the content from a specified column.
-    If the directory already exists, it will be deleted and recreated.
+    If the directory already exists, its content will be deleted.
+
+    The rows are streamed (openpyxl read-only mode for .xlsx/.xlsm, csv module for .csv,
+    pyarrow record batches for .parquet), so the whole sheet is never loaded in memory.
+    Each file is named after its data row (Test_000001.txt for the first row), so the names
+    are deterministic and never collide. Empty cells are skipped. The files are written in
+    batches by a thread pool. With a cache folder, the spreadsheet is converted once to a
+    memory-mapped columnar copy (see DataSourceCache) and the next runs read the column from it.
 
     Arguments:
         directory (str): Path of directory to save the files
-        excel_file_path (str): Path to the Excel file to read
+        excel_file_path (str): Path to the spreadsheet to read (.xlsx, .xlsm, .csv, .parquet or .xls)
         extension (str): File extension for the created files (without dot)
         colum (str): Name of the spreadsheet column containing the data to save in files
+        sheet (str): Name of the Excel sheet to read (default: active sheet)
+        workers (int): Number of threads writing the files (default: 8)
+        batch_size (int): Number of files written by each task of the thread pool (default: 500)
+        cache_dir (str): Folder of the columnar cache, e.g. .data_source_cache (default: no cache)
+
+    Returns:
+        dict: Number of files and bytes written, skipped empty rows, seconds, files and bytes per second
 
     Example:
         | Create Files Based In Excel Data | ${EXECDIR}/output | ${EXECDIR}/data.xlsx | txt | Content |
+        | ${summary}= | Create Files Based In Excel Data | ${EXECDIR}/output | ${EXECDIR}/data.csv | xml | Payload | workers=4 |
+        | Create Files Based In Excel Data | ${EXECDIR}/output | ${EXECDIR}/data.xlsx | txt | Content | cache_dir=${EXECDIR}/.data_source_cache |
     '''
     try:
-        df = pd.read_excel(excel_file_path, dtype=str)
-        if os.path.exists(directory):
-            shutil.rmtree(directory)
-            print(f'Removing the folder and files: {directory}')
-            os.mkdir(directory)
-            print(f'Recreating the folder: {directory}')
+        rows = _iter_column(excel_file_path, colum, sheet, cache_dir)
+        if os.path.isdir(directory):
+            print(f'Removing the files of the folder: {directory}')
+            deleteContentOfFolder(directory, workers)
         else:
-            os.mkdir(directory)
+            os.makedirs(directory)
             print(f'Creating the folder: {directory}')
-        for index, row in df.iterrows():
-            timestamp = datetime.datetime.now().timestamp()
-            file_name = f'Test_{timestamp}.{extension}'
-            if (isinstance(row[colum], str)):
-                with open(f'{directory}/{file_name}', "w") as arquivo:
-                    arquivo.write(row[colum])
-                    print(f'Creating file: {file_name}')
+
+        start = time.perf_counter()
+        workers, batch_size = int(workers), int(batch_size)
+        files, written, skipped = 0, 0, 0
+        batch = []
+        pending = []
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for row_number, value in enumerate(rows, start=1):
+                if value is None or value == '':
+                    skipped += 1
+                    continue
+                batch.append((os.path.join(directory, f'Test_{row_number:06d}.{extension}'), str(value)))
+                files += 1
+                if len(batch) == batch_size:
+                    pending.append(executor.submit(_write_files, batch))
+                    batch = []
+                    # At most two batches per worker in memory
+                    if len(pending) >= 2 * workers:
+                        written += pending.pop(0).result()
+            if batch:
+                pending.append(executor.submit(_write_files, batch))
+            for future in pending:
+                written += future.result()
     except Exception as e:
         raise Exception(f'Error for create files based in Excel Data: {e}')
 
+    seconds = time.perf_counter() - start
+    summary = {
+        'files': files,
+        'bytes': written,
+        'skipped': skipped,
+        'seconds': round(seconds, 3),
+        'files_per_second': round(files / seconds, 1) if seconds else 0,
+        'bytes_per_second': round(written / seconds, 1) if seconds else 0,
+    }
+    print(f"Created {files} files ({written} bytes) in {summary['seconds']}s: "
+          f"{summary['files_per_second']} files/s, {summary['bytes_per_second']} bytes/s")
+    return summary
+
 
 @keyword
 def createFileBasedInStringData(fileDirectory, data, file_name):
@@ -101,6 +279,7 @@ def returnFilePathByExtension(directory_path=".", expected_extension=".xml"):
     Returns a list of file paths matching the specified extension.
 
     This keyword reads a directory and returns paths of all files with the specified extension.
+    Subdirectories are not searched, use Find Files for a recursive search.
 
     Arguments:
         directory_path (str): Path to the directory to search (default: current directory)
@@ -113,14 +292,65 @@ def returnFilePathByExtension(directory_path=".", expected_extension=".xml"):
         | ${xml_files}= | Return File Path By Extension | ${EXECDIR}/data | .xml |
     '''
     try:
-        file_list = []
-        directiory = pathlib.Path(directory_path)
-        for item in directiory.iterdir():
-            if item.is_file():
-                file_name, file_extension = os.path.splitext(
-                    f"${directory_path}/${item}")
-                if (file_extension == expected_extension):
-                    file_list.append(str(item))
-        return file_list
+        directory = pathlib.Path(directory_path)
+        names, _ = _list_directory(os.fspath(directory))
+        # Paths in the pathlib form (x.xml for the current directory), symbolic links followed
+        return [str(directory / name) for name in names
+                if os.path.splitext(name)[1] == expected_extension and (directory / name).is_file()]
     except Exception as e:
         raise Exception(f'Error for return File Path By Extension: {e}')
+
+
+@keyword
+def findFiles(directory_path, *extensions, patterns=None, recursive=True, limit=None, use_index=False):
+    '''
+    Returns the paths of the files matching any of the extensions or glob patterns.
+
+    The directory tree is read lazily with os.scandir: with a limit, the search stops
+    at the limit-th match without reading the rest of the tree. Extensions are matched
+    case-insensitively, with or without the leading dot. Patterns are matched against the
+    file name, or against the path relative to directory_path when they contain a "/".
+    Without extensions and patterns, every file is returned.
+
+    With use_index, the entries of each directory are kept in memory and reused by the next
+    searches while the modification time of the directory does not change, so repeated
+    searches of a large unchanged tree only stat its directories.
+
+    Arguments:
+        directory_path (str): Path to the directory to search
+        *extensions (str): File extensions to match (e.g. png .jpg)
+        patterns (str or list): Glob pattern or list of glob patterns to match (e.g. *failed*)
+        recursive (bool): Search the subdirectories (default: True)
+        limit (int): Maximum number of paths to return (default: no limit)
+        use_index (bool): Reuse the directory index of previous searches (default: False)
+
+    Returns:
+        list: Paths of the matching files, in depth-first order
+
+    Example:
+        | ${images}= | Find Files | ${EXECDIR}/reports | png | jpg |
+        | ${failed}= | Find Files | ${EXECDIR}/reports | patterns=*failed*.png | use_index=True |
+        | ${first}= | Find Files | ${EXECDIR}/reports | patterns=${{["browser/*.zip", "*.har"]}} | limit=1 |
+    '''
+    if not os.path.isdir(directory_path):
+        raise Exception(f'Error for find files: {directory_path} is not a directory')
+    suffixes = tuple('.' + extension.lower().lstrip('.') for extension in extensions)
+    if isinstance(patterns, str):
+        patterns = [patterns]
+    patterns = patterns or []
+    # One regular expression per kind of pattern, instead of one fnmatch call per pattern and file
+    name_pattern = _compile_patterns(pattern for pattern in patterns if '/' not in pattern)
+    path_pattern = _compile_patterns(pattern for pattern in patterns if '/' in pattern)
+    match_all = not suffixes and not patterns
+    limit = None if limit is None else int(limit)
+    matches = []
+    if limit == 0:
+        return matches
+    for relative, path in _iter_files(directory_path, recursive, use_index):
+        name = relative[relative.rfind('/') + 1:]
+        if (match_all or suffixes and name.lower().endswith(suffixes)
+                or name_pattern and name_pattern(name) or path_pattern and path_pattern(relative)):
+            matches.append(path)
+            if len(matches) == limit:
+                break
+    return matches
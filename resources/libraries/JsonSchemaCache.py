@@ -0,0 +1,171 @@
+import json
+import os
+from functools import lru_cache
+from urllib.parse import urlparse
+from jsonschema.validators import validator_for
+from referencing import Registry, Resource
+from referencing.jsonschema import DRAFT202012, specification_with
+from robot.api import logger
+from robot.api.deco import keyword, not_keyword
+
+
+class JsonSchemaCache:
+    """Library to validate JSON data against schema files compiled once per process.
+
+    Each schema file is read, checked and compiled only once. The compiled validator is
+    cached by the schema path and invalidated when the file modification time changes.
+    `$ref`s to other schema files are resolved from the schema folder and cached with the validator.
+
+    = Table of contents =
+
+    - path_to_schema: Path to the JSON schema file
+    - json_source: JSON data (dictionary, list or JSON string) to validate
+
+    %TOC%
+
+    = Usage =
+
+    Validate Json With Cached Schema    ${response.json()}    ${EXECDIR}/resources/files/jsonSchema/listBooks.json
+
+    Validate Json List With Cached Schema    ${payloads}    ${EXECDIR}/resources/files/jsonSchema/listBookISBN.json
+    """
+
+    ROBOT_LIBRARY_SCOPE = 'GLOBAL'
+
+    def __init__(self):
+        """Initialize the JsonSchemaCache library."""
+        self._validators = {}
+
+    @not_keyword
+    def load_json_file(self, file_path):
+        """Load a JSON file.
+
+        Args:
+            file_path (str): Path to the JSON file
+
+        Returns:
+            dict: Parsed JSON data
+        """
+        with open(file_path, encoding='utf-8') as f:
+            return json.load(f)
+
+    @not_keyword
+    def build_registry(self, schema_dir, dialect=''):
+        """Build a registry that resolves `$ref`s to schema files of the given folder.
+
+        Each referenced file is read only once per registry.
+
+        Args:
+            schema_dir (str): Folder of the schema being compiled
+            dialect (str): `$schema` of the schema being compiled, used for referenced files without `$schema`
+
+        Returns:
+            referencing.Registry: Registry used by the compiled validator
+        """
+        specification = specification_with(dialect, default=DRAFT202012)
+
+        @lru_cache(maxsize=None)
+        def retrieve(uri):
+            parsed = urlparse(uri)
+            if parsed.scheme == 'file':
+                file_path = parsed.path
+            else:
+                file_path = os.path.join(schema_dir, os.path.basename(parsed.path))
+            return Resource.from_contents(self.load_json_file(file_path), default_specification=specification)
+
+        return Registry(retrieve=retrieve)
+
+    @not_keyword
+    def get_validator(self, path_to_schema):
+        """Return the compiled validator of a schema file, compiling it on the first use.
+
+        Args:
+            path_to_schema (str): Path to the JSON schema file
+
+        Returns:
+            jsonschema.protocols.Validator: Compiled validator
+        """
+        schema_path = os.path.abspath(path_to_schema)
+        mtime = os.stat(schema_path).st_mtime_ns
+        cached = self._validators.get(schema_path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        schema = self.load_json_file(schema_path)
+        validator_class = validator_for(schema)
+        validator_class.check_schema(schema)
+        registry = self.build_registry(os.path.dirname(schema_path), schema.get('$schema', ''))
+        validator = validator_class(schema, registry=registry)
+        self._validators[schema_path] = (mtime, validator)
+        logger.debug(f"Compiled JSON schema: {schema_path}")
+        return validator
+
+    @not_keyword
+    def format_errors(self, validator, instance, prefix=''):
+        """Return one message for each validation error of the instance.
+
+        Args:
+            validator (jsonschema.protocols.Validator): Compiled validator
+            instance (dict|list): JSON data to validate
+            prefix (str): Text added before each message
+
+        Returns:
+            list: Error messages with the JSON path of each error
+        """
+        if isinstance(instance, str):
+            instance = json.loads(instance)
+        return [
+            f"{prefix}{error.json_path}: {error.message}"
+            for error in sorted(validator.iter_errors(instance), key=lambda error: list(error.path))
+        ]
+
+    @keyword('Validate Json With Cached Schema')
+    def validate_json_with_cached_schema(self, json_source, path_to_schema):
+        """Validate JSON data against a schema file compiled once per process.
+
+        Args:
+            json_source (dict|list|str): JSON data to validate
+            path_to_schema (str): Path to the JSON schema file
+
+        Raises:
+            AssertionError: If the JSON data does not match the schema, listing every error
+
+        Example:
+            | Validate Json With Cached Schema | ${response.json()} | ${EXECDIR}/resources/files/jsonSchema/createdUser.json |
+        """
+        errors = self.format_errors(self.get_validator(path_to_schema), json_source)
+        if errors:
+            raise AssertionError(
+                f"JSON does not match the schema {path_to_schema}:\n" + '\n'.join(errors))
+
+    @keyword('Validate Json List With Cached Schema')
+    def validate_json_list_with_cached_schema(self, json_list, path_to_schema):
+        """Validate a list of JSON payloads against one compiled schema, aggregating all errors.
+
+        Args:
+            json_list (list): JSON payloads to validate
+            path_to_schema (str): Path to the JSON schema file
+
+        Raises:
+            AssertionError: If any payload does not match the schema, listing the errors by payload index
+
+        Example:
+            | Validate Json List With Cached Schema | ${payloads} | ${EXECDIR}/resources/files/jsonSchema/listBookISBN.json |
+        """
+        validator = self.get_validator(path_to_schema)
+        errors = []
+        invalid_payloads = 0
+        for index, json_source in enumerate(json_list):
+            payload_errors = self.format_errors(validator, json_source, prefix=f"[{index}] ")
+            if payload_errors:
+                invalid_payloads += 1
+                errors.extend(payload_errors)
+        if errors:
+            raise AssertionError(
+                f"{invalid_payloads} of {len(json_list)} payloads do not match the schema {path_to_schema}:\n"
+                + '\n'.join(errors))
+
+    @keyword('Clear Json Schema Cache')
+    def clear_json_schema_cache(self):
+        """Remove all compiled schemas from the cache."""
+        self._validators.clear()
@@ -0,0 +1,232 @@
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from json.encoder import encode_basestring
+from robot.libraries.BuiltIn import BuiltIn
+
+
+class LiveMetrics:
+    """Listener that exports test and keyword timings while the run is in progress.
+
+    Each event is appended to an in-memory buffer by the listener methods and written by a
+    background thread every flush interval, so the test execution never waits for the disk:
+
+    - live_metrics_<worker>.jsonl: one line per test start, test end and keyword end,
+      with the start time, elapsed time, status and worker id
+    - live_metrics_<worker>.prom: Prometheus textfile (node_exporter textfile collector) with
+      the test counts, durations, the current test and the last event of the worker
+
+    The worker id is the pabot execution pool id, or the process id when running without pabot.
+    With `--testlevelsplit` pabot starts one robot process per test on each worker, so the
+    counters are also saved to `live_metrics_<worker>.state.json`. The next process of the same
+    worker in the same pabot run continues from them, instead of restarting the counters at zero.
+    The time spent by the listener methods and by the flush thread is exported as
+    `robot_live_metrics_overhead_seconds` and logged to the console when the run ends.
+
+    = Table of contents =
+
+    - output_dir: Folder of the JSONL and Prometheus files (default: live_metrics)
+    - flush_interval: Seconds between flushes of the buffer (default: 1)
+    - keywords: Record keyword events, True or False (default: True)
+
+    %TOC%
+
+    = Usage =
+
+    robot --listener resources/libraries/LiveMetrics.py:reports/live tests/
+
+    pabot --processes 4 --listener resources/libraries/LiveMetrics.py:reports/live:2:False tests/
+    """
+
+    ROBOT_LISTENER_API_VERSION = 3
+
+    def __init__(self, output_dir='live_metrics', flush_interval=1, keywords=True):
+        """Initialize the LiveMetrics listener.
+
+        Args:
+            output_dir (str): Folder of the JSONL and Prometheus files (default: live_metrics)
+            flush_interval (float): Seconds between flushes of the buffer (default: 1)
+            keywords (bool): Record keyword events (default: True)
+        """
+        self.output_dir = output_dir
+        self.flush_interval = float(flush_interval)
+        self.keywords = str(keywords).lower() not in ('false', 'no', '0', 'off')
+        self.worker = str(os.getpid())
+        self.started = time.time()
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._overhead = 0.0
+        self._flush_time = 0.0
+        self._previous_overhead = 0.0
+        self._tests = {}
+        self._test_durations = [0.0, 0]
+        self._keyword_count = 0
+        self._current_test = None
+        self._last_event = self.started
+
+    def _start_flush_thread(self):
+        worker = BuiltIn().get_variable_value('${PABOTEXECUTIONPOOLID}', None)
+        if worker is not None:
+            self.worker = str(worker)
+        self._worker_json = encode_basestring(self.worker)
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.jsonl_file = os.path.join(self.output_dir, f"live_metrics_{self.worker}.jsonl")
+        self.prom_file = os.path.join(self.output_dir, f"live_metrics_{self.worker}.prom")
+        self.state_file = os.path.join(self.output_dir, f"live_metrics_{self.worker}.state.json")
+        self._load_state()
+        self._thread = threading.Thread(target=self._flush_loop, name='LiveMetricsFlush', daemon=True)
+        self._thread.start()
+
+    def start_suite(self, data, result):
+        if self._thread is None:
+            self._start_flush_thread()
+
+    def start_test(self, data, result):
+        begin = time.perf_counter()
+        now = datetime.now()
+        with self._lock:
+            self._buffer.append(('test_start', result.full_name, None, now, None))
+            self._current_test = (result.full_name, now.timestamp())
+            self._last_event = time.time()
+        self._overhead += time.perf_counter() - begin
+
+    def end_test(self, data, result):
+        begin = time.perf_counter()
+        with self._lock:
+            self._buffer.append(('test_end', result.full_name, result.status, result.start_time,
+                                 result.elapsed_time))
+            self._tests[result.status] = self._tests.get(result.status, 0) + 1
+            self._test_durations[0] += result.elapsed_time.total_seconds()
+            self._test_durations[1] += 1
+            self._current_test = None
+            self._last_event = time.time()
+        self._overhead += time.perf_counter() - begin
+
+    def end_keyword(self, data, result):
+        if not self.keywords:
+            return
+        begin = time.perf_counter()
+        with self._lock:
+            self._buffer.append(('keyword_end', result.full_name, result.status, result.start_time,
+                                 result.elapsed_time))
+            self._keyword_count += 1
+        self._overhead += time.perf_counter() - begin
+
+    def close(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._flush()
+        elapsed = time.time() - self.started
+        overhead = self._overhead + self._flush_time
+        sys.__stdout__.write(
+            f"LiveMetrics: {overhead:.3f}s overhead in {elapsed:.3f}s run "
+            f"({overhead / elapsed * 100 if elapsed else 0:.2f}%), files in {self.output_dir}\n")
+
+    def _load_state(self):
+        # Processes of one pabot run share its process id as parent, a state file of another
+        # run (or of a robot run without pabot) is ignored
+        try:
+            with open(self.state_file, encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return
+        if state.get('run') != os.getppid():
+            return
+        self._tests = state['tests']
+        self._test_durations = state['test_durations']
+        self._keyword_count = state['keywords']
+        self._previous_overhead = state['overhead']
+
+    def _flush_loop(self):
+        while not self._stop.wait(self.flush_interval):
+            self._flush()
+
+    def _flush(self):
+        # CPU time of the flush thread, wall time would also count the waits for the GIL
+        begin = time.thread_time()
+        with self._lock:
+            events, self._buffer = self._buffer, []
+            snapshot = {
+                'tests': dict(self._tests),
+                'test_durations': list(self._test_durations),
+                'keywords': self._keyword_count,
+                'current_test': self._current_test,
+                'last_event': self._last_event,
+            }
+        if events:
+            with open(self.jsonl_file, 'a', encoding='utf-8') as f:
+                f.writelines(self._format_event(*event) for event in events)
+        self._write_prometheus(snapshot)
+        self._write_state(snapshot)
+        self._flush_time += time.thread_time() - begin
+
+    def _write_state(self, snapshot):
+        state = {
+            'run': os.getppid(),
+            'tests': snapshot['tests'],
+            'test_durations': snapshot['test_durations'],
+            'keywords': snapshot['keywords'],
+            'overhead': self._previous_overhead + self._overhead + self._flush_time,
+        }
+        temp_file = f"{self.state_file}.tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(temp_file, self.state_file)
+
+    def _format_event(self, event, name, status, start, elapsed):
+        # Formatted by hand: json.dumps of a dict per event costs more than the whole listener hot path
+        line = f'{{"event": "{event}", "worker": {self._worker_json}, "name": {encode_basestring(name)}'
+        if status is not None:
+            line += f', "status": "{status}"'
+        line += f', "start": "{start.isoformat()}"' if start else ', "start": null'
+        if elapsed is not None:
+            line += f', "elapsed": {elapsed.total_seconds()}'
+        return line + '}\n'
+
+    def _write_prometheus(self, snapshot):
+        worker = f'worker="{self.worker}"'
+        lines = [
+            '# HELP robot_tests_total Finished tests by status.',
+            '# TYPE robot_tests_total counter',
+        ]
+        for status in ('PASS', 'FAIL', 'SKIP'):
+            lines.append(f'robot_tests_total{{{worker},status="{status}"}} {snapshot["tests"].get(status, 0)}')
+        total, count = snapshot['test_durations']
+        lines += [
+            '# HELP robot_test_duration_seconds Duration of the finished tests.',
+            '# TYPE robot_test_duration_seconds summary',
+            f'robot_test_duration_seconds_sum{{{worker}}} {total:.6f}',
+            f'robot_test_duration_seconds_count{{{worker}}} {count}',
+            '# HELP robot_keywords_total Finished keywords.',
+            '# TYPE robot_keywords_total counter',
+            f'robot_keywords_total{{{worker}}} {snapshot["keywords"]}',
+            '# HELP robot_worker_last_event_timestamp_seconds Time of the last test event of the worker.',
+            '# TYPE robot_worker_last_event_timestamp_seconds gauge',
+            f'robot_worker_last_event_timestamp_seconds{{{worker}}} {snapshot["last_event"]:.3f}',
+            '# HELP robot_worker_current_test_start_timestamp_seconds Start of the running test, 0 when idle.',
+            '# TYPE robot_worker_current_test_start_timestamp_seconds gauge',
+        ]
+        current = snapshot['current_test']
+        if current:
+            name = current[0].replace('\\', '\\\\').replace('"', '\\"').replace('\n', ' ')
+            lines.append(f'robot_worker_current_test_start_timestamp_seconds{{{worker},test="{name}"}} '
+                         f'{current[1]:.3f}')
+        else:
+            lines.append(f'robot_worker_current_test_start_timestamp_seconds{{{worker},test=""}} 0')
+        lines += [
+            '# HELP robot_live_metrics_overhead_seconds Time spent by the listener and its flush thread.',
+            '# TYPE robot_live_metrics_overhead_seconds counter',
+            f'robot_live_metrics_overhead_seconds{{{worker}}} '
+            f'{self._previous_overhead + self._overhead + self._flush_time:.6f}',
+        ]
+        temp_file = f"{self.prom_file}.tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(temp_file, self.prom_file)
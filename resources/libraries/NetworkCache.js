@@ -0,0 +1,146 @@
+/**
+ * Network Cache extension for the Browser library.
+ *
+ * Loaded through the Browser library `jsextension` argument, it exposes
+ * Playwright routing features that are not available as Browser keywords:
+ * - Recording the network traffic of a context into a HAR file
+ * - Replaying a recorded HAR file, so pages are served without network access
+ * - Blocking requests by resource type or by domain
+ * - Reading Navigation/Paint Timing metrics of the current page
+ *
+ * Usage:
+ *     Library    Browser    jsextension=${EXECDIR}/resources/libraries/NetworkCache.js
+ */
+
+const HAR_MODES = ['live', 'record', 'replay'];
+
+/**
+ * Normalizes a Robot Framework argument to a list of strings.
+ * Accepts a list, a comma separated string or an empty value.
+ */
+function toList(value) {
+    if (value === undefined || value === null || value === '') {
+        return [];
+    }
+    if (Array.isArray(value)) {
+        return value.map(String).map((item) => item.trim()).filter(Boolean);
+    }
+    return String(value).split(',').map((item) => item.trim()).filter(Boolean);
+}
+
+async function configureHarCache(harPath, mode = 'live', urlFilter = '', context, logger) {
+    const harMode = String(mode || 'live').toLowerCase();
+    if (!HAR_MODES.includes(harMode)) {
+        throw new Error(`Invalid network mode '${mode}'. Expected one of: ${HAR_MODES.join(', ')}`);
+    }
+    if (harMode === 'live') {
+        logger('Network mode is live, HAR cache not configured.');
+        return;
+    }
+    const options = {};
+    if (urlFilter) {
+        options.url = urlFilter;
+    }
+    if (harMode === 'record') {
+        options.update = true;
+        options.updateContent = 'embed';
+        options.updateMode = 'minimal';
+    } else {
+        options.notFound = 'abort';
+    }
+    await context.routeFromHAR(harPath, options);
+    logger(`Network mode '${harMode}' configured with HAR file: ${harPath}`);
+}
+
+configureHarCache.rfdoc = `Records or replays the network traffic of the current context using a HAR file.
+
+Arguments:
+- harPath: Path of the HAR file to record into or replay from
+- mode: live (no routing), record (save responses when the context closes) or replay (serve responses from the HAR file)
+- urlFilter: Optional glob pattern; only matching requests are recorded or replayed
+
+In replay mode, requests not found in the HAR file are aborted, so the page never reaches the network.
+The HAR file is only written when the context is closed (e.g. Close Browser).`;
+
+async function blockNetworkRequests(resourceTypes = '', domains = '', context, logger) {
+    const blockedTypes = toList(resourceTypes).map((item) => item.toLowerCase());
+    const blockedDomains = toList(domains).map((item) => item.toLowerCase());
+    if (blockedTypes.length === 0 && blockedDomains.length === 0) {
+        logger('No resource types or domains to block.');
+        return;
+    }
+    await context.route('**/*', (route) => {
+        const request = route.request();
+        const hostname = new URL(request.url()).hostname.toLowerCase();
+        const blockedByType = blockedTypes.includes(request.resourceType());
+        const blockedByDomain = blockedDomains.some(
+            (domain) => hostname === domain || hostname.endsWith(`.${domain}`)
+        );
+        if (blockedByType || blockedByDomain) {
+            return route.abort('blockedbyclient');
+        }
+        return route.fallback();
+    });
+    logger(`Blocking resource types [${blockedTypes.join(', ')}] and domains [${blockedDomains.join(', ')}]`);
+}
+
+blockNetworkRequests.rfdoc = `Aborts requests of the current context by resource type or domain.
+
+Arguments:
+- resourceTypes: List (or comma separated string) of Playwright resource types, e.g. image, font, media, stylesheet
+- domains: List (or comma separated string) of domains; subdomains are blocked as well
+
+Requests that are not blocked fall back to the other routes (e.g. the HAR cache) or to the network.`;
+
+async function getPagePerformanceMetrics(page) {
+    return await page.evaluate(async () => {
+        const round = (value) => (typeof value === 'number' ? Math.round(value * 100) / 100 : null);
+        const observeLast = (type) => new Promise((resolve) => {
+            let last = null;
+            try {
+                const observer = new PerformanceObserver((list) => {
+                    list.getEntries().forEach((entry) => { last = entry; });
+                });
+                observer.observe({ type, buffered: true });
+                observer.takeRecords().forEach((entry) => { last = entry; });
+                setTimeout(() => { observer.disconnect(); resolve(last); }, 100);
+            } catch (error) {
+                resolve(null);
+            }
+        });
+        const navigation = performance.getEntriesByType('navigation')[0];
+        const paints = {};
+        performance.getEntriesByType('paint').forEach((entry) => { paints[entry.name] = entry.startTime; });
+        const lcp = await observeLast('largest-contentful-paint');
+        const resources = performance.getEntriesByType('resource');
+        const resourcesByType = {};
+        let resourcesTransferSize = 0;
+        resources.forEach((entry) => {
+            resourcesByType[entry.initiatorType] = (resourcesByType[entry.initiatorType] || 0) + 1;
+            resourcesTransferSize += entry.transferSize || 0;
+        });
+        return {
+            url: location.href,
+            timeToFirstByte: navigation ? round(navigation.responseStart - navigation.startTime) : null,
+            domContentLoaded: navigation ? round(navigation.domContentLoadedEventEnd - navigation.startTime) : null,
+            loadEvent: navigation ? round(navigation.loadEventEnd - navigation.startTime) : null,
+            documentTransferSize: navigation ? navigation.transferSize : null,
+            firstPaint: round(paints['first-paint']),
+            firstContentfulPaint: round(paints['first-contentful-paint']),
+            largestContentfulPaint: lcp ? round(lcp.startTime) : null,
+            resourceCount: resources.length,
+            resourcesTransferSize,
+            resourcesByType,
+        };
+    });
+}
+
+getPagePerformanceMetrics.rfdoc = `Returns Navigation Timing, Paint Timing and resource statistics of the current page.
+
+Times are in milliseconds relative to the navigation start and sizes are in bytes.
+Metrics not supported by the browser (e.g. largestContentfulPaint outside Chromium) are returned as None.`;
+
+exports.__esModule = true;
+exports.configureHarCache = configureHarCache;
+exports.blockNetworkRequests = blockNetworkRequests;
+exports.getPagePerformanceMetrics = getPagePerformanceMetrics;
@@ -0,0 +1,150 @@
+import hashlib
+import html
+import os
+import sys
+from robot.api import logger
+from robot.api.deco import keyword, not_keyword
+from robot.libraries.BuiltIn import BuiltIn
+
+
+class OutputBudget:
+    """Listener and library that keeps large logged payloads out of output.xml and log.html.
+
+    Every log message longer than the budget is replaced by a preview, its size and its SHA-256.
+    The full payload is written once to a content-addressed attachment store
+    (`<store_dir>/<sha256>.txt`), so a payload logged many times (e.g. the same JSON response
+    in every test, or by every pabot worker) is stored only once.
+    The preview links to the stored payload in log.html.
+
+    = Table of contents =
+
+    - max_size: Maximum number of characters of a logged message (default: 10000)
+    - preview_size: Number of characters kept in the log as preview (default: 500)
+    - store_dir: Folder of the attachment store (default: attachments in ${OUTPUT DIR})
+    - link_base: Folder of the final log.html, used for the links (default: folder of ${LOG FILE} or ${OUTPUT DIR})
+
+    %TOC%
+
+    = Usage =
+
+    As a listener, for the whole run:
+
+    robot --listener resources/libraries/OutputBudget.py:max_size=20000 tests/
+
+    pabot --listener resources/libraries/OutputBudget.py:store_dir=reports/attachments:link_base=reports tests/
+
+    As a library, for the suites that import it:
+
+    Library    ${EXECDIR}/resources/libraries/OutputBudget.py    max_size=5000
+
+    Set Output Budget    1000    preview_size=200
+    """
+
+    ROBOT_LISTENER_API_VERSION = 3
+    ROBOT_LIBRARY_SCOPE = 'GLOBAL'
+
+    def __init__(self, max_size=10000, preview_size=500, store_dir=None, link_base=None):
+        """Initialize the OutputBudget listener and library.
+
+        Args:
+            max_size (int): Maximum number of characters of a logged message (default: 10000)
+            preview_size (int): Number of characters kept in the log as preview (default: 500)
+            store_dir (str): Folder of the attachment store (default: attachments in ${OUTPUT DIR})
+            link_base (str): Folder of the final log.html (default: folder of ${LOG FILE} or ${OUTPUT DIR})
+        """
+        self.ROBOT_LIBRARY_LISTENER = self
+        self.max_size = int(max_size)
+        self.preview_size = int(preview_size)
+        self.store_dir = store_dir
+        self.link_base = link_base
+        self._stored = set()
+        self._statistics = {'truncated': 0, 'characters_removed': 0, 'attachments': 0, 'deduplicated': 0}
+
+    @not_keyword
+    def get_store_dir(self):
+        """Return the attachment store folder, resolving the default on the first use.
+
+        Returns:
+            str: Attachment store folder
+        """
+        if self.store_dir is None:
+            self.store_dir = os.path.join(BuiltIn().get_variable_value('${OUTPUT DIR}', '.'), 'attachments')
+        if self.link_base is None:
+            log_file = BuiltIn().get_variable_value('${LOG FILE}', 'NONE')
+            self.link_base = os.path.dirname(log_file) if log_file != 'NONE' else \
+                BuiltIn().get_variable_value('${OUTPUT DIR}', '.')
+        return self.store_dir
+
+    @not_keyword
+    def store_payload(self, payload, extension='txt'):
+        """Write a payload to the attachment store, once per content.
+
+        Args:
+            payload (str): Payload to store
+            extension (str): File extension (default: txt)
+
+        Returns:
+            tuple: SHA-256 of the payload and path of the stored file
+        """
+        data = payload.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        path = os.path.join(self.get_store_dir(), f"{digest}.{extension}")
+        if digest in self._stored or os.path.exists(path):
+            self._statistics['deduplicated'] += 1
+        else:
+            os.makedirs(self.store_dir, exist_ok=True)
+            temp_file = f"{path}.{os.getpid()}.tmp"
+            with open(temp_file, 'wb') as f:
+                f.write(data)
+            os.replace(temp_file, path)
+            self._statistics['attachments'] += 1
+        self._stored.add(digest)
+        return digest, path
+
+    @not_keyword
+    def log_message(self, message):
+        size = len(message.message)
+        if size <= self.max_size:
+            return
+        digest, path = self.store_payload(message.message, 'html' if message.html else 'txt')
+        preview_size = min(self.preview_size, self.max_size)
+        # Escaped even for HTML messages: a preview cut in the middle of a tag would break the log
+        preview = html.escape(message.message[:preview_size])
+        link = os.path.relpath(path, self.link_base).replace(os.sep, '/')
+        message.message = (
+            f"{preview}<br>[{size - preview_size} of {size} characters moved to the attachment store, "
+            f"sha256 {digest}: <a href=\"{html.escape(link)}\">full payload</a>]"
+        )
+        message.html = True
+        self._statistics['truncated'] += 1
+        self._statistics['characters_removed'] += size - preview_size
+
+    @not_keyword
+    def close(self):
+        if self._statistics['truncated']:
+            statistics = self._statistics
+            sys.__stdout__.write(
+                f"OutputBudget: {statistics['truncated']} messages truncated, "
+                f"{statistics['characters_removed']} characters moved to {self.store_dir} "
+                f"({statistics['attachments']} attachments, {statistics['deduplicated']} deduplicated)\n")
+
+    @keyword('Set Output Budget')
+    def set_output_budget(self, max_size, preview_size=None):
+        """Change the maximum size of the logged messages.
+
+        Args:
+            max_size (int): Maximum number of characters of a logged message
+            preview_size (int): Number of characters kept in the log as preview (default: unchanged)
+
+        Returns:
+            int: Previous maximum size
+
+        Example:
+            | ${previous}= | Set Output Budget | 1000 | preview_size=200 |
+        """
+        previous = self.max_size
+        self.max_size = int(max_size)
+        if preview_size is not None:
+            self.preview_size = int(preview_size)
+        logger.info(f"Output budget set to {self.max_size} characters (preview of {self.preview_size})")
+        return previous
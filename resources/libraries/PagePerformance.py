@@ -0,0 +1,119 @@
+import json
+import os
+from datetime import datetime
+from robot.api import logger
+from robot.api.deco import keyword, not_keyword
+from robot.libraries.BuiltIn import BuiltIn
+
+
+class PagePerformance:
+    """Library to record page performance metrics and validate performance budgets.
+
+    The metrics are collected by the `Get Page Performance Metrics` keyword of the
+    Browser library extension (resources/libraries/NetworkCache.js) and recorded by this library.
+
+    = Table of contents =
+
+    - budgets: Dictionary of metric name and maximum value, e.g. {'largestContentfulPaint': 2500}
+    - budget_mode: warn (log a warning) or fail (fail the test) when a budget is exceeded
+    - output_file: JSONL file where each recorded page is appended as one line
+
+    %TOC%
+
+    = Usage =
+
+    ${metrics}=    Get Page Performance Metrics
+    Record Page Performance Metrics    ${metrics}    ${PERFORMANCE_BUDGETS}    fail
+    """
+
+    BUDGET_MODES = ('warn', 'fail')
+
+    def __init__(self, output_file=None):
+        """Initialize the PagePerformance library.
+
+        Args:
+            output_file (str, optional): JSONL file path. Defaults to page_performance.jsonl in ${OUTPUT DIR}.
+        """
+        self.output_file = output_file
+
+    @not_keyword
+    def get_output_file(self):
+        """Return the JSONL file path used to export the metrics.
+
+        Returns:
+            str: JSONL file path
+        """
+        if self.output_file:
+            return self.output_file
+        output_dir = BuiltIn().get_variable_value('${OUTPUT DIR}', '.')
+        return os.path.join(output_dir, 'page_performance.jsonl')
+
+    @not_keyword
+    def check_budgets(self, metrics, budgets):
+        """Compare the metrics against the budgets.
+
+        Args:
+            metrics (dict): Metrics returned by Get Page Performance Metrics
+            budgets (dict): Metric name and maximum allowed value
+
+        Returns:
+            list: Messages describing each exceeded budget
+        """
+        violations = []
+        for metric, limit in (budgets or {}).items():
+            value = metrics.get(metric)
+            if value is None:
+                continue
+            if float(value) > float(limit):
+                violations.append(f"{metric} of {value} exceeds the budget of {limit}")
+        return violations
+
+    @keyword('Record Page Performance Metrics')
+    def record_page_performance_metrics(self, metrics, budgets=None, budget_mode='warn'):
+        """Record the page metrics in the log, the test message and the JSONL file, validating the budgets.
+
+        Args:
+            metrics (dict): Metrics returned by Get Page Performance Metrics
+            budgets (dict): Metric name and maximum allowed value (default: no budgets)
+            budget_mode (str): warn or fail when a budget is exceeded (default: warn)
+
+        Returns:
+            list: Messages describing each exceeded budget
+
+        Raises:
+            AssertionError: If a budget is exceeded and budget_mode is fail
+        """
+        budget_mode = str(budget_mode).lower()
+        if budget_mode not in self.BUDGET_MODES:
+            raise ValueError(f"Invalid budget mode '{budget_mode}'. Expected one of: {', '.join(self.BUDGET_MODES)}")
+
+        builtin = BuiltIn()
+        metrics = dict(metrics)
+        violations = self.check_budgets(metrics, budgets)
+        record = {
+            'timestamp': datetime.now().isoformat(),
+            'suite': builtin.get_variable_value('${SUITE NAME}'),
+            'test': builtin.get_variable_value('${TEST NAME}'),
+            'metrics': metrics,
+            'budgets': dict(budgets or {}),
+            'violations': violations,
+        }
+        logger.info(json.dumps(record, indent=2, default=str))
+
+        output_file = self.get_output_file()
+        os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+        with open(output_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, default=str) + '\n')
+
+        if record['test']:
+            summary = ', '.join(
+                f"{name}={metrics[name]}" for name in ('firstContentfulPaint', 'largestContentfulPaint', 'loadEvent')
+                if metrics.get(name) is not None
+            )
+            builtin.set_test_message(f"Page performance ({metrics.get('url')}): {summary}", append=True)
+
+        for violation in violations:
+            logger.warn(f"Performance budget exceeded: {violation}")
+        if violations and budget_mode == 'fail':
+            raise AssertionError(f"Performance budget exceeded: {'; '.join(violations)}")
+        return violations
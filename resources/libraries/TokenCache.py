@@ -0,0 +1,205 @@
+import json
+import os
+import sqlite3
+import time
+from datetime import datetime
+from robot.api import logger
+from robot.api.deco import keyword, not_keyword
+
+
+class TokenCache:
+    """Library to share API users and auth tokens across tests and pabot workers.
+
+    Users and tokens are stored in a local SQLite file, so every worker of a run can check out
+    a valid token instead of repeating the account creation and token generation requests.
+    Tokens are keyed by user and endpoint and are ignored once they are about to expire.
+
+    = Table of contents =
+
+    - cache_file: SQLite file shared by the workers (default: .token_cache.db in the execution directory)
+    - expiry_margin: Seconds before the expiration in which a token is considered expired (default: 60)
+
+    %TOC%
+
+    = Usage =
+
+    ${token}=    Get Cached Token    ${user}    ${GENERATE_TOKEN_EP}
+    IF    $token is None
+        ${response}=    Generate User Token
+        Store Cached Token    ${user}    ${GENERATE_TOKEN_EP}    ${response.json()}[token]    ${response.json()}[expires]
+    END
+    """
+
+    ROBOT_LIBRARY_SCOPE = 'GLOBAL'
+
+    def __init__(self, cache_file='.token_cache.db', expiry_margin=60):
+        """Initialize the TokenCache library.
+
+        Args:
+            cache_file (str): SQLite file shared by the workers (default: .token_cache.db)
+            expiry_margin (float): Seconds before the expiration in which a token is considered expired (default: 60)
+        """
+        self.cache_file = cache_file
+        self.expiry_margin = float(expiry_margin)
+        self._connection = None
+
+    @not_keyword
+    def get_connection(self):
+        """Return the SQLite connection, creating the tables on the first use.
+
+        Returns:
+            sqlite3.Connection: Connection in autocommit mode
+        """
+        if self._connection is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.cache_file)), exist_ok=True)
+            self._connection = sqlite3.connect(self.cache_file, timeout=30, isolation_level=None)
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS users ('
+                'alias TEXT, base_url TEXT, credentials TEXT, PRIMARY KEY (alias, base_url))'
+            )
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS tokens ('
+                'user TEXT, endpoint TEXT, token TEXT, expires_at REAL, PRIMARY KEY (user, endpoint))'
+            )
+        return self._connection
+
+    @staticmethod
+    def parse_expiration(expires):
+        """Convert an ISO 8601 expiration (e.g. 2024-03-29T21:23:20.424Z) to a timestamp.
+
+        Args:
+            expires (str|float): ISO 8601 date or timestamp
+
+        Returns:
+            float: Expiration timestamp
+
+        Raises:
+            ValueError: If the expiration is missing, e.g. the token was not generated
+        """
+        if expires is None or str(expires).strip() in ('', 'None'):
+            raise ValueError(f"Token expiration is missing (got {expires!r}), the token was not generated")
+        if isinstance(expires, (int, float)):
+            return float(expires)
+        return datetime.fromisoformat(str(expires).replace('Z', '+00:00')).timestamp()
+
+    @keyword('Get Cached Token')
+    def get_cached_token(self, user, endpoint):
+        """Return the cached token of a user for an endpoint, or None when missing or expired.
+
+        Args:
+            user (str): User name
+            endpoint (str): Endpoint that generated the token
+
+        Returns:
+            str: Cached token, or None
+
+        Example:
+            | ${token}= | Get Cached Token | ${BODY}[userName] | ${GENERATE_TOKEN_EP} |
+        """
+        row = self.get_connection().execute(
+            'SELECT token FROM tokens WHERE user = ? AND endpoint = ? AND expires_at > ?',
+            (user, endpoint, time.time() + self.expiry_margin)
+        ).fetchone()
+        logger.info(f"Token cache {'hit' if row else 'miss'} for user '{user}' on {endpoint}")
+        return row[0] if row else None
+
+    @keyword('Store Cached Token')
+    def store_cached_token(self, user, endpoint, token, expires):
+        """Store the token of a user for an endpoint.
+
+        Args:
+            user (str): User name
+            endpoint (str): Endpoint that generated the token
+            token (str): Token
+            expires (str|float): ISO 8601 expiration date or timestamp
+
+        Example:
+            | Store Cached Token | ${BODY}[userName] | ${GENERATE_TOKEN_EP} | ${token} | ${expires} |
+        """
+        self.get_connection().execute(
+            'INSERT OR REPLACE INTO tokens (user, endpoint, token, expires_at) VALUES (?, ?, ?, ?)',
+            (user, endpoint, token, self.parse_expiration(expires))
+        )
+
+    @keyword('Get Cached User')
+    def get_cached_user(self, alias, base_url):
+        """Return the cached credentials of a user, or None when missing.
+
+        Args:
+            alias (str): User alias, e.g. default
+            base_url (str): API base URL where the user exists
+
+        Returns:
+            dict: User credentials, or None
+        """
+        row = self.get_connection().execute(
+            'SELECT credentials FROM users WHERE alias = ? AND base_url = ?', (alias, base_url)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    @keyword('Store Cached User')
+    def store_cached_user(self, alias, base_url, credentials):
+        """Store the credentials of a user, keeping the first user stored by any worker.
+
+        Args:
+            alias (str): User alias, e.g. default
+            base_url (str): API base URL where the user exists
+            credentials (dict): User credentials
+
+        Returns:
+            dict: Credentials of the cached user (the ones of another worker if it stored the alias first)
+        """
+        self.get_connection().execute(
+            'INSERT OR IGNORE INTO users (alias, base_url, credentials) VALUES (?, ?, ?)',
+            (alias, base_url, json.dumps(dict(credentials)))
+        )
+        return self.get_cached_user(alias, base_url)
+
+    @keyword('Remove Cached User')
+    def remove_cached_user(self, alias, base_url, user_name=None):
+        """Remove a cached user and its tokens, e.g. when the API no longer has its account.
+
+        Args:
+            alias (str): User alias, e.g. default
+            base_url (str): API base URL where the user existed
+            user_name (str): Remove the alias only while it is still this user, so a user cached
+                again by another worker is kept (default: any user)
+
+        Returns:
+            bool: True if the user was removed
+
+        Example:
+            | Remove Cached User | default | ${DEMOQA_URL} | ${BODY}[userName] |
+        """
+        user = self.get_cached_user(alias, base_url)
+        if user is None or (user_name is not None and user.get('userName') != user_name):
+            return False
+        connection = self.get_connection()
+        connection.execute(
+            'DELETE FROM users WHERE alias = ? AND base_url = ? AND credentials = ?',
+            (alias, base_url, json.dumps(user))
+        )
+        connection.execute(
+            'DELETE FROM tokens WHERE user = ? AND endpoint LIKE ?', (user.get('userName'), f"{base_url}/%")
+        )
+        logger.info(f"Removed cached user '{alias}' ({user.get('userName')}) of {base_url}")
+        return True
+
+    @keyword('Clear Token Cache')
+    def clear_token_cache(self, base_url=None):
+        """Remove the cached users and tokens, all of them or only the ones of an API base URL.
+
+        Args:
+            base_url (str): API base URL whose users and tokens are removed (default: all)
+
+        Example:
+            | Clear Token Cache | http://127.0.0.1:8080 |
+        """
+        connection = self.get_connection()
+        if base_url:
+            connection.execute('DELETE FROM users WHERE base_url = ?', (base_url,))
+            connection.execute('DELETE FROM tokens WHERE endpoint LIKE ?', (f"{base_url}/%",))
+        else:
+            connection.execute('DELETE FROM users')
+            connection.execute('DELETE FROM tokens')
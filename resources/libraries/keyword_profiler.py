@@ -0,0 +1,314 @@
+import sys
+import os
+import io
+import json
+import xml.etree.ElementTree as ET
+from datetime import datetime
+
+
+class KeywordStat:
+    """
+    Timings of one keyword across a run.
+
+    Attributes:
+        name (str): Keyword name prefixed by its library or resource (e.g. String.Replace String)
+        calls (int): Number of executions
+        inclusive (float): Seconds spent in the keyword and everything it called (recursion counted once)
+        self_time (float): Seconds spent in the keyword itself, excluding the keywords it called
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.inclusive = 0.0
+        self.self_time = 0.0
+
+    def to_dict(self):
+        return {'name': self.name, 'calls': self.calls, 'inclusive': round(self.inclusive, 6),
+                'self': round(self.self_time, 6),
+                'average': round(self.inclusive / self.calls, 6) if self.calls else 0}
+
+
+class Frame:
+    """Open suite, test or keyword while output.xml is being streamed."""
+
+    def __init__(self, kind, name):
+        self.kind = kind
+        self.name = name
+        self.elapsed = 0.0
+        self.status = None
+        self.children_time = 0.0
+
+
+class KeywordProfile:
+    """
+    Keyword, test and suite timings collected from output.xml.
+
+    Attributes:
+        keywords (dict): KeywordStat by keyword name
+        calls (dict): Number of calls by (caller, callee) keyword names
+        tests (list): (test full name, elapsed seconds) of each test
+        suites (list): (suite full name, elapsed seconds) of each suite
+        stacks (dict): Self seconds by collapsed stack (suite;test;keyword;...)
+    """
+
+    def __init__(self):
+        self.keywords = {}
+        self.calls = {}
+        self.tests = []
+        self.suites = []
+        self.stacks = {}
+
+    def top_keywords(self, count, key='inclusive'):
+        return sorted(self.keywords.values(), key=lambda stat: getattr(stat, key), reverse=True)[:count]
+
+    def top_calls(self, count):
+        return sorted(self.calls.items(), key=lambda item: item[1], reverse=True)[:count]
+
+    def top_tests(self, count):
+        return sorted(self.tests, key=lambda item: item[1], reverse=True)[:count]
+
+    def top_suites(self, count):
+        return sorted(self.suites, key=lambda item: item[1], reverse=True)[:count]
+
+
+def keyword_name(elem):
+    """Return the keyword name prefixed by its library or resource."""
+    name = elem.get('name', '')
+    owner = elem.get('owner') or elem.get('library')
+    return f"{owner}.{name}" if owner else name
+
+
+def stack_frame(name):
+    """Return a name that can be used as a frame of a collapsed stack."""
+    return name.replace(';', ',').replace('\n', ' ')
+
+
+def profile_output(output_file):
+    """
+    Profiles the keywords of an output.xml in a single streaming pass.
+
+    Elements are cleared as soon as they are parsed, so memory usage depends on the
+    number of distinct keywords and stacks, not on the output size.
+
+    Args:
+        output_file (str): Path to Robot Framework output.xml file
+
+    Returns:
+        KeywordProfile: Keyword, test and suite timings
+    """
+    profile = KeywordProfile()
+    elements = []
+    frames = []
+    active = {}
+
+    for event, elem in ET.iterparse(output_file, events=('start', 'end')):
+        parent = elements[-1] if elements else None
+        if event == 'start':
+            if elem.tag == 'suite' and (parent is None or parent.tag in ('robot', 'suite')):
+                frames.append(Frame('suite', elem.get('name', '')))
+            elif elem.tag == 'test' and parent is not None and parent.tag == 'suite':
+                frames.append(Frame('test', elem.get('name', '')))
+            elif elem.tag == 'kw':
+                name = keyword_name(elem)
+                frames.append(Frame('kw', name))
+                active[name] = active.get(name, 0) + 1
+            elements.append(elem)
+            continue
+
+        elements.pop()
+        parent = elements[-1] if elements else None
+        if elem.tag == 'status' and parent is not None and parent.tag in ('suite', 'test', 'kw') and frames:
+            frames[-1].elapsed = float(elem.get('elapsed', 0))
+            frames[-1].status = elem.get('status')
+        elif elem.tag == 'kw' and frames:
+            add_keyword(profile, frames, active)
+        elif elem.tag == 'test' and frames and frames[-1].kind == 'test':
+            frame = frames.pop()
+            profile.tests.append(('.'.join(f.name for f in frames if f.kind == 'suite') + f".{frame.name}",
+                                  frame.elapsed))
+        elif elem.tag == 'suite' and frames and frames[-1].kind == 'suite':
+            frame = frames.pop()
+            profile.suites.append(('.'.join([f.name for f in frames] + [frame.name]), frame.elapsed))
+
+        elem.clear()
+        if parent is not None:
+            parent.remove(elem)
+
+    return profile
+
+
+def add_keyword(profile, frames, active):
+    """Record the timings of the keyword frame being closed."""
+    frame = frames.pop()
+    active[frame.name] -= 1
+    if frame.status == 'NOT RUN':
+        return
+
+    stat = profile.keywords.setdefault(frame.name, KeywordStat(frame.name))
+    stat.calls += 1
+    if not active[frame.name]:
+        stat.inclusive += frame.elapsed
+    self_time = max(frame.elapsed - frame.children_time, 0.0)
+    stat.self_time += self_time
+
+    caller = frames[-1] if frames else None
+    if caller is not None:
+        caller.children_time += frame.elapsed
+        if caller.kind == 'kw':
+            edge = (caller.name, frame.name)
+            profile.calls[edge] = profile.calls.get(edge, 0) + 1
+
+    stack = ';'.join(stack_frame(f.name) for f in frames + [frame])
+    profile.stacks[stack] = profile.stacks.get(stack, 0.0) + self_time
+
+
+def save_collapsed_stacks(profile, output_path):
+    """
+    Saves the collapsed stacks used by flamegraph tools (flamegraph.pl, speedscope, inferno).
+
+    Each line is `suite;test;keyword;... <self microseconds>`.
+
+    Args:
+        profile (KeywordProfile): Keyword timings
+        output_path (str): Path of the collapsed stacks file
+
+    Returns:
+        str: Full path of the generated file
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        for stack, seconds in sorted(profile.stacks.items()):
+            microseconds = round(seconds * 1_000_000)
+            if microseconds:
+                f.write(f"{stack} {microseconds}\n")
+    print(f"Collapsed stacks generated at: {output_path}")
+    return output_path
+
+
+def generate_markdown_report(profile, top=20):
+    """
+    Generates the profile report in Markdown format.
+
+    Args:
+        profile (KeywordProfile): Keyword timings
+        top (int, optional): Number of rows of each table. Defaults to 20.
+
+    Returns:
+        str: Report with the slowest keywords, keyword calls, tests and suites
+    """
+    report = f"""## Keyword Profile
+
+### Slowest Keywords (inclusive time)
+| Keyword | Calls | Inclusive (s) | Self (s) | Average (s) |
+|---------|-------|---------------|----------|-------------|
+"""
+    for stat in profile.top_keywords(top):
+        report += (f"| {stat.name} | {stat.calls} | {stat.inclusive:.3f} | {stat.self_time:.3f} | "
+                   f"{stat.inclusive / stat.calls:.3f} |\n")
+
+    report += """
+### Slowest Keywords (self time)
+| Keyword | Calls | Self (s) | Inclusive (s) |
+|---------|-------|----------|---------------|
+"""
+    for stat in profile.top_keywords(top, key='self_time'):
+        report += f"| {stat.name} | {stat.calls} | {stat.self_time:.3f} | {stat.inclusive:.3f} |\n"
+
+    report += """
+### Most Frequent Calls
+| Caller | Keyword | Calls |
+|--------|---------|-------|
+"""
+    for (caller, callee), calls in profile.top_calls(top):
+        report += f"| {caller} | {callee} | {calls} |\n"
+
+    report += """
+### Slowest Tests
+| Test | Elapsed (s) |
+|------|-------------|
+"""
+    for name, elapsed in profile.top_tests(top):
+        report += f"| {name} | {elapsed:.3f} |\n"
+
+    report += """
+### Slowest Suites
+| Suite | Elapsed (s) |
+|-------|-------------|
+"""
+    for name, elapsed in profile.top_suites(top):
+        report += f"| {name} | {elapsed:.3f} |\n"
+
+    report += f"\n*Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*"
+    return report
+
+
+def save_reports(profile, output_dir, top=20):
+    """
+    Saves the Markdown report, the JSON profile and the collapsed stacks.
+
+    Args:
+        profile (KeywordProfile): Keyword timings
+        output_dir (str): Directory to save the reports
+        top (int, optional): Number of rows of each Markdown table. Defaults to 20.
+
+    Returns:
+        dict: Paths of the generated files
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    paths = {
+        'markdown': os.path.join(output_dir, 'keyword_profile.md'),
+        'json': os.path.join(output_dir, 'keyword_profile.json'),
+        'collapsed': os.path.join(output_dir, 'keyword_profile.collapsed'),
+    }
+    with open(paths['markdown'], 'w', encoding='utf-8') as f:
+        f.write(generate_markdown_report(profile, top))
+    with open(paths['json'], 'w', encoding='utf-8') as f:
+        json.dump({
+            'keywords': [stat.to_dict() for stat in profile.top_keywords(len(profile.keywords))],
+            'calls': [{'caller': caller, 'keyword': callee, 'calls': calls}
+                      for (caller, callee), calls in profile.top_calls(len(profile.calls))],
+            'tests': [{'name': name, 'elapsed': elapsed} for name, elapsed in profile.top_tests(len(profile.tests))],
+            'suites': [{'name': name, 'elapsed': elapsed}
+                       for name, elapsed in profile.top_suites(len(profile.suites))],
+        }, f, indent=2)
+    save_collapsed_stacks(profile, paths['collapsed'])
+    print(f"Keyword profile generated at: {paths['markdown']}")
+    return paths
+
+
+def main():
+    """
+    Main function for command-line execution.
+
+    Command-line arguments:
+        output_file: Path to output.xml file
+        --output-dir: Directory to save the reports (default: reports/profile)
+        --top: Number of rows of each table (default: 20)
+
+    Example usage:
+        python keyword_profiler.py reports/output.xml --output-dir reports/profile --top 30
+        flamegraph.pl reports/profile/keyword_profile.collapsed > reports/profile/flamegraph.svg
+    """
+    import argparse
+
+    # Force UTF-8 encoding
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+    parser = argparse.ArgumentParser(description='Keyword profiler and flamegraph export')
+    parser.add_argument('output_file', help='Path to output.xml file')
+    parser.add_argument('--output-dir', default='reports/profile', help='Directory to save the reports')
+    parser.add_argument('--top', type=int, default=20, help='Number of rows of each table (default: 20)')
+    args = parser.parse_args()
+
+    try:
+        save_reports(profile_output(args.output_file), args.output_dir, args.top)
+    except Exception as e:
+        print(f"Error profiling output: {e}")
+        sys.exit(1)
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import importlib
+import importlib.util
+import os
+import sys
+import types
+
+# Set LAZY_IMPORTS=false to import every dependency when the library is imported
+LAZY_IMPORTS = os.environ.get('LAZY_IMPORTS', 'true').lower() not in ('false', 'no', '0', 'off')
+
+
+class LazyModule(types.ModuleType):
+    """Module proxy importing the real module on the first access to one of its attributes."""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self._module = None
+
+    def __getattr__(self, attribute):
+        # Robot inspects every module level name of a library (robot_name, __call__, ...) when
+        # it creates the keywords: these lookups must not import the module
+        if attribute.startswith(('__', 'robot_')):
+            raise AttributeError(attribute)
+        if self._module is None:
+            self._module = importlib.import_module(self.__name__)
+        return getattr(self._module, attribute)
+
+
+def lazy_import(name):
+    """
+    Import a module on the first access to one of its attributes.
+
+    Heavy dependencies of the Python libraries (pandas, scikit-image, requests, ...) are
+    imported by every suite that imports the library, even when no keyword using them runs.
+    The module is located when the library is imported, so a missing dependency still fails
+    the library import, but its code only runs when a keyword uses it.
+
+    Args:
+        name (str): Module name, e.g. `pandas` or `skimage.metrics`
+
+    Returns:
+        module: The module, or a proxy importing it when it is first used
+
+    Raises:
+        ModuleNotFoundError: If the module is not installed
+
+    Example:
+        pd = lazy_import('pandas')
+    """
+    if name in sys.modules or not LAZY_IMPORTS:
+        return importlib.import_module(name)
+    if importlib.util.find_spec(name) is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+    return LazyModule(name)
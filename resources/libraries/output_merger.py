@@ -0,0 +1,400 @@
+import sys
+import os
+import io
+import re
+import tempfile
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta
+from xml.sax.saxutils import escape, quoteattr
+from test_coverage_validator import (CoverageStat, CoverageStatistics, generate_markdown_report,
+                                     save_markdown_report)
+from run_history import RunHistory
+
+TEST_ID_PLACEHOLDER = 'MERGED_TEST_ID'
+SUITE_PARENT_TAGS = ('robot', 'suite')
+
+
+class SuiteNode:
+    """
+    Suite of the merged output.
+
+    Only the suite structure and the test counts are kept in memory; tests, setups,
+    teardowns and other suite items are stored in the spool file as serialized XML.
+    """
+
+    def __init__(self, name, attrib):
+        self.name = name
+        self.attrib = {key: value for key, value in attrib.items() if key != 'id'}
+        self.suites = {}
+        self.tests = []
+        self.setup = None
+        self.setup_failed = False
+        self.teardown = None
+        self.teardown_failed = False
+        self.doc = None
+        self.metadata = {}
+        self.status = None
+        self.status_message = None
+        self.start = None
+        self.end = None
+        self.passed = 0
+        self.failed = 0
+        self.skipped = 0
+
+    def child(self, name, attrib):
+        if name not in self.suites:
+            self.suites[name] = SuiteNode(name, attrib)
+        return self.suites[name]
+
+    def add_status(self, attrib, message):
+        """Combine the suite status of one shard with the ones already merged."""
+        if attrib.get('status') == 'FAIL' and self.status != 'FAIL':
+            self.status = 'FAIL'
+            self.status_message = message
+        elif self.status is None:
+            self.status = attrib.get('status')
+            self.status_message = message
+        if attrib.get('start'):
+            start = datetime.fromisoformat(attrib['start'])
+            end = start + timedelta(seconds=float(attrib.get('elapsed', 0)))
+            self.start = min(self.start, start) if self.start else start
+            self.end = max(self.end, end) if self.end else end
+
+
+class OutputMerger:
+    """
+    Merges pabot output.xml shards into one output.xml in a streaming pass.
+
+    Each shard is read with iterparse and every element is discarded once it has been
+    written to a spool file, so memory usage depends on the number of suites, not on the
+    number of tests or keywords. Suites with the same name path are merged (re-parented)
+    into one suite, ids and statistics are recomputed, and the coverage statistics are
+    collected in the same pass.
+    """
+
+    def __init__(self):
+        self.roots = {}
+        self.robot_attrib = None
+        self.errors = []
+        self.tags = {}
+        self.spool = tempfile.TemporaryFile()
+
+    def store(self, elem):
+        """Serialize an element to the spool file and return its location."""
+        elem.tail = None
+        data = ET.tostring(elem, encoding='utf-8', xml_declaration=False)
+        offset = self.spool.seek(0, io.SEEK_END)
+        self.spool.write(data)
+        return offset, len(data)
+
+    def load(self, location):
+        """Read a serialized element from the spool file."""
+        offset, length = location
+        self.spool.seek(offset)
+        return self.spool.read(length)
+
+    def add_shard(self, output_file):
+        """
+        Merge one output.xml shard.
+
+        Args:
+            output_file (str): Path to the output.xml shard
+        """
+        elements = []
+        suites = []
+        capture = None
+        for event, elem in ET.iterparse(output_file, events=('start', 'end')):
+            parent = elements[-1] if elements else None
+            if event == 'start':
+                if parent is None and self.robot_attrib is None:
+                    self.robot_attrib = dict(elem.attrib)
+                elif elem.tag == 'suite' and parent is not None and parent.tag in SUITE_PARENT_TAGS:
+                    name = elem.get('name', '')
+                    if suites:
+                        suites.append(suites[-1].child(name, elem.attrib))
+                    else:
+                        suites.append(self.roots.setdefault(name, SuiteNode(name, elem.attrib)))
+                elif capture is None and parent is not None and parent.tag in ('suite', 'errors'):
+                    capture = elem
+                elements.append(elem)
+                continue
+
+            elements.pop()
+            parent = elements[-1] if elements else None
+            if capture is not None and capture is not elem:
+                continue
+            capture = None
+
+            if parent is not None and parent.tag == 'suite' and suites:
+                self.add_suite_item(suites[-1], elem)
+                if elem.tag == 'suite':
+                    suites.pop()
+            elif parent is not None and parent.tag == 'errors' and elem.tag == 'msg':
+                self.errors.append(self.store(elem))
+            elif elem.tag == 'suite' and suites:
+                suites.pop()
+
+            elem.clear()
+            if parent is not None:
+                parent.remove(elem)
+
+    def add_suite_item(self, node, elem):
+        """Store a direct child of a suite: test, setup, teardown, documentation, metadata or status."""
+        if elem.tag == 'test':
+            status = elem.find('status').get('status')
+            elem.set('id', TEST_ID_PLACEHOLDER)
+            node.tests.append(self.store(elem))
+            if status == 'PASS':
+                node.passed += 1
+            elif status == 'FAIL':
+                node.failed += 1
+            elif status == 'SKIP':
+                node.skipped += 1
+            for tag in elem.findall('tag'):
+                self.tags.setdefault(tag.text, CoverageStat(tag.text)).add(status)
+        elif elem.tag == 'kw' and elem.get('type') in ('SETUP', 'TEARDOWN'):
+            self.add_fixture(node, elem.get('type').lower(), elem)
+        elif elem.tag == 'doc':
+            node.doc = node.doc or self.store(elem)
+        elif elem.tag == 'meta':
+            node.metadata.setdefault(elem.get('name'), self.store(elem))
+        elif elem.tag == 'status':
+            node.add_status(elem.attrib, elem.text)
+
+    def add_fixture(self, node, name, elem):
+        """
+        Keep one suite setup or teardown for the merged suite.
+
+        With --testlevelsplit every shard runs the suite setup and teardown. The first one is
+        kept, unless a later shard failed it: the first failing one replaces it, so the
+        failure explaining "Parent suite setup failed" is in the merged output.
+        """
+        status = elem.find('status')
+        failed = status is not None and status.get('status') == 'FAIL'
+        if getattr(node, name) is None or (failed and not getattr(node, f'{name}_failed')):
+            setattr(node, name, self.store(elem))
+            setattr(node, f'{name}_failed', failed)
+
+    def get_root(self):
+        """Return the root suite, combining different root suites under a new parent."""
+        if len(self.roots) == 1:
+            return next(iter(self.roots.values()))
+        root = SuiteNode(' & '.join(self.roots), {})
+        root.suites = dict(self.roots)
+        return root
+
+    def compute_statistics(self, node, full_name, stats):
+        """Aggregate the test counts of a suite and its children, parents before children."""
+        stat = CoverageStat(full_name, node.passed, node.failed, node.skipped)
+        stats.append(stat)
+        for child in node.suites.values():
+            child_stat = self.compute_statistics(child, f"{full_name}.{child.name}", stats)
+            stat.passed += child_stat.passed
+            stat.failed += child_stat.failed
+            stat.skipped += child_stat.skipped
+        return stat
+
+    def get_statistics(self):
+        """
+        Return the coverage statistics of the merged output.
+
+        Returns:
+            CoverageStatistics: Totals and per-suite test counts
+        """
+        root = self.get_root()
+        suites = []
+        total = self.compute_statistics(root, root.name, suites)
+        return CoverageStatistics(CoverageStat('All Tests', total.passed, total.failed, total.skipped), suites)
+
+    def write_suite(self, output, node, suite_id, stats):
+        """Write a suite, its children and its recomputed status."""
+        stat = stats.pop(0)
+        attrib = ''.join(f" {key}={quoteattr(value)}" for key, value in node.attrib.items() if key != 'name')
+        output.write(f'<suite id="{suite_id}" name={quoteattr(node.name)}{attrib}>\n'.encode('utf-8'))
+        if node.setup:
+            output.write(self.load(node.setup) + b'\n')
+        for index, child in enumerate(node.suites.values(), start=1):
+            self.write_suite(output, child, f"{suite_id}-s{index}", stats)
+        for index, location in enumerate(node.tests, start=1):
+            test = self.load(location).replace(
+                f'id="{TEST_ID_PLACEHOLDER}"'.encode(), f'id="{suite_id}-t{index}"'.encode(), 1)
+            output.write(test + b'\n')
+        for location in [node.teardown, node.doc, *node.metadata.values()]:
+            if location:
+                output.write(self.load(location) + b'\n')
+
+        if stat.failed or node.status == 'FAIL':
+            status = 'FAIL'
+        elif stat.passed:
+            status = 'PASS'
+        elif stat.skipped:
+            status = 'SKIP'
+        else:
+            status = node.status or 'PASS'
+        times = ''
+        if node.start:
+            times = f' start="{node.start.isoformat()}" elapsed="{(node.end - node.start).total_seconds():.6f}"'
+        message = escape(node.status_message) if status == 'FAIL' and node.status_message else ''
+        output.write(f'<status status="{status}"{times}>{message}</status>\n</suite>\n'.encode('utf-8'))
+
+    def write(self, output_file):
+        """
+        Write the merged output.xml.
+
+        Args:
+            output_file (str): Path of the merged output.xml
+
+        Returns:
+            CoverageStatistics: Totals and per-suite test counts of the merged output
+        """
+        statistics = self.get_statistics()
+        root = self.get_root()
+        robot_attrib = dict(self.robot_attrib or {})
+        robot_attrib['generated'] = datetime.now().isoformat()
+
+        os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+        with open(output_file, 'wb') as output:
+            output.write(b'<?xml version="1.0" encoding="UTF-8"?>\n')
+            attrib = ''.join(f" {key}={quoteattr(value)}" for key, value in robot_attrib.items())
+            output.write(f'<robot{attrib}>\n'.encode('utf-8'))
+            self.write_suite(output, root, 's1', list(statistics.suite))
+
+            output.write(b'<statistics>\n<total>\n')
+            output.write(self.format_stat(statistics.total, 'All Tests'))
+            output.write(b'</total>\n<tag>\n')
+            for name in sorted(self.tags, key=str.lower):
+                output.write(self.format_stat(self.tags[name], name))
+            output.write(b'</tag>\n<suite>\n')
+            suite_ids = self.get_suite_ids(root, 's1')
+            for stat, (suite_id, name) in zip(statistics.suite, suite_ids):
+                output.write(self.format_stat(stat, stat.name, {'name': name, 'id': suite_id}))
+            output.write(b'</suite>\n</statistics>\n<errors>\n')
+            for location in self.errors:
+                output.write(self.load(location) + b'\n')
+            output.write(b'</errors>\n</robot>\n')
+
+        print(f"Merged output generated at: {output_file}")
+        return statistics
+
+    def get_suite_ids(self, node, suite_id):
+        """Return the id and name of a suite and its children, parents before children."""
+        ids = [(suite_id, node.name)]
+        for index, child in enumerate(node.suites.values(), start=1):
+            ids.extend(self.get_suite_ids(child, f"{suite_id}-s{index}"))
+        return ids
+
+    @staticmethod
+    def format_stat(stat, text, attrib=None):
+        """Format a <stat> element of the statistics section."""
+        extra = ''.join(f" {key}={quoteattr(value)}" for key, value in (attrib or {}).items())
+        return (f'<stat{extra} pass="{stat.passed}" fail="{stat.failed}" skip="{stat.skipped}">'
+                f'{escape(text)}</stat>\n').encode('utf-8')
+
+
+def find_shards(paths):
+    """
+    Find the output.xml shards of the given files or directories.
+
+    Args:
+        paths (list): output.xml files or directories searched recursively (e.g. reports/pabot_results)
+
+    Returns:
+        list: Sorted output.xml paths
+    """
+    shards = []
+    for path in paths:
+        if os.path.isdir(path):
+            for directory, _, files in os.walk(path):
+                shards.extend(os.path.join(directory, name) for name in files if name == 'output.xml')
+        else:
+            shards.append(path)
+    return sorted(shards, key=lambda shard: [int(part) if part.isdigit() else part
+                                             for part in re.split(r'(\d+)', shard)])
+
+
+def merge_outputs(paths, output_file, coverage_dir=None, min_coverage=80, history_db=None, commit=None):
+    """
+    Merges output.xml shards and optionally saves the coverage report from the same pass.
+
+    Args:
+        paths (list): output.xml files or directories with shards
+        output_file (str): Path of the merged output.xml
+        coverage_dir (str, optional): Directory to save the coverage Markdown report. Defaults to None.
+        min_coverage (float, optional): Minimum required coverage percentage. Defaults to 80.
+        history_db (str, optional): SQLite run history that receives the merged run. Defaults to None.
+        commit (str, optional): Commit of the tested code stored in the history. Defaults to None.
+
+    Returns:
+        CoverageStatistics: Totals and per-suite test counts of the merged output
+
+    Raises:
+        AssertionError: If a coverage report is requested and the coverage is below the minimum
+    """
+    shards = find_shards(paths)
+    if not shards:
+        raise FileNotFoundError(f"No output.xml shards found in: {', '.join(paths)}")
+
+    merger = OutputMerger()
+    for shard in shards:
+        print(f"Merging shard: {shard}")
+        merger.add_shard(shard)
+    statistics = merger.write(output_file)
+
+    history = None
+    if history_db:
+        history = RunHistory(history_db)
+        history.ingest(output_file, commit=commit)
+
+    if coverage_dir:
+        save_markdown_report(generate_markdown_report(statistics, min_coverage, history), coverage_dir)
+        pass_percentage = (statistics.total.passed / statistics.total.total) * 100
+        if pass_percentage < min_coverage:
+            raise AssertionError(
+                f"Test coverage of {pass_percentage:.2f}% "
+                f"is below the required minimum of {min_coverage}%"
+            )
+        print(f"Test coverage passed: {pass_percentage:.2f}%")
+    return statistics
+
+
+def main():
+    """
+    Main function for command-line execution.
+
+    Command-line arguments:
+        shards: output.xml files or directories with shards (e.g. reports/pabot_results)
+        --output: Path of the merged output.xml (default: output.xml)
+        --coverage-dir: Directory to save the coverage Markdown report (default: no report)
+        --min-coverage: Minimum coverage percentage (default: 80)
+        --history-db: SQLite run history that receives the merged run (default: no history)
+        --commit: Commit of the tested code stored in the history (default: GITHUB_SHA or git HEAD)
+
+    Example usage:
+        python output_merger.py reports/pabot_results --output reports/output.xml --coverage-dir reports/coverage
+    """
+    import argparse
+
+    # Force UTF-8 encoding
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+    parser = argparse.ArgumentParser(description='Streaming merge of pabot output.xml shards')
+    parser.add_argument('shards', nargs='+', help='output.xml files or directories with shards')
+    parser.add_argument('--output', default='output.xml', help='Path of the merged output.xml')
+    parser.add_argument('--coverage-dir', help='Directory to save the coverage Markdown report')
+    parser.add_argument('--min-coverage', type=float, default=80,
+                        help='Minimum coverage percentage (default: 80)')
+    parser.add_argument('--history-db', help='SQLite run history that receives the merged run')
+    parser.add_argument('--commit', help='Commit of the tested code stored in the history')
+    args = parser.parse_args()
+
+    try:
+        merge_outputs(args.shards, args.output, args.coverage_dir, args.min_coverage, args.history_db, args.commit)
+    except Exception as e:
+        print(f"Error merging outputs: {e}")
+        sys.exit(1)
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
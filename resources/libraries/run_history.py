@@ -0,0 +1,385 @@
+import sys
+import os
+import io
+import hashlib
+import sqlite3
+import statistics
+import subprocess
+import xml.etree.ElementTree as ET
+from datetime import datetime
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_key TEXT UNIQUE NOT NULL,
+    started TEXT,
+    commit_sha TEXT,
+    source TEXT,
+    ingested_at TEXT
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    test TEXT NOT NULL,
+    status TEXT NOT NULL,
+    elapsed REAL,
+    started TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_runs_started ON runs (started);
+CREATE INDEX IF NOT EXISTS idx_results_test_run ON results (test, run_id);
+CREATE INDEX IF NOT EXISTS idx_results_run ON results (run_id);
+"""
+
+
+def current_commit():
+    """
+    Returns the commit of the tested code.
+
+    Uses the GITHUB_SHA variable in the pipelines and `git rev-parse HEAD` locally.
+
+    Returns:
+        str: Commit SHA, or None when it cannot be determined
+    """
+    if os.getenv('GITHUB_SHA'):
+        return os.getenv('GITHUB_SHA')
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def file_hash(path):
+    """
+    Returns the SHA-256 of a file, used to ingest each output.xml only once.
+
+    Args:
+        path (str): File path
+
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def stream_test_results(output_file):
+    """
+    Reads the status and duration of each test from output.xml in a streaming pass.
+
+    Args:
+        output_file (str): Path to Robot Framework output.xml file
+
+    Returns:
+        tuple: Run start time and a list of (test full name, status, elapsed seconds, start time)
+    """
+    results = []
+    run_started = None
+    suites = []
+    elements = []
+    test_name = None
+    test_status = None
+
+    for event, elem in ET.iterparse(output_file, events=('start', 'end')):
+        parent = elements[-1] if elements else None
+        if event == 'start':
+            if elem.tag == 'suite' and (parent is None or parent.tag in ('robot', 'suite')):
+                suites.append(elem.get('name', ''))
+            elif elem.tag == 'test' and parent is not None and parent.tag == 'suite':
+                test_name = '.'.join(suites + [elem.get('name', '')])
+            elements.append(elem)
+            continue
+
+        elements.pop()
+        parent = elements[-1] if elements else None
+        if elem.tag == 'status' and parent is not None and parent.tag == 'test':
+            test_status = elem.attrib
+        elif elem.tag == 'test' and test_name is not None:
+            results.append((test_name, test_status.get('status'), float(test_status.get('elapsed', 0)),
+                            test_status.get('start')))
+            test_name = None
+        elif elem.tag == 'status' and parent is not None and parent.tag == 'suite' and len(suites) == 1:
+            run_started = elem.get('start')
+        elif elem.tag == 'suite' and suites and (parent is None or parent.tag in ('robot', 'suite')):
+            suites.pop()
+
+        elem.clear()
+        if parent is not None:
+            parent.remove(elem)
+
+    return run_started, results
+
+
+class RunHistory:
+    """
+    Append-only store of the test results of each run, kept in a local SQLite file.
+
+    Each output.xml is ingested once (keyed by its content hash) with the status and
+    duration of every test. The report queries only read the most recent runs through
+    the indexes on run and test, so they stay fast as the store grows.
+
+    Attributes:
+        db_file (str): SQLite file of the store
+    """
+
+    def __init__(self, db_file):
+        self.db_file = db_file
+        os.makedirs(os.path.dirname(os.path.abspath(db_file)), exist_ok=True)
+        self.connection = sqlite3.connect(db_file)
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def ingest(self, output_file, commit=None):
+        """
+        Adds the test results of an output.xml to the store.
+
+        Args:
+            output_file (str): Path to Robot Framework output.xml file
+            commit (str, optional): Commit of the tested code. Defaults to the current commit.
+
+        Returns:
+            int: Id of the new run, or None if the output was already ingested
+        """
+        run_key = file_hash(output_file)
+        if self.connection.execute('SELECT 1 FROM runs WHERE run_key = ?', (run_key,)).fetchone():
+            print(f"Run already in history: {output_file}")
+            return None
+
+        run_started, results = stream_test_results(output_file)
+        with self.connection:
+            cursor = self.connection.execute(
+                'INSERT INTO runs (run_key, started, commit_sha, source, ingested_at) VALUES (?, ?, ?, ?, ?)',
+                (run_key, run_started or datetime.now().isoformat(), commit or current_commit(),
+                 os.path.abspath(output_file), datetime.now().isoformat())
+            )
+            run_id = cursor.lastrowid
+            self.connection.executemany(
+                'INSERT INTO results (run_id, test, status, elapsed, started) VALUES (?, ?, ?, ?, ?)',
+                [(run_id, *result) for result in results]
+            )
+        print(f"Run {run_id} added to history with {len(results)} tests")
+        return run_id
+
+    def recent_run_ids(self, limit):
+        """Returns the ids of the most recent runs, newest first."""
+        return [row[0] for row in self.connection.execute(
+            'SELECT id FROM runs ORDER BY started DESC, id DESC LIMIT ?', (limit,))]
+
+    def test_durations(self, window=10):
+        """
+        Returns the durations of each test in the most recent runs.
+
+        Args:
+            window (int, optional): Number of recent runs. Defaults to 10.
+
+        Returns:
+            dict: Durations in seconds by test full name
+        """
+        run_ids = self.recent_run_ids(window)
+        durations = {}
+        if not run_ids:
+            return durations
+        placeholders = ','.join('?' * len(run_ids))
+        for test, elapsed in self.connection.execute(
+                f'SELECT test, elapsed FROM results WHERE run_id IN ({placeholders}) AND status != \'SKIP\'',
+                run_ids):
+            durations.setdefault(test, []).append(elapsed)
+        return durations
+
+    def duration_trends(self, limit=10):
+        """
+        Returns the totals of the most recent runs.
+
+        Args:
+            limit (int, optional): Number of runs. Defaults to 10.
+
+        Returns:
+            list: Dicts with started, commit, tests, passed and duration of each run, oldest first
+        """
+        rows = self.connection.execute(
+            'SELECT runs.started, runs.commit_sha, COUNT(*), SUM(results.status = \'PASS\'), SUM(results.elapsed) '
+            'FROM runs JOIN results ON results.run_id = runs.id '
+            'WHERE runs.id IN (SELECT id FROM runs ORDER BY started DESC, id DESC LIMIT ?) '
+            'GROUP BY runs.id ORDER BY runs.started, runs.id', (limit,)
+        ).fetchall()
+        return [{'started': started, 'commit': commit, 'tests': tests, 'passed': passed, 'duration': duration}
+                for started, commit, tests, passed, duration in rows]
+
+    def regressions(self, window=5, threshold=0.2, min_seconds=0.5):
+        """
+        Returns the tests whose recent median duration got slower than the previous one.
+
+        The median of the passed runs in the last `window` runs is compared with the median
+        of the `window` runs before them.
+
+        Args:
+            window (int, optional): Runs in each compared window. Defaults to 5.
+            threshold (float, optional): Minimum relative increase (0.2 = 20% slower). Defaults to 0.2.
+            min_seconds (float, optional): Minimum absolute increase in seconds. Defaults to 0.5.
+
+        Returns:
+            list: Dicts with test, baseline, recent and change, slowest change first
+        """
+        run_ids = self.recent_run_ids(window * 2)
+        recent_ids = set(run_ids[:window])
+        if len(run_ids) <= window:
+            return []
+
+        durations = {}
+        placeholders = ','.join('?' * len(run_ids))
+        for test, run_id, elapsed in self.connection.execute(
+                f'SELECT test, run_id, elapsed FROM results WHERE run_id IN ({placeholders}) AND status = \'PASS\'',
+                run_ids):
+            durations.setdefault(test, ([], []))[0 if run_id in recent_ids else 1].append(elapsed)
+
+        regressions = []
+        for test, (recent, baseline) in durations.items():
+            if not recent or not baseline:
+                continue
+            recent_median = statistics.median(recent)
+            baseline_median = statistics.median(baseline)
+            if recent_median - baseline_median >= min_seconds and \
+                    recent_median >= baseline_median * (1 + threshold):
+                regressions.append({
+                    'test': test, 'baseline': baseline_median, 'recent': recent_median,
+                    'change': (recent_median / baseline_median - 1) * 100 if baseline_median else float('inf')
+                })
+        return sorted(regressions, key=lambda item: item['recent'] - item['baseline'], reverse=True)
+
+    def flakiness(self, window=30):
+        """
+        Returns the tests whose status flipped between runs of the same commit.
+
+        The score is the number of PASS/FAIL flips divided by the number of consecutive
+        run pairs of the same commit in which the test ran, so 1.0 means it flipped every time.
+
+        Args:
+            window (int, optional): Number of recent runs analysed. Defaults to 30.
+
+        Returns:
+            list: Dicts with test, flips, pairs, score and last status, highest score first
+        """
+        run_ids = self.recent_run_ids(window)
+        if len(run_ids) < 2:
+            return []
+
+        placeholders = ','.join('?' * len(run_ids))
+        rows = self.connection.execute(
+            f'SELECT results.test, runs.commit_sha, results.status FROM results '
+            f'JOIN runs ON runs.id = results.run_id '
+            f'WHERE results.run_id IN ({placeholders}) AND results.status IN (\'PASS\', \'FAIL\') '
+            f'ORDER BY results.test, runs.started, runs.id', run_ids
+        )
+
+        flaky = []
+        previous = None
+        counts = None
+        for test, commit, status in rows:
+            if previous is None or previous[0] != test:
+                if counts and counts['flips']:
+                    flaky.append(counts)
+                counts = {'test': test, 'flips': 0, 'pairs': 0}
+            elif commit is not None and previous[1] == commit:
+                counts['pairs'] += 1
+                counts['flips'] += previous[2] != status
+            counts['last_status'] = status
+            previous = (test, commit, status)
+        if counts and counts['flips']:
+            flaky.append(counts)
+
+        for counts in flaky:
+            counts['score'] = counts['flips'] / counts['pairs']
+        return sorted(flaky, key=lambda item: (item['score'], item['flips']), reverse=True)
+
+    def generate_markdown_report(self, limit=10, window=5, flaky_window=30):
+        """
+        Generates the history sections of the coverage report in Markdown format.
+
+        Args:
+            limit (int, optional): Runs in the duration trends table. Defaults to 10.
+            window (int, optional): Runs in each window compared for regressions. Defaults to 5.
+            flaky_window (int, optional): Runs analysed for flakiness. Defaults to 30.
+
+        Returns:
+            str: Duration trends, regressions and flakiness sections
+        """
+        report = """
+### Duration Trends
+| Run | Commit | Tests | Pass Rate | Total Duration (s) |
+|-----|--------|-------|-----------|--------------------|
+"""
+        for run in self.duration_trends(limit):
+            pass_rate = (run['passed'] / run['tests']) * 100 if run['tests'] else 0
+            report += (f"| {run['started'][:19]} | {(run['commit'] or '-')[:8]} | {run['tests']} | "
+                       f"{pass_rate:.2f}% | {run['duration']:.2f} |\n")
+
+        regressions = self.regressions(window)
+        report += f"""
+### Slower Tests (last {window} runs vs previous {window})
+"""
+        if regressions:
+            report += "| Test | Previous Median (s) | Recent Median (s) | Change |\n"
+            report += "|------|---------------------|-------------------|--------|\n"
+            for item in regressions:
+                report += (f"| {item['test']} | {item['baseline']:.2f} | {item['recent']:.2f} | "
+                           f"+{item['change']:.0f}% |\n")
+        else:
+            report += "No duration regressions.\n"
+
+        flaky = self.flakiness(flaky_window)
+        report += f"""
+### Flaky Tests (status flips on the same commit, last {flaky_window} runs)
+"""
+        if flaky:
+            report += "| Test | Flips | Same Commit Reruns | Flakiness Score | Last Status |\n"
+            report += "|------|-------|--------------------|-----------------|-------------|\n"
+            for item in flaky:
+                report += (f"| {item['test']} | {item['flips']} | {item['pairs']} | {item['score']:.2f} | "
+                           f"{item['last_status']} |\n")
+        else:
+            report += "No flaky tests.\n"
+        return report
+
+
+def main():
+    """
+    Main function for command-line execution.
+
+    Command-line arguments:
+        output_files: output.xml files to add to the history
+        --db: SQLite file of the history (default: reports/history/run_history.db)
+        --commit: Commit of the tested code (default: GITHUB_SHA or git HEAD)
+        --report: Print the history sections of the report
+
+    Example usage:
+        python run_history.py reports/output.xml --db reports/history/run_history.db --report
+    """
+    import argparse
+
+    # Force UTF-8 encoding
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+    parser = argparse.ArgumentParser(description='Historical run store')
+    parser.add_argument('output_files', nargs='*', help='output.xml files to add to the history')
+    parser.add_argument('--db', default='reports/history/run_history.db', help='SQLite file of the history')
+    parser.add_argument('--commit', help='Commit of the tested code (default: GITHUB_SHA or git HEAD)')
+    parser.add_argument('--report', action='store_true', help='Print the history sections of the report')
+    args = parser.parse_args()
+
+    history = RunHistory(args.db)
+    try:
+        for output_file in args.output_files:
+            history.ingest(output_file, commit=args.commit)
+        if args.report:
+            print(history.generate_markdown_report())
+    finally:
+        history.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import os
+import zipfile
+import xml.etree.ElementTree as ET
+from DataDriver.AbstractReaderClass import AbstractReaderClass
+import spreadsheets
+
+SPREADSHEETML = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+
+
+class spreadsheet_cache_reader(AbstractReaderClass):
+    """DataDriver reader of spreadsheets backed by the columnar data source cache.
+
+    The spreadsheet is converted once to the cache of `spreadsheets.convert` (see DataSourceCache),
+    and the next runs, suites and pabot workers memory-map the converted copy instead of
+    parsing the workbook again. Only the columns used by DataDriver (test case name, arguments,
+    tags and documentation) are read.
+
+    Every value is a string and empty cells are empty strings, like with the xlsx reader of
+    DataDriver (preserve_xls_types is not supported).
+
+    Options (DataDriver library arguments):
+    - file: Path to the spreadsheet (.xlsx, .xlsm, .csv, .parquet or .xls)
+    - sheet_name: Name or index of the Excel sheet (default: 0, the first sheet)
+    - cache_dir: Folder of the columnar cache (default: .data_source_cache)
+
+    Example:
+        Library    DataDriver    file=${EXECDIR}/resources/files/spreadsheets/users.xlsx
+        ...    reader_class=${EXECDIR}/resources/libraries/spreadsheet_cache_reader.py
+        ...    sheet_name=Users    cache_dir=${EXECDIR}/.data_source_cache
+    """
+
+    def get_data_from_source(self):
+        cache_dir = getattr(self, 'cache_dir', spreadsheets.DEFAULT_CACHE_DIR)
+        table = spreadsheets.open_table(self.file, cache_dir, self.get_sheet())
+        try:
+            self._analyse_header([name or '' for name in table.columns])
+            used = [self.test_case_column_id, *self.arguments_column_ids, self.tags_column_id,
+                    self.documentation_column_id]
+            values = {index: table.column_values(table.columns[index]) for index in used if index is not None}
+            for row_index in range(len(table)):
+                row = [''] * len(table.columns)
+                for index, column in values.items():
+                    row[index] = column[row_index] or ''
+                try:
+                    self._read_data_from_table(row)
+                except Exception as e:
+                    e.row = row_index + 1
+                    raise e
+        finally:
+            table.close()
+        return self.data_table
+
+    def get_sheet(self):
+        """
+        Return the sheet name of the cache entry.
+
+        DataDriver passes the sheet name given in the library arguments, or the index 0 (the
+        first sheet) by default. Indexes of .xlsx/.xlsm files are resolved from the workbook
+        index, without loading the workbook.
+
+        Returns:
+            str: Sheet name, or None for files without sheets
+        """
+        suffix = os.path.splitext(self.file)[1].lower()
+        sheet = self.sheet_name
+        if suffix in ('.csv', '.parquet'):
+            return None
+        if not isinstance(sheet, int):
+            return str(sheet)
+        if suffix in ('.xlsx', '.xlsm'):
+            with zipfile.ZipFile(self.file) as workbook:
+                root = ET.fromstring(workbook.read('xl/workbook.xml'))
+            names = [element.get('name') for element in root.iter(f'{SPREADSHEETML}sheet')]
+        else:
+            with spreadsheets.pd.ExcelFile(self.file) as workbook:
+                names = workbook.sheet_names
+        return names[int(sheet)]
@@ -0,0 +1,427 @@
+import csv
+import hashlib
+import importlib
+import json
+import mmap
+import os
+import re
+import shutil
+from array import array
+from collections.abc import Sequence
+import lazy_imports
+
+np = lazy_imports.lazy_import('numpy')
+pd = lazy_imports.lazy_import('pandas')
+
+FORMAT_VERSION = 1
+DEFAULT_CACHE_DIR = '.data_source_cache'
+# Rows decoded at once when iterating over a table
+ITERATION_CHUNK_SIZE = 1024
+
+_file_hashes = {}
+
+
+def import_optional(module, feature):
+    """
+    Import an optional dependency, with an error telling how to install it.
+
+    Args:
+        module (str): Module name, e.g. `openpyxl`
+        feature (str): Feature needing the module, used in the error message
+
+    Returns:
+        module: Imported module
+
+    Raises:
+        ImportError: If the module is not installed
+    """
+    try:
+        return importlib.import_module(module)
+    except ImportError:
+        package = module.split('.')[0]
+        raise ImportError(f"{feature} requires the optional dependency '{package}': uv add {package}") from None
+
+
+def column_indexes(header, columns):
+    """
+    Return the indexes of columns in a header row.
+
+    Args:
+        header (list): Column names
+        columns (list): Names of the requested columns
+
+    Returns:
+        list: Index of each requested column
+
+    Raises:
+        ValueError: If a column is not in the header
+    """
+    header = [None if name is None else str(name) for name in header]
+    missing = [column for column in columns if column not in header]
+    if missing:
+        raise ValueError(f"Column '{missing[0]}' not found, available columns: {[name for name in header if name]}")
+    return [header.index(column) for column in columns]
+
+
+def read_rows(file_path, sheet=None, columns=None):
+    """
+    Read the header and stream the rows of a spreadsheet, without loading the whole file.
+
+    .xlsx/.xlsm files are read with openpyxl in read-only mode, .csv files with the csv
+    module and .parquet files in record batches with pyarrow. Other spreadsheet formats
+    (.xls, .ods) are read with pandas. The header is read before returning, so a missing
+    column fails before the rows are used.
+
+    Args:
+        file_path (str): Path to the spreadsheet
+        sheet (str): Name of the Excel sheet (default: active sheet)
+        columns (list): Names of the columns to return (default: all columns)
+
+    Returns:
+        tuple: Column names and an iterator over the rows (tuples of cell values, None for empty cells)
+
+    Raises:
+        ValueError: If a requested column is not in the header
+        ImportError: If the optional reader of the format is not installed
+    """
+    suffix = os.path.splitext(file_path)[1].lower()
+    if suffix == '.parquet':
+        parquet = import_optional('pyarrow.parquet', 'Reading .parquet files')
+        parquet_file = parquet.ParquetFile(file_path)
+        header = parquet_file.schema_arrow.names
+        columns = list(columns or header)
+        column_indexes(header, columns)
+        return columns, (row for batch in parquet_file.iter_batches(columns=columns)
+                         for row in zip(*(column.to_pylist() for column in batch.columns)))
+    if suffix == '.csv':
+        f = open(file_path, newline='', encoding='utf-8-sig')
+        reader = csv.reader(f)
+        header, close = next(reader, []), f.close
+        # Empty csv fields are empty cells, like in Excel files
+        rows = ([value if value != '' else None for value in row] for row in reader)
+    elif suffix in ('.xlsx', '.xlsm'):
+        openpyxl = import_optional('openpyxl', f'Reading {suffix} files')
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        rows = (workbook[sheet] if sheet else workbook.active).iter_rows(values_only=True)
+        header, close = next(rows, ()), workbook.close
+    else:
+        data = pd.read_excel(file_path, sheet_name=sheet or 0, usecols=columns, dtype=str)
+        data = data.astype(object).where(data.notna(), None)
+        rows, header, close = data.itertuples(index=False, name=None), list(data.columns), lambda: None
+    header = [None if name is None else str(name) for name in header]
+    try:
+        indexes = column_indexes(header, columns) if columns else list(range(len(header)))
+    except ValueError:
+        close()
+        raise
+
+    def values():
+        try:
+            for row in rows:
+                row = tuple(row)
+                yield tuple(row[index] if index < len(row) else None for index in indexes)
+        finally:
+            close()
+
+    return [header[index] for index in indexes], values()
+
+
+def file_hash(file_path):
+    """
+    Return the SHA-256 of a file, computed once per process while its size and mtime do not change.
+
+    Args:
+        file_path (str): Path to the file
+
+    Returns:
+        str: Hexadecimal SHA-256
+    """
+    stat = os.stat(file_path)
+    key = (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+    if key not in _file_hashes:
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        _file_hashes[key] = digest.hexdigest()
+    return _file_hashes[key]
+
+
+def cache_entry_dir(file_path, cache_dir=DEFAULT_CACHE_DIR, sheet=None):
+    """Return the folder of the cached copy of a spreadsheet, keyed by its hash and sheet."""
+    sheet_key = re.sub(r'[^\w.-]', '_', sheet) if sheet else 'default'
+    return os.path.join(cache_dir, f"{file_hash(file_path)[:32]}-{sheet_key}")
+
+
+def convert(file_path, cache_dir=DEFAULT_CACHE_DIR, sheet=None):
+    """
+    Convert a spreadsheet to the columnar cache, unless it is already cached.
+
+    Every value is stored as text (None for empty cells). Each column is stored as:
+    - c<index>.data: the UTF-8 values, one after the other
+    - c<index>.offsets.npy: int64 start of each value in the data file, plus the end
+    - c<index>.nulls.npy: bool array marking the empty cells
+
+    The rows are streamed into the column files, and the entry is written to a temporary
+    folder renamed at the end, so concurrent workers never read a partial entry. The entries
+    of older versions of the same spreadsheet and sheet are removed after the conversion.
+
+    Args:
+        file_path (str): Path to the spreadsheet
+        cache_dir (str): Folder of the cache
+        sheet (str): Name of the Excel sheet (default: active sheet)
+
+    Returns:
+        str: Folder of the cache entry
+    """
+    entry_dir = cache_entry_dir(file_path, cache_dir, sheet)
+    if _read_metadata(entry_dir) is not None:
+        return entry_dir
+    temp_dir = f"{entry_dir}.{os.getpid()}.tmp"
+    shutil.rmtree(temp_dir, ignore_errors=True)
+    os.makedirs(temp_dir)
+    try:
+        header, rows = read_rows(file_path, sheet)
+        data_files = [open(os.path.join(temp_dir, f"c{index}.data"), 'wb') for index in range(len(header))]
+        offsets = [array('q', [0]) for _ in header]
+        nulls = [bytearray() for _ in header]
+        row_count = 0
+        try:
+            for row in rows:
+                row_count += 1
+                for index, value in enumerate(row):
+                    if value is None:
+                        nulls[index].append(1)
+                        offsets[index].append(offsets[index][-1])
+                        continue
+                    data = (value if isinstance(value, str) else str(value)).encode('utf-8')
+                    data_files[index].write(data)
+                    nulls[index].append(0)
+                    offsets[index].append(offsets[index][-1] + len(data))
+        finally:
+            for data_file in data_files:
+                data_file.close()
+        for index in range(len(header)):
+            np.save(os.path.join(temp_dir, f"c{index}.offsets.npy"), np.frombuffer(offsets[index], dtype=np.int64))
+            np.save(os.path.join(temp_dir, f"c{index}.nulls.npy"), np.frombuffer(bytes(nulls[index]), dtype=np.bool_))
+        metadata = {
+            'version': FORMAT_VERSION,
+            'source': os.path.abspath(file_path),
+            'sha256': file_hash(file_path),
+            'sheet': sheet,
+            'columns': header,
+            'rows': row_count,
+        }
+        with open(os.path.join(temp_dir, 'metadata.json'), 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, indent=2)
+        try:
+            os.rename(temp_dir, entry_dir)
+        except OSError:
+            # Another worker converted the same file first
+            if _read_metadata(entry_dir) is None:
+                raise
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+    remove_stale_entries(cache_dir, entry_dir)
+    return entry_dir
+
+
+def remove_stale_entries(cache_dir, entry_dir):
+    """
+    Remove the cache entries of the other versions of the spreadsheet and sheet of an entry.
+
+    An entry still mapped by another process is left in place when the system does not allow
+    deleting it (Windows), and removed by a later conversion.
+
+    Args:
+        cache_dir (str): Folder of the cache
+        entry_dir (str): Folder of the current entry
+
+    Returns:
+        int: Number of removed entries
+    """
+    current = _read_metadata(entry_dir)
+    if current is None:
+        return 0
+    removed = 0
+    with os.scandir(cache_dir) as entries:
+        for entry in entries:
+            if not entry.is_dir() or entry.name.endswith('.tmp') or entry.name == os.path.basename(entry_dir):
+                continue
+            try:
+                with open(os.path.join(entry.path, 'metadata.json'), 'r', encoding='utf-8') as f:
+                    metadata = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if (metadata.get('source'), metadata.get('sheet')) == (current['source'], current['sheet']):
+                shutil.rmtree(entry.path, ignore_errors=True)
+                removed += not os.path.exists(entry.path)
+    return removed
+
+
+def _read_metadata(entry_dir):
+    try:
+        with open(os.path.join(entry_dir, 'metadata.json'), 'r', encoding='utf-8') as f:
+            metadata = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return metadata if metadata.get('version') == FORMAT_VERSION else None
+
+
+def open_table(file_path, cache_dir=DEFAULT_CACHE_DIR, sheet=None):
+    """
+    Return the memory-mapped columnar copy of a spreadsheet, converting it on the first use.
+
+    Args:
+        file_path (str): Path to the spreadsheet
+        cache_dir (str): Folder of the cache
+        sheet (str): Name of the Excel sheet (default: active sheet)
+
+    Returns:
+        ColumnarTable: Columnar copy of the spreadsheet
+    """
+    return ColumnarTable(convert(file_path, cache_dir, sheet))
+
+
+class ColumnarTable:
+    """Memory-mapped columnar copy of a spreadsheet created by `convert`.
+
+    Columns are mapped on their first use, so reading one column of a wide sheet never
+    touches the files of the other columns. `close` unmaps them: Windows cannot delete a
+    mapped file.
+    """
+
+    closed = False
+
+    def __init__(self, entry_dir):
+        self.entry_dir = entry_dir
+        self.metadata = _read_metadata(entry_dir)
+        if self.metadata is None:
+            raise ValueError(f"'{entry_dir}' is not a data source cache entry")
+        self.columns = self.metadata['columns']
+        self.row_count = self.metadata['rows']
+        self._mapped = {}
+
+    def __len__(self):
+        return self.row_count
+
+    def column(self, name):
+        """
+        Return the memory maps of a column.
+
+        Args:
+            name (str): Column name
+
+        Returns:
+            tuple: Offsets array, nulls array and data bytes of the column
+        """
+        if self.closed:
+            raise ValueError(f"The data source cache entry '{self.entry_dir}' is closed (the cache was cleared "
+                             f"or the spreadsheet changed), read the rows again")
+        if name not in self._mapped:
+            index = column_indexes(self.columns, [name])[0]
+            prefix = os.path.join(self.entry_dir, f"c{index}")
+            offsets = np.load(f"{prefix}.offsets.npy", mmap_mode='r')
+            nulls = np.load(f"{prefix}.nulls.npy", mmap_mode='r')
+            with open(f"{prefix}.data", 'rb') as f:
+                # An empty file cannot be mapped
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(f.fileno()).st_size else b''
+            self._mapped[name] = (offsets, nulls, data)
+        return self._mapped[name]
+
+    def close(self):
+        """
+        Unmap the column files, e.g. before deleting the cache entry.
+
+        The table and the rows returned by it cannot be read after it is closed: its entry
+        may no longer exist.
+        """
+        self.closed = True
+        # The NumPy arrays hold a buffer of their map: they are released before closing it
+        maps = [getattr(array, '_mmap', None) for offsets, nulls, _ in self._mapped.values()
+                for array in (offsets, nulls)]
+        maps += [data for _, _, data in self._mapped.values()]
+        self._mapped = {}
+        for mapped in maps:
+            if isinstance(mapped, mmap.mmap):
+                try:
+                    mapped.close()
+                except BufferError:
+                    # A view of the column is still used elsewhere, it is unmapped when released
+                    pass
+
+    def column_values(self, name, start=0, end=None):
+        """
+        Return the values of a column between two row indexes.
+
+        Args:
+            name (str): Column name
+            start (int): First row index (default: 0)
+            end (int): Row index after the last one (default: last row)
+
+        Returns:
+            list: Values of the column, None for empty cells
+        """
+        start, end, _ = slice(start, end).indices(self.row_count)
+        if start >= end:
+            return []
+        offsets, nulls, data = self.column(name)
+        bounds = offsets[start:end + 1].tolist()
+        empty = nulls[start:end].tolist()
+        return [None if empty[index] else data[bounds[index]:bounds[index + 1]].decode('utf-8')
+                for index in range(end - start)]
+
+    def rows(self, columns=None, start=0, end=None):
+        """
+        Return a lazy view of rows of the table.
+
+        Args:
+            columns (list): Names of the columns of each row (default: all columns)
+            start (int): First row index (default: 0)
+            end (int): Row index after the last one (default: last row)
+
+        Returns:
+            LazyRows: Rows, decoded as dictionaries when they are accessed
+        """
+        columns = list(columns or self.columns)
+        column_indexes(self.columns, columns)
+        return LazyRows(self, columns, range(*slice(start, end).indices(self.row_count)))
+
+
+class LazyRows(Sequence):
+    """Sequence of rows of a ColumnarTable, decoded as dictionaries when they are accessed.
+
+    Supports len(), indexing, slicing (another lazy view) and iteration, which decodes the
+    rows in chunks. Reading rows of a closed table raises ValueError.
+    """
+
+    def __init__(self, table, columns, indexes):
+        self.table = table
+        self.columns = columns
+        self.indexes = indexes
+
+    def __len__(self):
+        return len(self.indexes)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return LazyRows(self.table, self.columns, self.indexes[item])
+        index = self.indexes[item]
+        return {column: self.table.column_values(column, index, index + 1)[0] for column in self.columns}
+
+    def __iter__(self):
+        step = self.indexes.step
+        for chunk_start in range(0, len(self.indexes), ITERATION_CHUNK_SIZE):
+            chunk = self.indexes[chunk_start:chunk_start + ITERATION_CHUNK_SIZE]
+            if step == 1:
+                values = [self.table.column_values(column, chunk.start, chunk.stop) for column in self.columns]
+            else:
+                low, high = min(chunk[0], chunk[-1]), max(chunk[0], chunk[-1]) + 1
+                positions = [index - low for index in chunk]
+                values = [[column[position] for position in positions] for column in
+                          (self.table.column_values(name, low, high) for name in self.columns)]
+            for row in zip(*values):
+                yield dict(zip(self.columns, row))
+
+    def __repr__(self):
+        return f"<LazyRows {len(self)} rows of {self.columns}>"
@@ -1,40 +1,204 @@
 import sys
 import os
 import io
+import time
+import tracemalloc
 import pytz
+import xml.etree.ElementTree as ET
 from datetime import datetime
 from robot.api import ExecutionResult
 import json
-
-# Force UTF-8 encoding
-sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
-sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+from run_history import RunHistory
 
 # Set the timezone to Brazil/Sao Paulo
 brazil_tz = pytz.timezone('America/Sao_Paulo')
 
-def generate_markdown_report(result, min_coverage):
+class CoverageStat:
+    """
+    Test counts of a suite (or of the whole run).
+
+    Attributes:
+        name (str): Suite full name (e.g. Tests.Examples.Api)
+        passed (int): Number of passed tests
+        failed (int): Number of failed tests
+        skipped (int): Number of skipped tests
+    """
+
+    def __init__(self, name, passed=0, failed=0, skipped=0):
+        self.name = name
+        self.passed = passed
+        self.failed = failed
+        self.skipped = skipped
+
+    @property
+    def total(self):
+        return self.passed + self.failed + self.skipped
+
+    def add(self, status):
+        if status == 'PASS':
+            self.passed += 1
+        elif status == 'FAIL':
+            self.failed += 1
+        elif status == 'SKIP':
+            self.skipped += 1
+
+    def __eq__(self, other):
+        return (self.name, self.passed, self.failed, self.skipped) == \
+            (other.name, other.passed, other.failed, other.skipped)
+
+
+class CoverageStatistics:
+    """
+    Totals and per-suite test counts used by the coverage report.
+
+    Attributes:
+        total (CoverageStat): Test counts of the whole run
+        suite (list): CoverageStat of each suite, parents before their children
+    """
+
+    def __init__(self, total, suite):
+        self.total = total
+        self.suite = suite
+
+    def __eq__(self, other):
+        return self.total == other.total and self.suite == other.suite
+
+
+def collect_statistics(result):
+    """
+    Collects the coverage statistics from a full Robot Framework result model.
+
+    Args:
+        result (ExecutionResult): Robot Framework test execution result object
+
+    Returns:
+        CoverageStatistics: Totals and per-suite test counts
+    """
+    total = result.statistics.total
+    return CoverageStatistics(
+        CoverageStat('All Tests', total.passed, total.failed, total.skipped),
+        [CoverageStat(suite.name, suite.passed, suite.failed, suite.skipped) for suite in result.statistics.suite]
+    )
+
+
+def stream_statistics(output_file):
+    """
+    Collects the coverage statistics from output.xml in a single streaming pass.
+
+    Unlike ExecutionResult, keywords and messages are never kept in memory: each element
+    is cleared and detached from its parent as soon as it has been parsed, so memory usage
+    stays constant regardless of the output size.
+
+    Args:
+        output_file (str): Path to Robot Framework output.xml file
+
+    Returns:
+        CoverageStatistics: Totals and per-suite test counts (same values as collect_statistics)
+    """
+    total = CoverageStat('All Tests')
+    suites = []
+    open_suites = []
+    elements = []
+    test_status = None
+
+    for event, elem in ET.iterparse(output_file, events=('start', 'end')):
+        if event == 'start':
+            if elem.tag == 'suite' and (not elements or elements[-1].tag in ('robot', 'suite')):
+                name = elem.get('name', '')
+                full_name = f"{open_suites[-1].name}.{name}" if open_suites else name
+                open_suites.append(CoverageStat(full_name))
+                suites.append(open_suites[-1])
+            elements.append(elem)
+            continue
+
+        elements.pop()
+        parent = elements[-1] if elements else None
+        if elem.tag == 'status' and parent is not None and parent.tag == 'test':
+            test_status = elem.get('status')
+        elif elem.tag == 'test':
+            total.add(test_status)
+            for suite in open_suites:
+                suite.add(test_status)
+            test_status = None
+        elif elem.tag == 'suite' and open_suites and (parent is None or parent.tag in ('robot', 'suite')):
+            open_suites.pop()
+
+        elem.clear()
+        if parent is not None:
+            parent.remove(elem)
+
+    return CoverageStatistics(total, suites)
+
+
+def load_statistics(output_file, streaming=False):
+    """
+    Loads the coverage statistics, streaming output.xml or building the full result model.
+
+    Args:
+        output_file (str): Path to Robot Framework output.xml file
+        streaming (bool, optional): Uses the constant memory streaming pass. Defaults to False.
+
+    Returns:
+        CoverageStatistics: Totals and per-suite test counts
+    """
+    if streaming:
+        return stream_statistics(output_file)
+    return collect_statistics(ExecutionResult(output_file))
+
+
+def benchmark_statistics(output_file):
+    """
+    Compares the full result model and the streaming pass on the same output.xml.
+
+    Measures the elapsed time and the peak memory allocated by each mode and checks
+    that both produce the same statistics.
+
+    Args:
+        output_file (str): Path to Robot Framework output.xml file
+
+    Returns:
+        dict: Elapsed seconds and peak MB of each mode, and whether the statistics match
+    """
+    results = {}
+    statistics = {}
+    for mode, streaming in (('full_model', False), ('streaming', True)):
+        tracemalloc.start()
+        start = time.perf_counter()
+        statistics[mode] = load_statistics(output_file, streaming=streaming)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        results[mode] = {'seconds': round(elapsed, 3), 'peak_mb': round(peak / 1024 / 1024, 2)}
+        print(f"{mode}: {elapsed:.3f}s, peak memory {peak / 1024 / 1024:.2f} MB")
+    results['statistics_match'] = statistics['full_model'] == statistics['streaming']
+    print(f"Statistics match: {results['statistics_match']}")
+    return results
+
+
+def generate_markdown_report(statistics, min_coverage, history=None):
     """
     Generates a test coverage report in Markdown format.
 
-    This function analyzes the test execution results and creates a detailed
+    This function analyzes the test execution statistics and creates a detailed
     Markdown report showing coverage statistics and suite breakdown.
 
     Args:
-        result (ExecutionResult): Robot Framework test execution result object
+        statistics (CoverageStatistics): Totals and per-suite test counts
         min_coverage (float): Minimum required coverage percentage
+        history (RunHistory, optional): Run history used to add the duration trends,
+            slower tests and flaky tests sections. Defaults to None.
 
     Returns:
         str: Report in Markdown format with coverage statistics and suite details
 
     Example:
-        | ${report}= | Generate Markdown Report | ${result} | 80.0 |
+        | ${report}= | Generate Markdown Report | ${statistics} | 80.0 |
     """
     # Calculate statistics
-    total_tests = result.statistics.total.total
-    passed_tests = result.statistics.total.passed
-    failed_tests = result.statistics.total.failed
-    skipped_tests = result.statistics.total.skipped
+    total_tests = statistics.total.total
+    passed_tests = statistics.total.passed
+    failed_tests = statistics.total.failed
+    skipped_tests = statistics.total.skipped
 
     # Calculate percentage of passed tests
     pass_percentage = (passed_tests / total_tests) * 100
@@ -66,10 +230,14 @@ def generate_markdown_report(result, min_coverage):
 """
 
     # Add details for each test suite
-    for suite in result.statistics.suite:
+    for suite in statistics.suite:
         suite_pass_percentage = (suite.passed / suite.total) * 100 if suite.total > 0 else 0
         markdown_report += f"| {suite.name} | {suite.total} | {suite.passed} | {suite_pass_percentage:.2f}% |\n"
 
+    # Add history sections
+    if history is not None:
+        markdown_report += history.generate_markdown_report()
+
     # Add footer with Brazil timezone
     markdown_report += f"\n*Generated on: {datetime.now(brazil_tz).strftime('%Y-%m-%d %H:%M:%S')}*"
 
@@ -111,7 +279,10 @@ def validate_test_coverage(
     output_file,
     min_coverage=80,
     output_dir='test_reports',
-    verbose=True
+    verbose=True,
+    streaming=False,
+    history_db=None,
+    commit=None
 ):
     """
     Validates test coverage and generates a Markdown report.
@@ -125,6 +296,12 @@ def validate_test_coverage(
         min_coverage (float, optional): Minimum required coverage percentage. Defaults to 80.
         output_dir (str, optional): Directory to save reports. Defaults to 'test_reports'.
         verbose (bool, optional): Enables detailed logging. Defaults to True.
+        streaming (bool, optional): Reads output.xml in a constant memory streaming pass
+            instead of building the full result model. Defaults to False.
+        history_db (str, optional): SQLite run history that receives this run and adds
+            the trend sections to the report. Defaults to None.
+        commit (str, optional): Commit of the tested code stored in the history.
+            Defaults to GITHUB_SHA or git HEAD.
 
     Raises:
         AssertionError: If test coverage is below the specified minimum.
@@ -133,16 +310,22 @@ def validate_test_coverage(
         | Validate Test Coverage | output.xml | min_coverage=85 | output_dir=reports |
     """
     try:
-        # Load test execution result
-        result = ExecutionResult(output_file)
+        # Load test execution statistics
+        statistics = load_statistics(output_file, streaming=streaming)
 
         # Calculate percentage of passed tests
-        total_tests = result.statistics.total.total
-        passed_tests = result.statistics.total.passed
+        total_tests = statistics.total.total
+        passed_tests = statistics.total.passed
         pass_percentage = (passed_tests / total_tests) * 100
 
+        # Add the run to the history
+        history = None
+        if history_db:
+            history = RunHistory(history_db)
+            history.ingest(output_file, commit=commit)
+
         # Generate Markdown report
-        markdown_report = generate_markdown_report(result, min_coverage)
+        markdown_report = generate_markdown_report(statistics, min_coverage, history)
 
         # Save Markdown report
         save_markdown_report(markdown_report, output_dir)
@@ -174,12 +357,20 @@ def main():
         --min-coverage: Minimum coverage percentage (default: 80)
         --output-dir: Directory to save reports (default: 'test_reports')
         --quiet: Disable detailed logging
+        --streaming: Read output.xml in a constant memory streaming pass
+        --benchmark: Compare the full model and the streaming pass, without validating coverage
+        --history-db: SQLite run history that receives this run (adds trend sections to the report)
+        --commit: Commit of the tested code stored in the history (default: GITHUB_SHA or git HEAD)
 
     Example usage:
-        python test_coverage_validator.py output.xml --min-coverage 85 --output-dir reports
+        python test_coverage_validator.py output.xml --min-coverage 85 --output-dir reports --streaming
     """
     import argparse
 
+    # Force UTF-8 encoding
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
     parser = argparse.ArgumentParser(description='Test Coverage Validator')
     parser.add_argument('output_file', help='Path to output.xml file')
     parser.add_argument('--min-coverage', type=float, default=80,
@@ -188,14 +379,29 @@ def main():
                         help='Directory to save reports')
     parser.add_argument('--quiet', action='store_true',
                         help='Disable detailed logging')
+    parser.add_argument('--streaming', action='store_true',
+                        help='Read output.xml in a constant memory streaming pass')
+    parser.add_argument('--benchmark', action='store_true',
+                        help='Compare the full model and the streaming pass')
+    parser.add_argument('--history-db',
+                        help='SQLite run history that receives this run')
+    parser.add_argument('--commit',
+                        help='Commit of the tested code stored in the history')
 
     args = parser.parse_args()
 
+    if args.benchmark:
+        results = benchmark_statistics(args.output_file)
+        sys.exit(0 if results['statistics_match'] else 1)
+
     validate_test_coverage(
         args.output_file,
         min_coverage=args.min_coverage,
         output_dir=args.output_dir,
-        verbose=not args.quiet
+        verbose=not args.quiet,
+        streaming=args.streaming,
+        history_db=args.history_db,
+        commit=args.commit
     )
 
 if __name__ == "__main__":
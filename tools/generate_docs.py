@@ -5,18 +5,37 @@ This script automatically generates HTML documentation for resource files, Pytho
 and test suites using the libdoc and testdoc tools.
 
 It scans the resources and tests directories for .resource, .robot, and .py files,
-then generates documentation for each file in the documentation directory.
+then generates documentation for each file in the documentation directory:
+1. A manifest (documentation/.manifest.json) keeps the SHA-256 of each documented source,
+   so unchanged files are skipped
+2. The changed files are documented in a process pool, one libdoc/testdoc run per file
+3. Libdoc JSON specs are cached in documentation/.specs, so the library HTML files are
+   rebuilt from the specs, without importing the sources again, when only the generator changed
+4. index.html is created from the manifest, with the keyword count read from the specs
+
+Usage:
+    python tools/generate_docs.py
+    python tools/generate_docs.py --jobs 4 --force
 """
 
+import hashlib
+import json
 import os
-import subprocess
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from robot.libdoc import libdoc
+from robot.libdoc import LibraryDocumentation
 from robot.testdoc import testdoc
+from robot.version import get_version
 
 # Files to exclude from documentation generation
-EXCLUDED_FILES = ['__init__.py', 'config_variables.py', 'test_coverage_validator.py', '__init__.robot']
+EXCLUDED_FILES = ['__init__.py', 'config_variables.py', 'test_coverage_validator.py', 'output_merger.py', 'run_history.py', 'keyword_profiler.py', 'LiveMetrics.py', 'lazy_imports.py', 'spreadsheets.py', 'spreadsheet_cache_reader.py', '__init__.robot']
+
+MANIFEST_FILE = '.manifest.json'
+SPECS_DIR = '.specs'
+MANIFEST_VERSION = 1
+
+project_root = Path(__file__).parent.parent
 
 def create_documentation_directory(doc_dir):
     """
@@ -29,25 +48,69 @@ def create_documentation_directory(doc_dir):
         print(f"Creating documentation directory: {doc_dir}")
         doc_dir.mkdir(parents=True)
 
-def generate_library_documentation(source_file, output_file):
+def file_hash(path):
+    """Return the SHA-256 of a file."""
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+def load_manifest(doc_dir):
+    """
+    Load the manifest of the documented sources.
+
+    Args:
+        doc_dir (Path): Documentation output directory
+
+    Returns:
+        dict: Manifest with the Robot Framework version, the generator hash and the entries by source
+    """
+    manifest_path = doc_dir / MANIFEST_FILE
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('version') == MANIFEST_VERSION:
+            return manifest
+    except (OSError, ValueError):
+        pass
+    return {'version': MANIFEST_VERSION, 'robot': None, 'generator': None, 'files': {}}
+
+def save_manifest(doc_dir, manifest):
+    """
+    Save the manifest atomically, so an interrupted run never leaves a corrupted manifest.
+
+    Args:
+        doc_dir (Path): Documentation output directory
+        manifest (dict): Manifest to save
+    """
+    manifest_path = doc_dir / MANIFEST_FILE
+    temp_path = manifest_path.with_suffix('.tmp')
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(temp_path, manifest_path)
+
+def generate_library_documentation(source_file, output_file, spec_file=None):
     """
     Generate HTML documentation for a resource or Python library using libdoc.
 
     Args:
-        source_file (Path): Path to the source file
+        source_file (Path): Path to the source file, or to a cached libdoc JSON spec
         output_file (Path): Path to the output HTML file
+        spec_file (Path, optional): Path to save the libdoc JSON spec
 
     Returns:
-        bool: True if documentation was generated successfully, False otherwise
+        int: Number of documented keywords, None if the documentation could not be generated
     """
     try:
         print(f"Generating library documentation for: {source_file}")
-        libdoc(str(source_file), str(output_file))
+        documentation = LibraryDocumentation(str(source_file))
+        if spec_file is not None:
+            spec_file.parent.mkdir(parents=True, exist_ok=True)
+            documentation.save(str(spec_file), 'JSON')
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        documentation.save(str(output_file), 'HTML')
         print(f"Library documentation generated: {output_file}")
-        return True
+        return len(documentation.keywords)
     except Exception as e:
         print(f"Error generating library documentation for {source_file}: {e}")
-        return False
+        return None
 
 def generate_test_documentation(source_file, output_file):
     """
@@ -62,6 +125,7 @@ def generate_test_documentation(source_file, output_file):
     """
     try:
         print(f"Generating test documentation for: {source_file}")
+        output_file.parent.mkdir(parents=True, exist_ok=True)
         testdoc(str(source_file), str(output_file))
         print(f"Test documentation generated: {output_file}")
         return True
@@ -69,97 +133,123 @@ def generate_test_documentation(source_file, output_file):
         print(f"Error generating test documentation for {source_file}: {e}")
         return False
 
-def process_resources_directory(directory, doc_dir, processed_files=None):
+def build_documentation(task):
     """
-    Process a directory to find and document resources and Python libraries.
+    Generate the documentation of one source file. Runs in the worker processes of the pool.
 
     Args:
-        directory (Path): Directory to process
-        doc_dir (Path): Documentation output directory
-        processed_files (set, optional): Set of already processed files
+        task (dict): Source, output and spec paths, the kind of documentation and whether
+            the HTML is rebuilt from the cached spec
 
     Returns:
-        set: Set of processed files
+        dict: The task with the result (`ok`) and the number of keywords of libraries
     """
-    if processed_files is None:
-        processed_files = set()
-
-    for item in directory.iterdir():
-        if item.is_file():
-            # Skip files that have already been processed or are in the exclusion list
-            if item in processed_files or item.name in EXCLUDED_FILES:
-                continue
-
-            # Process .resource, .robot, and .py files
-            if item.suffix.lower() in ['.resource', '.robot', '.py']:
-                # Create subdirectory in documentation folder if needed
-                relative_path = item.relative_to(project_root / 'resources')
-                parent_dirs = relative_path.parent
-                output_dir = doc_dir / 'resources' / parent_dirs
-
-                if not output_dir.exists():
-                    output_dir.mkdir(parents=True, exist_ok=True)
-
-                # Generate output filename
-                output_file = output_dir / f"{item.stem}.html"
-
-                # Generate documentation
-                if generate_library_documentation(item, output_file):
-                    processed_files.add(item)
-                    print(f"Successfully processed resource: {item}")
-
-        elif item.is_dir() and not item.name.startswith('.'):
-            # Recursively process subdirectories
-            process_resources_directory(item, doc_dir, processed_files)
-
-    return processed_files
+    if task['kind'] == 'test':
+        task['ok'] = generate_test_documentation(Path(task['source']), Path(task['output']))
+        task['keywords'] = None
+    else:
+        source = task['spec'] if task['from_spec'] else task['source']
+        spec = None if task['from_spec'] else Path(task['spec'])
+        task['keywords'] = generate_library_documentation(Path(source), Path(task['output']), spec)
+        task['ok'] = task['keywords'] is not None
+    return task
 
-def process_tests_directory(directory, doc_dir, processed_files=None):
+def collect_source_files(directory, doc_dir, suffixes, kind):
     """
-    Process a directory to find and document test suites.
+    Find the files to document in a directory and its subdirectories.
 
     Args:
-        directory (Path): Directory to process
+        directory (Path): Directory to process (resources or tests)
         doc_dir (Path): Documentation output directory
-        processed_files (set, optional): Set of already processed files
+        suffixes (list): File suffixes to document
+        kind (str): `library` for libdoc or `test` for testdoc
 
     Returns:
-        set: Set of processed files
+        dict: Tasks by source path relative to the project root
     """
-    if processed_files is None:
-        processed_files = set()
-
-    for item in directory.iterdir():
-        if item.is_file():
-            # Skip files that have already been processed or are in the exclusion list
-            if item in processed_files or item.name in EXCLUDED_FILES:
+    sources = {}
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = sorted(name for name in dirs if not name.startswith('.') and name != '__pycache__')
+        for name in sorted(files):
+            item = Path(root) / name
+            if name in EXCLUDED_FILES or item.suffix.lower() not in suffixes:
                 continue
+            relative_path = item.relative_to(project_root)
+            output_path = doc_dir / relative_path.parent / f"{item.stem}.html"
+            sources[relative_path.as_posix()] = {
+                'kind': kind,
+                'source': str(item),
+                'output': str(output_path),
+                'spec': str(doc_dir / SPECS_DIR / relative_path.parent / f"{item.name}.json"),
+                'from_spec': False,
+            }
+    return sources
+
+def plan_documentation(sources, manifest, force=False):
+    """
+    Select the sources whose documentation must be generated.
 
-            # Process .robot files
-            if item.suffix.lower() == '.robot':
-                # Create subdirectory in documentation folder if needed
-                relative_path = item.relative_to(project_root / 'tests')
-                parent_dirs = relative_path.parent
-                output_dir = doc_dir / 'tests' / parent_dirs
+    A source is up to date when its hash, the Robot Framework version and the generator hash
+    match the manifest and its HTML file exists. When only the generator changed (or the HTML
+    file is missing), a library is rebuilt from its cached spec instead of importing it again.
 
-                if not output_dir.exists():
-                    output_dir.mkdir(parents=True, exist_ok=True)
+    Args:
+        sources (dict): Tasks by relative source path
+        manifest (dict): Manifest of the previous run
+        force (bool): Regenerate every file
 
-                # Generate output filename
-                output_file = output_dir / f"{item.stem}.html"
+    Returns:
+        tuple: Tasks to run and relative paths of the removed sources
+    """
+    robot_version = get_version()
+    generator = file_hash(__file__)
+    tasks = []
+    for relative_path, task in sources.items():
+        task['hash'] = file_hash(task['source'])
+        entry = manifest['files'].get(relative_path)
+        if force or not entry or entry['hash'] != task['hash'] or manifest['robot'] != robot_version:
+            tasks.append(task)
+        elif manifest['generator'] != generator or not Path(task['output']).exists():
+            task['from_spec'] = task['kind'] == 'library' and Path(task['spec']).exists()
+            tasks.append(task)
+    removed = [relative_path for relative_path in manifest['files'] if relative_path not in sources]
+    manifest['robot'] = robot_version
+    manifest['generator'] = generator
+    return tasks, removed
+
+def run_tasks(tasks, jobs):
+    """
+    Run the documentation tasks, in a process pool when there is more than one task.
 
-                # Generate documentation
-                if generate_test_documentation(item, output_file):
-                    processed_files.add(item)
-                    print(f"Successfully processed test: {item}")
+    Args:
+        tasks (list): Tasks returned by plan_documentation
+        jobs (int): Number of worker processes
 
-        elif item.is_dir() and not item.name.startswith('.'):
-            # Recursively process subdirectories
-            process_tests_directory(item, doc_dir, processed_files)
+    Returns:
+        list: Finished tasks
+    """
+    if jobs <= 1 or len(tasks) <= 1:
+        return [build_documentation(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as executor:
+        return list(executor.map(build_documentation, tasks))
 
-    return processed_files
+def remove_documentation(doc_dir, relative_paths, manifest):
+    """
+    Remove the HTML files and specs of sources that no longer exist.
 
-def create_index_file(doc_dir, resource_files, test_files, project_name):
+    Args:
+        doc_dir (Path): Documentation output directory
+        relative_paths (list): Relative paths of the removed sources
+        manifest (dict): Manifest to update
+    """
+    for relative_path in relative_paths:
+        entry = manifest['files'].pop(relative_path)
+        for path in (entry.get('output'), entry.get('spec')):
+            if path and (doc_dir / path).exists():
+                (doc_dir / path).unlink()
+        print(f"Removed documentation of deleted file: {relative_path}")
+
+def create_index_file(doc_dir, resource_files, test_files, project_name, keyword_counts=None):
     """
     Create an index.html file that links to all generated documentation files.
 
@@ -168,7 +258,9 @@ def create_index_file(doc_dir, resource_files, test_files, project_name):
         resource_files (set): Set of processed resource files
         test_files (set): Set of processed test files
         project_name (str): Name of the project
+        keyword_counts (dict, optional): Number of keywords by resource file
     """
+    keyword_counts = keyword_counts or {}
     index_path = doc_dir / "index.html"
 
     with open(index_path, 'w', encoding='utf-8') as index_file:
@@ -275,6 +367,8 @@ def create_index_file(doc_dir, resource_files, test_files, project_name):
                     file_type = "Robot"
                 elif file_path.suffix.lower() == '.py':
                     file_type = "Python Library"
+                if keyword_counts.get(file_path) is not None:
+                    file_type += f", {keyword_counts[file_path]} keywords"
 
                 index_file.write(f'                <li><a href="{doc_path}">{file_path.name}</a> <span class="file-type">({file_type})</span></li>\n')
 
@@ -327,11 +421,20 @@ def create_index_file(doc_dir, resource_files, test_files, project_name):
 def main():
     """
     Main function to generate documentation for resources, libraries, and test suites.
+
+    Command-line arguments:
+        --jobs: Number of worker processes (default: number of CPUs)
+        --force: Regenerate the documentation of every file
+
+    Example usage:
+        python tools/generate_docs.py --jobs 4
     """
-    global project_root
+    import argparse
 
-    # Determine project root (script is in tools/ directory)
-    project_root = Path(__file__).parent.parent
+    parser = argparse.ArgumentParser(description='Incremental documentation generator')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help='Number of worker processes')
+    parser.add_argument('--force', action='store_true', help='Regenerate the documentation of every file')
+    args = parser.parse_args()
 
     # Get project name from the root directory name
     project_name = project_root.name.replace('_', ' ').title()
@@ -343,31 +446,49 @@ def main():
     doc_dir = project_root / 'documentation'
 
     # Check if directories exist
+    sources = {}
     if not resources_dir.exists():
         print(f"Warning: Resources directory not found: {resources_dir}")
-        resource_files = set()
     else:
-        # Create documentation directory
-        create_documentation_directory(doc_dir)
-        # Process resources directory
-        resource_files = process_resources_directory(resources_dir, doc_dir)
-        print(f"Processed {len(resource_files)} resource files")
-
+        sources.update(collect_source_files(resources_dir, doc_dir, ['.resource', '.robot', '.py'], 'library'))
     if not tests_dir.exists():
         print(f"Warning: Tests directory not found: {tests_dir}")
-        test_files = set()
     else:
-        # Create documentation directory
-        create_documentation_directory(doc_dir)
-        # Process tests directory
-        test_files = process_tests_directory(tests_dir, doc_dir)
-        print(f"Processed {len(test_files)} test files")
-
-    # Create index file with project name
-    create_index_file(doc_dir, resource_files, test_files, project_name)
+        sources.update(collect_source_files(tests_dir, doc_dir, ['.robot'], 'test'))
+
+    create_documentation_directory(doc_dir)
+    manifest = load_manifest(doc_dir)
+    tasks, removed = plan_documentation(sources, manifest, args.force)
+    remove_documentation(doc_dir, removed, manifest)
+
+    for task in run_tasks(tasks, args.jobs):
+        relative_path = Path(task['source']).relative_to(project_root).as_posix()
+        if task['ok']:
+            manifest['files'][relative_path] = {
+                'hash': task['hash'],
+                'kind': task['kind'],
+                'keywords': task['keywords'],
+                'output': Path(task['output']).relative_to(doc_dir).as_posix(),
+                'spec': Path(task['spec']).relative_to(doc_dir).as_posix() if task['kind'] == 'library' else None,
+            }
+            print(f"Successfully processed {'resource' if task['kind'] == 'library' else 'test'}: {task['source']}")
+        else:
+            # Not recorded in the manifest, so the file is retried by the next run
+            manifest['files'].pop(relative_path, None)
+    save_manifest(doc_dir, manifest)
+
+    # Create index file with project name from the manifest, without parsing the sources
+    documented = {path: entry for path, entry in manifest['files'].items() if path in sources}
+    resource_files = {project_root / path for path, entry in documented.items() if entry['kind'] == 'library'}
+    test_files = {project_root / path for path, entry in documented.items() if entry['kind'] == 'test'}
+    keyword_counts = {project_root / path: entry['keywords'] for path, entry in documented.items()}
+    create_index_file(doc_dir, resource_files, test_files, project_name, keyword_counts)
 
     # Print summary
+    rebuilt = sum(1 for task in tasks if task['from_spec'])
     print(f"\nDocumentation generation complete!")
+    print(f"Files generated: {len(tasks) - rebuilt}, rebuilt from spec: {rebuilt}, "
+          f"up to date: {len(sources) - len(tasks)}, removed: {len(removed)}")
     print(f"Total resource files processed: {len(resource_files)}")
     print(f"Total test files processed: {len(test_files)}")
     print(f"Documentation saved to: {doc_dir}")
@@ -0,0 +1,436 @@
+"""
+Import Profiler Script
+
+This script measures the startup cost of each test suite, i.e. the time spent importing its
+resources, libraries and variable files before the first test runs:
+1. Each suite runs in its own `robot --dryrun` process, so every import is cold, as in a
+   pabot worker. A listener records the library, resource and variables import events and
+   the keywords used by the suite
+2. The time between two import events is the cost of the later import. The parse time of
+   each resource file is measured separately and moved to the resource itself
+3. Python's `-X importtime` output gives the cost of the third-party packages loaded by the
+   libraries (pandas, faker, ...)
+4. The report lists, for each suite, the heavy imports, the imports whose keywords are never
+   used by the suite, and the imports repeated by several files of the suite
+5. A Markdown and a JSON report are saved in the output folder
+
+The Python libraries of this repository load their heavy dependencies on first use (see
+resources/libraries/lazy_imports.py). Run with `--eager` (LAZY_IMPORTS=false) to compare.
+
+Usage:
+    python tools/import_profiler.py tests --output-dir reports/imports
+    python tools/import_profiler.py tests/Examples/api.robot --heavy-ms 20 --eager
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from robot.running.builder import ResourceFileBuilder
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(Path(__file__).parent))
+
+from test_impact import load_graph, resolve_import, suite_closure  # noqa: E402
+
+DEFAULT_HEAVY_MS = 50
+# Imported by every run: not a cost of the suite imports
+BASELINE_PACKAGES = {'robot', 'test_impact', 'import_profiler'}
+
+
+class ImportListener:
+    """Listener recording the import events and the keyword owners of a dry run.
+
+    Used by the profiler in each `robot --dryrun` process:
+
+    robot --dryrun --pythonpath tools --listener import_profiler.ImportListener:imports.json tests/api.robot
+    """
+
+    ROBOT_LISTENER_API_VERSION = 3
+
+    def __init__(self, output_file):
+        self.output_file = output_file
+        self.events = []
+        self.duplicates = []
+        self.owners = set()
+        self.last = time.perf_counter()
+
+    def _record(self, kind, name, source, importer):
+        now = time.perf_counter()
+        self.events.append({
+            'kind': kind,
+            'name': name,
+            'source': str(source) if source else None,
+            'importer': str(importer.source) if importer is not None and importer.source else None,
+            'lineno': importer.lineno if importer is not None else None,
+            'elapsed': now - self.last,
+        })
+        self.last = now
+
+    def library_import(self, library, importer):
+        self._record('library', library.name, library.source, importer)
+
+    def resource_import(self, resource, importer):
+        self._record('resource', resource.name, resource.source, importer)
+
+    def variables_import(self, attrs, importer):
+        self._record('variables', attrs['name'], attrs['source'], importer)
+
+    def message(self, message):
+        if 'already imported' in message.message:
+            self.duplicates.append(message.message)
+
+    def start_keyword(self, data, result):
+        if result.owner:
+            self.owners.add(result.owner)
+
+    def close(self):
+        with open(self.output_file, 'w', encoding='utf-8') as f:
+            json.dump({'events': self.events, 'duplicates': self.duplicates, 'owners': sorted(self.owners)}, f)
+
+
+def parse_importtime(stderr):
+    """
+    Return the cumulative import time of the packages loaded by a process.
+
+    The `-X importtime` lines are printed after their children, so they are read in reverse
+    order to know the packages each import is nested in. A package is counted once per chain,
+    at its outermost import, so its time includes its own dependencies.
+
+    Args:
+        stderr (str): Standard error of a `python -X importtime` process
+
+    Returns:
+        dict: Cumulative import time in seconds by top-level package
+    """
+    packages = {}
+    stack = []
+    for line in reversed(stderr.splitlines()):
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        package = name.strip().split('.')[0]
+        while stack and stack[-1][0] >= depth:
+            stack.pop()
+        if package not in (item[1] for item in stack):
+            packages[package] = packages.get(package, 0) + int(cumulative) / 1e6
+        stack.append((depth, package))
+    return {package: elapsed for package, elapsed in packages.items()
+            if package not in sys.stdlib_module_names and package not in BASELINE_PACKAGES}
+
+
+def resource_parse_time(source, cache):
+    """Return the time needed to parse a resource file (measured once per file)."""
+    if source not in cache:
+        start = time.perf_counter()
+        try:
+            ResourceFileBuilder(process_curdir=False).build(source)
+        except Exception:
+            pass
+        cache[source] = time.perf_counter() - start
+    return cache[source]
+
+
+def attribute_parse_times(events, parse_cache):
+    """
+    Move the parse time of the resource files from the import measured after it to the resource.
+
+    Robot parses a resource, imports what it imports and only then reports the resource import,
+    so the parse time ends up in the first import event of the resource subtree.
+
+    Args:
+        events (list): Import events in execution order
+        parse_cache (dict): Parse time by resource source
+    """
+    starts = {}
+    for index, event in enumerate(events):
+        event['self'] = event['elapsed']
+        if event['kind'] == 'resource':
+            children = [starts[other['source']] for other in events[:index]
+                        if other['importer'] == event['source'] and other['source'] in starts]
+            starts[event['source']] = min(children + [index])
+    for event in events:
+        if event['kind'] == 'resource':
+            parse_time = min(resource_parse_time(event['source'], parse_cache),
+                             events[starts[event['source']]]['self'])
+            events[starts[event['source']]]['self'] -= parse_time
+            event['self'] += parse_time
+
+
+def find_used_imports(events, owners):
+    """
+    Mark the imports whose keywords are used by the suite.
+
+    A resource is used when one of its keywords, or of the files it imports, is used.
+    Variable files are not checked.
+
+    Args:
+        events (list): Import events
+        owners (list): Libraries and resources of the keywords used by the suite
+    """
+    owners = set(owners)
+    children = {}
+    for event in events:
+        children.setdefault(event['importer'], []).append(event)
+
+    def used(event, visiting):
+        if event['kind'] == 'variables':
+            return None
+        if event['name'] in owners:
+            return True
+        if event['kind'] != 'resource' or event['source'] in visiting:
+            return False
+        visiting.add(event['source'])
+        return any(used(child, visiting) for child in children.get(event['source'], []))
+
+    for event in events:
+        event['used'] = used(event, set())
+
+
+def find_redundant_imports(test_file, files, closure_cache):
+    """
+    Find the imports declared by more than one file of the suite import closure.
+
+    Robot imports them once per suite and ignores the others, but they hide which file
+    really needs the import.
+
+    Args:
+        test_file (str): Relative path of the suite file
+        files (dict): Parsed data by relative path (test_impact.load_graph)
+        closure_cache (dict): Import closure cache
+
+    Returns:
+        dict: Relative paths of the importing files by import name
+    """
+    importers = {}
+    for path in sorted(suite_closure(test_file, files, closure_cache)):
+        data = files.get(path, {})
+        if data.get('type') == 'python':
+            continue
+        for item in data.get('imports', []):
+            resolved = resolve_import(item['name'], path, files)
+            target = resolved or item['name']
+            if item['kind'] == 'LibraryImport' and item['args']:
+                target += f" ({', '.join(item['args'])})"
+            importers.setdefault(target, []).append(path)
+    return {target: paths for target, paths in importers.items() if len(paths) > 1}
+
+
+def profile_suite(suite_file, test_dir, eager=False):
+    """
+    Run a suite in a cold `robot --dryrun` process and record its imports.
+
+    The suite is selected with `--parseinclude` from the test folder, so the imports of the
+    __init__.robot files of its folders are included, as in a full run.
+
+    Args:
+        suite_file (Path): Suite file
+        test_dir (Path): Test folder containing the suite file
+        eager (bool): Disable the lazy imports of the repository libraries
+
+    Returns:
+        dict: Import events, duplicate import messages, used keyword owners, package import
+        times, failed imports and the wall time of the process
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        events_file = os.path.join(temp_dir, 'imports.json')
+        command = [
+            sys.executable, '-X', 'importtime', '-m', 'robot', '--dryrun', '--output', 'NONE', '--report', 'NONE',
+            '--log', 'NONE', '--console', 'none', '--pythonpath', str(Path(__file__).parent),
+            '--listener', f"import_profiler.ImportListener:{events_file}",
+        ]
+        command += [str(suite_file)] if suite_file == test_dir else ['--parseinclude', str(suite_file), str(test_dir)]
+        env = dict(os.environ, LAZY_IMPORTS='false' if eager else 'true')
+        start = time.perf_counter()
+        process = subprocess.run(command, cwd=project_root, env=env, capture_output=True, text=True)
+        wall_time = time.perf_counter() - start
+        with open(events_file, 'r', encoding='utf-8') as f:
+            profile = json.load(f)
+    profile['packages'] = parse_importtime(process.stderr)
+    profile['failed'] = [line.strip() for line in process.stderr.splitlines()
+                         if line.startswith('[ ERROR ]') and 'mport' in line]
+    profile['wall_time'] = wall_time
+    return profile
+
+
+def relative(path):
+    """Return a path relative to the project root when possible."""
+    try:
+        return Path(path).resolve().relative_to(project_root.resolve()).as_posix()
+    except (TypeError, ValueError):
+        return None if path is None else str(path)
+
+
+def profile_imports(test_dir, heavy_ms=DEFAULT_HEAVY_MS, eager=False):
+    """
+    Profile the imports of every suite file of the test folder.
+
+    Args:
+        test_dir (str): Folder (or file) with the test suites
+        heavy_ms (float): Imports slower than this (in milliseconds) are reported as heavy
+        eager (bool): Disable the lazy imports of the repository libraries
+
+    Returns:
+        list: Profile of each suite
+    """
+    root = Path(test_dir)
+    suite_files = [root] if root.is_file() else sorted(
+        path for path in root.rglob('*.robot') if path.name != '__init__.robot')
+    files = load_graph(project_root / '.test_impact_cache.json')[0]
+    parse_cache = {}
+    closure_cache = {}
+    profiles = []
+    for suite_file in suite_files:
+        print(f"Profiling imports of: {suite_file}")
+        profile = profile_suite(suite_file, root, eager)
+        events = profile['events']
+        attribute_parse_times(events, parse_cache)
+        find_used_imports(events, profile['owners'])
+        # BuiltIn is imported by every suite before its own imports
+        events = [event for event in events if event['importer']]
+        relative_path = relative(suite_file)
+        profiles.append({
+            'suite': relative_path,
+            'wall_time': profile['wall_time'],
+            'import_time': sum(event['elapsed'] for event in events),
+            'imports': [{
+                'kind': event['kind'],
+                'name': event['name'],
+                'source': relative(event['source']),
+                'importer': f"{relative(event['importer'])}:{event['lineno']}",
+                'time': event['self'],
+                'heavy': event['self'] * 1000 >= heavy_ms,
+                'used': event['used'],
+            } for event in events],
+            'ignored_imports': len(profile['duplicates']),
+            'redundant': find_redundant_imports(relative_path, files, closure_cache) if relative_path in files else {},
+            'packages': dict(sorted(profile['packages'].items(), key=lambda item: -item[1])),
+            'failed': profile['failed'],
+        })
+    return profiles
+
+
+def generate_markdown_report(profiles, heavy_ms=DEFAULT_HEAVY_MS, eager=False, top=10):
+    """
+    Generate the Markdown report of the suite startup costs.
+
+    Args:
+        profiles (list): Profiles returned by profile_imports
+        heavy_ms (float): Heavy import threshold in milliseconds
+        eager (bool): Whether the lazy imports were disabled
+        top (int): Number of packages listed per suite
+
+    Returns:
+        str: Markdown report
+    """
+    lines = [
+        '# Suite Startup Cost Report',
+        '',
+        f"Lazy imports of the repository libraries: **{'disabled' if eager else 'enabled'}**",
+        '',
+        '## Summary',
+        '',
+        '| Suite | Dry run (s) | Imports (s) | Imports | Heavy | Unused | Redundant |',
+        '|-------|-------------|-------------|---------|-------|--------|-----------|',
+    ]
+    for profile in profiles:
+        imports = profile['imports']
+        lines.append(
+            f"| {profile['suite']} | {profile['wall_time']:.2f} | {profile['import_time']:.3f} | {len(imports)} | "
+            f"{sum(1 for item in imports if item['heavy'])} | "
+            f"{sum(1 for item in imports if item['used'] is False)} | {len(profile['redundant'])} |")
+
+    for profile in profiles:
+        lines += ['', f"## {profile['suite']}", '']
+        heavy = sorted((item for item in profile['imports'] if item['heavy']), key=lambda item: -item['time'])
+        if heavy:
+            lines += [f"### Heavy imports (>= {heavy_ms:g} ms)", '',
+                      '| Import | Type | Imported by | Time (ms) | Used |',
+                      '|--------|------|-------------|-----------|------|']
+            lines += [f"| {item['name']} | {item['kind']} | {item['importer']} | {item['time'] * 1000:.1f} | "
+                      f"{'yes' if item['used'] else 'no'} |" for item in heavy]
+            lines.append('')
+        unused = [item for item in profile['imports'] if item['used'] is False]
+        if unused:
+            lines += ['### Unused imports', '', 'No keyword of these imports is used by the suite:', '']
+            lines += [f"- {item['name']} ({item['kind']}, {item['importer']}, {item['time'] * 1000:.1f} ms)"
+                      for item in sorted(unused, key=lambda item: -item['time'])]
+            lines.append('')
+        if profile['redundant']:
+            lines += ['### Redundant imports', '', 'Imported by more than one file of the suite:', '']
+            lines += [f"- {target}: {', '.join(paths)}" for target, paths in sorted(profile['redundant'].items())]
+            lines.append('')
+        if profile['packages']:
+            lines += ['### Heaviest packages', '', '| Package | Cumulative import (ms) |', '|---------|------|']
+            lines += [f"| {package} | {elapsed * 1000:.1f} |"
+                      for package, elapsed in list(profile['packages'].items())[:top]]
+            lines.append('')
+        if profile['failed']:
+            lines += ['### Failed imports', '']
+            lines += [f"- {line}" for line in profile['failed']]
+            lines.append('')
+    return '\n'.join(lines).rstrip() + '\n'
+
+
+def save_reports(profiles, output_dir, heavy_ms=DEFAULT_HEAVY_MS, eager=False, top=10):
+    """
+    Save the Markdown and JSON reports.
+
+    Args:
+        profiles (list): Profiles returned by profile_imports
+        output_dir (str): Folder of the reports
+        heavy_ms (float): Heavy import threshold in milliseconds
+        eager (bool): Whether the lazy imports were disabled
+        top (int): Number of packages listed per suite
+
+    Returns:
+        tuple: Paths of the Markdown and JSON reports
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    markdown_file = os.path.join(output_dir, 'import_profile.md')
+    json_file = os.path.join(output_dir, 'import_profile.json')
+    with open(markdown_file, 'w', encoding='utf-8') as f:
+        f.write(generate_markdown_report(profiles, heavy_ms, eager, top))
+    with open(json_file, 'w', encoding='utf-8') as f:
+        json.dump({'eager': eager, 'heavy_ms': heavy_ms, 'suites': profiles}, f, indent=2)
+    print(f"Import profile saved at: {markdown_file}")
+    return markdown_file, json_file
+
+
+def main():
+    """
+    Main function for command-line execution.
+
+    Command-line arguments:
+        test_dir: Folder (or file) with the test suites (default: tests)
+        --output-dir: Folder of the reports (default: reports/imports)
+        --heavy-ms: Imports slower than this are reported as heavy (default: 50)
+        --top: Number of packages listed per suite (default: 10)
+        --eager: Disable the lazy imports of the repository libraries (LAZY_IMPORTS=false)
+
+    Example usage:
+        python tools/import_profiler.py tests --output-dir reports/imports --heavy-ms 20
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Suite import profiler')
+    parser.add_argument('test_dir', nargs='?', default='tests', help='Folder (or file) with the test suites')
+    parser.add_argument('--output-dir', default='reports/imports', help='Folder of the reports')
+    parser.add_argument('--heavy-ms', type=float, default=DEFAULT_HEAVY_MS, help='Heavy import threshold in ms')
+    parser.add_argument('--top', type=int, default=10, help='Number of packages listed per suite')
+    parser.add_argument('--eager', action='store_true', help='Disable the lazy imports of the repository libraries')
+    args = parser.parse_args()
+
+    profiles = profile_imports(args.test_dir, args.heavy_ms, args.eager)
+    save_reports(profiles, args.output_dir, args.heavy_ms, args.eager, args.top)
+    for profile in profiles:
+        print(f"{profile['suite']}: {profile['import_time']:.3f}s imports, {profile['wall_time']:.2f}s dry run")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
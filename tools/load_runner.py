@@ -0,0 +1,500 @@
+"""
+Load Runner Script
+
+This script drives existing API keyword flows (e.g. Create User Account -> Generate User Token ->
+Return If User is Autorized) as N concurrent virtual users, to measure the services under test.
+
+The flow keywords are read from the Book Store resource files, so the load test uses the same
+endpoints, HTTP methods and expected status codes as the functional tests:
+1. Each flow keyword is resolved down to its `<METHOD> On Session` call
+2. Virtual users start gradually (ramp-up) and repeat the flow until the duration ends
+3. Requests are paced to the target RPS (requests per second) when one is given
+4. Throughput and p50/p95/p99 latency histograms per endpoint are saved as JSON and Markdown
+
+Usage:
+    python tools/load_runner.py --stand-in emulate --users 20 --ramp-up 5 --duration 30 --rps 200
+    python tools/load_runner.py --flow "List all Books" --flow "List Book by ISBN:9781449365035"
+"""
+
+import json
+import os
+import re
+import socket
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlsplit
+import requests
+from robot.running.builder import ResourceFileBuilder
+from robot.utils import normalize
+
+project_root = Path(__file__).parent.parent
+
+KEYWORD_FILES = [
+    project_root / 'resources/keywords/app/Book_Store/bookStore.keywords.resource',
+    project_root / 'resources/keywords/app/Book_Store/bookStore.pages.resource',
+]
+DEFAULT_FLOW = ['Create User Account', 'Generate User Token', 'Return If User is Autorized']
+HEADERS = {'accept': 'application/json', 'Content-Type': 'application/json'}
+SESSION_KEYWORD = re.compile(r'^(get|post|put|patch|delete) on session$', re.IGNORECASE)
+VARIABLE = re.compile(r'\$\{([^}]+)\}')
+HISTOGRAM_BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+
+def load_keywords_and_variables(keyword_files):
+    """
+    Load the user keywords and variables of the resource files.
+
+    Args:
+        keyword_files (list): Paths of the .resource files
+
+    Returns:
+        tuple: Keywords by normalized name and variable values by name (e.g. 'DEMOQA_URL')
+    """
+    keywords = {}
+    variables = {}
+    for keyword_file in keyword_files:
+        resource = ResourceFileBuilder().build(str(keyword_file))
+        for variable in resource.variables:
+            variables[variable.name[2:-1]] = ' '.join(variable.value)
+        for keyword in resource.keywords:
+            keywords[normalize(keyword.name, ignore='_')] = keyword
+    return keywords, variables
+
+
+def resolve_value(value, variables):
+    """
+    Replace the ${name} variables of a value, leaving unknown variables untouched.
+
+    Args:
+        value (str): Value containing variables
+        variables (dict): Variable values by name
+
+    Returns:
+        str: Resolved value
+    """
+    for _ in range(10):
+        resolved = VARIABLE.sub(lambda match: str(variables.get(match.group(1), match.group(0))), value)
+        if resolved == value:
+            break
+        value = resolved
+    return value
+
+
+def split_named_arguments(args):
+    """
+    Split keyword call arguments into positional and named arguments.
+
+    Args:
+        args (tuple): Keyword call arguments
+
+    Returns:
+        tuple: List of positional arguments and dictionary of named arguments
+    """
+    positional, named = [], {}
+    for arg in args:
+        name, separator, value = arg.partition('=')
+        if separator and re.match(r'^\w+$', name):
+            named[name] = value
+        else:
+            positional.append(arg)
+    return positional, named
+
+
+def resolve_flow_keyword(name, args, keywords, variables):
+    """
+    Resolve a flow keyword down to the HTTP requests performed by its `<METHOD> On Session` calls.
+
+    The ${BODY} and ${HEADERS} of the requests are filled by each virtual user at run time.
+
+    Args:
+        name (str): Keyword name
+        args (list): Keyword arguments
+        keywords (dict): Keywords by normalized name
+        variables (dict): Variable values by name
+
+    Returns:
+        list: Requests as dictionaries with name, method, url, json and expected_status
+
+    Raises:
+        ValueError: If the keyword does not exist
+    """
+    keyword = keywords.get(normalize(name, ignore='_'))
+    if keyword is None:
+        raise ValueError(f"Keyword not found in {[str(path) for path in KEYWORD_FILES]}: {name}")
+
+    local_variables = dict(variables)
+    for index, argument in enumerate(keyword.args.positional_or_named):
+        if index < len(args):
+            local_variables[argument] = resolve_value(str(args[index]), variables)
+        elif argument in keyword.args.defaults:
+            local_variables[argument] = resolve_value(str(keyword.args.defaults[argument]), local_variables)
+
+    request_list = []
+    for step in keyword.body:
+        if step.type != 'KEYWORD':
+            continue
+        positional, named = split_named_arguments(step.args)
+        method = SESSION_KEYWORD.match(step.name)
+        if method:
+            request_list.append({
+                'name': keyword.name,
+                'method': method.group(1).upper(),
+                'url': resolve_value(positional[1], local_variables),
+                'json': 'json' in named,
+                'expected_status': int(resolve_value(named.get('expected_status', '200'), local_variables)),
+            })
+        elif normalize(step.name) == 'replacestring' and step.assign:
+            template, search, replace = (resolve_value(arg, local_variables) for arg in positional[:3])
+            local_variables[step.assign[0].rstrip('= ')[2:-1]] = template.replace(search, replace)
+        elif normalize(step.name, ignore='_') in keywords:
+            resolved_args = [resolve_value(arg, local_variables) for arg in positional]
+            for inner_request in resolve_flow_keyword(step.name, resolved_args, keywords, variables):
+                inner_request['name'] = keyword.name
+                request_list.append(inner_request)
+    return request_list
+
+
+def build_flow(flow_keywords, keywords, variables):
+    """
+    Build the list of requests of a flow.
+
+    Args:
+        flow_keywords (list): Flow keywords, with arguments separated by ':' (e.g. 'List Book by ISBN:9781449365035')
+        keywords (dict): Keywords by normalized name
+        variables (dict): Variable values by name
+
+    Returns:
+        list: Requests performed by the flow, in order
+    """
+    flow = []
+    for flow_keyword in flow_keywords:
+        name, *args = flow_keyword.split(':')
+        flow.extend(resolve_flow_keyword(name.strip(), args, keywords, variables))
+    return flow
+
+
+class Pacer:
+    """Shared pacer that spaces requests to reach a target number of requests per second."""
+
+    def __init__(self, rps):
+        self.interval = 1.0 / rps if rps else 0
+        self.next_slot = time.perf_counter()
+        self.lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.perf_counter()
+            self.next_slot = max(self.next_slot + self.interval, now)
+            slot = self.next_slot
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+def virtual_user(flow, stop_at, pacer, timeout, results, lock):
+    """
+    Repeat the flow with a new fake user until the stop time.
+
+    Args:
+        flow (list): Requests of the flow
+        stop_at (float): perf_counter time to stop
+        pacer (Pacer): Shared pacer
+        timeout (float): Timeout in seconds of each request
+        results (list): Shared list receiving (endpoint, latency_ms, ok) tuples
+        lock (threading.Lock): Lock protecting the results
+    """
+    session = requests.Session()
+    while time.perf_counter() < stop_at:
+        body = {'userName': f"load_{uuid.uuid4().hex[:12]}", 'password': 'Asasda!123456'}
+        for request in flow:
+            if time.perf_counter() >= stop_at:
+                break
+            pacer.wait()
+            endpoint = f"{request['name']} ({request['method']} {urlsplit(request['url']).path})"
+            start = time.perf_counter()
+            try:
+                response = session.request(request['method'], request['url'],
+                                           json=body if request['json'] else None,
+                                           headers=HEADERS, timeout=timeout)
+                ok = response.status_code == request['expected_status']
+            except requests.RequestException:
+                ok = False
+            latency_ms = (time.perf_counter() - start) * 1000
+            with lock:
+                results.append((endpoint, latency_ms, ok))
+            if not ok:
+                break
+
+
+def percentile(sorted_values, percent):
+    """
+    Return the nearest-rank percentile of a sorted list.
+
+    Args:
+        sorted_values (list): Sorted values
+        percent (float): Percentile between 0 and 100
+
+    Returns:
+        float: Percentile value
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(percent / 100 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def summarize(latencies, errors, elapsed):
+    """
+    Summarize the latencies of one endpoint (or of all endpoints).
+
+    Args:
+        latencies (list): Latencies in milliseconds
+        errors (int): Number of failed requests
+        elapsed (float): Test duration in seconds
+
+    Returns:
+        dict: Requests, errors, throughput, latency percentiles and histogram
+    """
+    values = sorted(latencies)
+    histogram = {}
+    for bucket in HISTOGRAM_BUCKETS_MS:
+        histogram[f"<={bucket}ms"] = sum(1 for value in values if value <= bucket)
+    histogram[f">{HISTOGRAM_BUCKETS_MS[-1]}ms"] = sum(1 for value in values if value > HISTOGRAM_BUCKETS_MS[-1])
+    return {
+        'requests': len(values),
+        'errors': errors,
+        'throughput_rps': round(len(values) / elapsed, 2) if elapsed else 0,
+        'latency_ms': {
+            'min': round(values[0], 2) if values else 0,
+            'mean': round(sum(values) / len(values), 2) if values else 0,
+            'p50': round(percentile(values, 50), 2),
+            'p95': round(percentile(values, 95), 2),
+            'p99': round(percentile(values, 99), 2),
+            'max': round(values[-1], 2) if values else 0,
+        },
+        'histogram': histogram,
+    }
+
+
+def run_load_test(flow, users, ramp_up, duration, rps, timeout):
+    """
+    Run the flow with concurrent virtual users and summarize the results.
+
+    Args:
+        flow (list): Requests of the flow
+        users (int): Number of virtual users
+        ramp_up (float): Seconds to start all virtual users
+        duration (float): Seconds of test, ramp-up included
+        rps (float): Target requests per second (0 for unlimited)
+        timeout (float): Timeout in seconds of each request
+
+    Returns:
+        dict: Load test report
+    """
+    results = []
+    lock = threading.Lock()
+    pacer = Pacer(rps)
+    start = time.perf_counter()
+    stop_at = start + duration
+    threads = []
+    for index in range(users):
+        start_delay = ramp_up * index / users
+        if start_delay:
+            time.sleep(max(start + start_delay - time.perf_counter(), 0))
+        thread = threading.Thread(target=virtual_user, args=(flow, stop_at, pacer, timeout, results, lock),
+                                  daemon=True)
+        thread.start()
+        threads.append(thread)
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    by_endpoint = {}
+    for endpoint, latency_ms, ok in results:
+        endpoint_results = by_endpoint.setdefault(endpoint, {'latencies': [], 'errors': 0})
+        endpoint_results['latencies'].append(latency_ms)
+        endpoint_results['errors'] += 0 if ok else 1
+
+    return {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'config': {'flow': [request['name'] for request in flow], 'users': users, 'ramp_up': ramp_up,
+                   'duration': duration, 'target_rps': rps},
+        'elapsed_seconds': round(elapsed, 2),
+        'total': summarize([latency for _, latency, _ in results],
+                           sum(1 for _, _, ok in results if not ok), elapsed),
+        'endpoints': {
+            endpoint: summarize(values['latencies'], values['errors'], elapsed)
+            for endpoint, values in by_endpoint.items()
+        },
+    }
+
+
+def generate_markdown_report(report):
+    """
+    Generate the load test report in Markdown format.
+
+    Args:
+        report (dict): Load test report
+
+    Returns:
+        str: Report in Markdown format
+    """
+    config = report['config']
+    total = report['total']
+    markdown_report = f"""## Load Test Report
+
+### General Summary
+| Metric | Value |
+|--------|-------|
+| Flow | {' → '.join(dict.fromkeys(config['flow']))} |
+| Virtual Users | {config['users']} |
+| Ramp-up | {config['ramp_up']}s |
+| Duration | {report['elapsed_seconds']}s |
+| Target RPS | {config['target_rps'] or 'unlimited'} |
+| Requests | {total['requests']} |
+| Errors | {total['errors']} |
+| Throughput | {total['throughput_rps']} req/s |
+
+### Latency by Endpoint (ms)
+| Endpoint | Requests | Errors | RPS | p50 | p95 | p99 | Max |
+|----------|----------|--------|-----|-----|-----|-----|-----|
+"""
+    for endpoint, summary in list(report['endpoints'].items()) + [('**Total**', total)]:
+        latency = summary['latency_ms']
+        markdown_report += (f"| {endpoint} | {summary['requests']} | {summary['errors']} | "
+                            f"{summary['throughput_rps']} | {latency['p50']} | {latency['p95']} | "
+                            f"{latency['p99']} | {latency['max']} |\n")
+
+    markdown_report += "\n### Latency Histogram (all endpoints)\n| Bucket | Requests |\n|--------|----------|\n"
+    for bucket, count in total['histogram'].items():
+        markdown_report += f"| {bucket} | {count} |\n"
+
+    markdown_report += f"\n*Generated on: {report['generated_at']}*"
+    return markdown_report
+
+
+def save_reports(report, output_dir):
+    """
+    Save the load test report as JSON and Markdown files.
+
+    Args:
+        report (dict): Load test report
+        output_dir (str): Directory to save the reports
+
+    Returns:
+        tuple: Paths of the JSON and Markdown files
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    filename = f"load_test_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    json_path = os.path.join(output_dir, f"{filename}.json")
+    markdown_path = os.path.join(output_dir, f"{filename}.md")
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    with open(markdown_path, 'w', encoding='utf-8') as f:
+        f.write(generate_markdown_report(report))
+    print(f"Load test reports generated at: {json_path} and {markdown_path}")
+    return json_path, markdown_path
+
+
+def start_stand_in_server(mode, latency):
+    """
+    Start the Book Store stand-in server in a separate process on a free port.
+
+    Args:
+        mode (str): Stand-in mode (emulate, record or replay)
+        latency (float): Delay in seconds injected in every response
+
+    Returns:
+        tuple: Server process and base URL
+    """
+    with socket.socket() as free_socket:
+        free_socket.bind(('127.0.0.1', 0))
+        port = free_socket.getsockname()[1]
+    process = subprocess.Popen(
+        [sys.executable, str(project_root / 'resources/libraries/BookStoreStandIn.py'),
+         '--mode', mode, '--port', str(port), '--latency', str(latency)],
+        stdout=subprocess.DEVNULL
+    )
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(50):
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.2).close()
+            return process, url
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError(f"Book Store stand-in server did not start at {url}")
+
+
+def main():
+    """
+    Main function for command-line execution.
+
+    Command-line arguments:
+        --flow: Flow keyword, repeat for each step (default: Create User Account, Generate User Token,
+                Return If User is Autorized). Keyword arguments are separated by ':'
+        --users: Number of virtual users (default: 10)
+        --ramp-up: Seconds to start all virtual users (default: 0)
+        --duration: Seconds of test (default: 30)
+        --rps: Target requests per second, 0 for unlimited (default: 0)
+        --timeout: Timeout in seconds of each request (default: 10)
+        --variable: Override a resource variable, e.g. DEMOQA_URL:http://localhost:8080
+        --stand-in: Start the Book Store stand-in server (emulate, record or replay) and test against it
+        --stand-in-latency: Latency in seconds injected by the stand-in server (default: 0)
+        --output-dir: Directory to save reports (default: reports/load)
+
+    Example usage:
+        python tools/load_runner.py --stand-in emulate --users 20 --ramp-up 5 --duration 30 --rps 200
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Load Runner for API keyword flows')
+    parser.add_argument('--flow', action='append', help='Flow keyword (repeat for each step)')
+    parser.add_argument('--users', type=int, default=10, help='Number of virtual users (default: 10)')
+    parser.add_argument('--ramp-up', type=float, default=0, help='Seconds to start all virtual users')
+    parser.add_argument('--duration', type=float, default=30, help='Seconds of test (default: 30)')
+    parser.add_argument('--rps', type=float, default=0, help='Target requests per second (default: unlimited)')
+    parser.add_argument('--timeout', type=float, default=10, help='Timeout of each request (default: 10)')
+    parser.add_argument('--variable', action='append', default=[], help='Override a variable, NAME:value')
+    parser.add_argument('--stand-in', choices=['emulate', 'record', 'replay'],
+                        help='Start the Book Store stand-in server and test against it')
+    parser.add_argument('--stand-in-latency', type=float, default=0, help='Stand-in injected latency in seconds')
+    parser.add_argument('--output-dir', default=str(project_root / 'reports' / 'load'),
+                        help='Directory to save reports')
+    args = parser.parse_args()
+
+    keywords, variables = load_keywords_and_variables(KEYWORD_FILES)
+    for variable in args.variable:
+        name, _, value = variable.partition(':')
+        variables[name] = value
+
+    process = None
+    if args.stand_in:
+        process, variables['DEMOQA_URL'] = start_stand_in_server(args.stand_in, args.stand_in_latency)
+        print(f"Book Store stand-in server started in {args.stand_in} mode at {variables['DEMOQA_URL']}")
+
+    try:
+        flow = build_flow(args.flow or DEFAULT_FLOW, keywords, variables)
+        for request in flow:
+            print(f"Flow step: {request['name']} -> {request['method']} {request['url']} "
+                  f"(expected status {request['expected_status']})")
+        report = run_load_test(flow, args.users, args.ramp_up, args.duration, args.rps, args.timeout)
+    finally:
+        if process:
+            process.terminate()
+            process.wait()
+
+    print(generate_markdown_report(report))
+    save_reports(report, args.output_dir)
+    return 1 if report['total']['errors'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,282 @@
+"""
+Pabot Scheduler Script
+
+This script creates a pabot `--ordering` file that minimizes the wall-clock time of a
+`--testlevelsplit` run, using the test durations of previous runs:
+1. Tests are read from the test folder and their durations from previous output.xml files
+   or from the run history database (median of the recent runs)
+2. Tests without history get the median duration of their suite, or of all known tests
+3. Tests that must share a worker (database tests and browser suites by default) are kept
+   together in a `{ }` group, which pabot runs sequentially in one worker
+4. Groups and tests are ordered longest first (LPT), so pabot workers, which always take the
+   next item of the queue, never end the run with one slow test while the others are idle
+5. The predicted makespan of the LPT and the default ordering are reported
+
+Usage:
+    python tools/pabot_scheduler.py tests --history reports/output.xml --processes 4
+    python tools/pabot_scheduler.py tests --history-db reports/history/run_history.db --output reports/pabot_ordering.txt
+    pabot --processes 4 --testlevelsplit --ordering reports/pabot_ordering.txt tests
+"""
+
+import heapq
+import json
+import os
+import statistics
+import sys
+from pathlib import Path
+from robot.api import TestSuiteBuilder
+from robot.utils import normalize
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'resources/libraries'))
+
+from run_history import RunHistory, stream_test_results  # noqa: E402
+
+DEFAULT_GROUP_TAGS = ['database']
+BROWSER_IMPORTS = ['browser', 'browsercontext.keywords.resource']
+DEFAULT_DURATION = 1.0
+
+
+def collect_tests(test_dir, group_tags):
+    """
+    Read the tests of the test folder and the worker group of each one.
+
+    Tests with one of the group tags belong to the group of that tag. Tests of suites that
+    import the Browser library (directly or through BrowserContext.keywords.resource)
+    belong to the `browser` group.
+
+    Args:
+        test_dir (str): Folder (or file) with the test suites
+        group_tags (list): Tags whose tests must share a worker
+
+    Returns:
+        list: Dicts with the full name, suite and group (or None) of each test
+    """
+    root = TestSuiteBuilder(process_curdir=False).build(test_dir)
+    normalized_tags = {normalize(tag): tag for tag in group_tags}
+    tests = []
+
+    def visit(suite):
+        imports = [os.path.basename(str(item.name)).lower() for item in suite.resource.imports]
+        browser_suite = any(name in BROWSER_IMPORTS for name in imports)
+        for test in suite.tests:
+            group = next((normalized_tags[normalize(tag)] for tag in test.tags
+                          if normalize(tag) in normalized_tags), None)
+            if group is None and browser_suite:
+                group = 'browser'
+            tests.append({'name': test.full_name, 'suite': suite.full_name, 'group': group})
+        for child in suite.suites:
+            visit(child)
+
+    visit(root)
+    return tests
+
+
+def load_durations(history_files=(), history_db=None, window=10):
+    """
+    Load the durations of previous runs by test full name.
+
+    Args:
+        history_files (list): Previous output.xml files
+        history_db (str): Run history database created by run_history.py
+        window (int): Number of recent runs read from the database
+
+    Returns:
+        dict: Durations in seconds by test full name
+    """
+    durations = {}
+    for history_file in history_files:
+        for name, status, elapsed, _ in stream_test_results(history_file)[1]:
+            if status != 'SKIP':
+                durations.setdefault(name, []).append(elapsed)
+    if history_db and os.path.exists(history_db):
+        history = RunHistory(history_db)
+        try:
+            for name, values in history.test_durations(window).items():
+                durations.setdefault(name, []).extend(values)
+        finally:
+            history.close()
+    return durations
+
+
+def estimate_durations(tests, durations):
+    """
+    Set the estimated duration of each test, with a fallback for tests without history.
+
+    Args:
+        tests (list): Tests returned by collect_tests
+        durations (dict): Durations in seconds by test full name
+
+    Returns:
+        int: Number of tests estimated with a fallback
+    """
+    medians = {name: statistics.median(values) for name, values in durations.items() if values}
+    suite_medians = {}
+    for test in tests:
+        if test['name'] in medians:
+            suite_medians.setdefault(test['suite'], []).append(medians[test['name']])
+    global_median = statistics.median(medians.values()) if medians else DEFAULT_DURATION
+
+    fallbacks = 0
+    for test in tests:
+        if test['name'] in medians:
+            test['duration'] = medians[test['name']]
+            test['estimated'] = False
+        else:
+            suite_values = suite_medians.get(test['suite'])
+            test['duration'] = statistics.median(suite_values) if suite_values else global_median
+            test['estimated'] = True
+            fallbacks += 1
+    return fallbacks
+
+
+def build_items(tests):
+    """
+    Build the scheduling items: one per group and one per test without group.
+
+    Args:
+        tests (list): Tests with their estimated duration
+
+    Returns:
+        list: Dicts with the name, tests and duration of each item, in the test folder order
+    """
+    items = []
+    groups = {}
+    for test in tests:
+        if test['group'] is None:
+            items.append({'name': test['name'], 'tests': [test['name']], 'duration': test['duration']})
+        elif test['group'] not in groups:
+            groups[test['group']] = {'name': test['group'], 'tests': [test['name']], 'duration': test['duration']}
+            items.append(groups[test['group']])
+        else:
+            groups[test['group']]['tests'].append(test['name'])
+            groups[test['group']]['duration'] += test['duration']
+    return items
+
+
+def simulate(items, processes):
+    """
+    Simulate pabot workers taking the next item of the queue when they are free.
+
+    Args:
+        items (list): Items in queue order
+        processes (int): Number of pabot processes
+
+    Returns:
+        tuple: Predicted makespan in seconds and the load of each worker
+    """
+    workers = [(0.0, worker) for worker in range(processes)]
+    loads = [0.0] * processes
+    for item in items:
+        load, worker = heapq.heappop(workers)
+        loads[worker] = load + item['duration']
+        heapq.heappush(workers, (loads[worker], worker))
+    return max(loads) if loads else 0.0, loads
+
+
+def lpt_order(items):
+    """Order the items longest processing time first."""
+    return sorted(items, key=lambda item: item['duration'], reverse=True)
+
+
+def save_ordering_file(items, output_path):
+    """
+    Save the pabot ordering file.
+
+    Args:
+        items (list): Items in queue order
+        output_path (str): Path of the ordering file
+
+    Returns:
+        str: Path of the generated file
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        for item in items:
+            if len(item['tests']) > 1:
+                f.write('{\n')
+                f.writelines(f"--test {name}\n" for name in item['tests'])
+                f.write('}\n')
+            else:
+                f.write(f"--test {item['tests'][0]}\n")
+    print(f"Pabot ordering file generated at: {output_path}")
+    return output_path
+
+
+def schedule(test_dir, processes=4, history_files=(), history_db=None, group_tags=None,
+             output_path='reports/pabot_ordering.txt'):
+    """
+    Create the ordering file and report the predicted makespan.
+
+    Args:
+        test_dir (str): Folder with the test suites
+        processes (int): Number of pabot processes
+        history_files (list): Previous output.xml files
+        history_db (str): Run history database created by run_history.py
+        group_tags (list): Tags whose tests must share a worker (default: database)
+        output_path (str): Path of the ordering file
+
+    Returns:
+        dict: Predicted makespan of the LPT and default orderings, worker loads and fallback count
+    """
+    tests = collect_tests(test_dir, DEFAULT_GROUP_TAGS if group_tags is None else group_tags)
+    fallbacks = estimate_durations(tests, load_durations(history_files, history_db))
+    items = build_items(tests)
+    ordered = lpt_order(items)
+    makespan, loads = simulate(ordered, processes)
+    default_makespan = simulate(items, processes)[0]
+    save_ordering_file(ordered, output_path)
+
+    report = {
+        'processes': processes,
+        'tests': len(tests),
+        'tests_without_history': fallbacks,
+        'total_duration': round(sum(test['duration'] for test in tests), 3),
+        'predicted_makespan': round(makespan, 3),
+        'default_order_makespan': round(default_makespan, 3),
+        'worker_loads': [round(load, 3) for load in loads],
+        'groups': {item['name']: len(item['tests']) for item in items if len(item['tests']) > 1},
+    }
+    print(f"Tests: {report['tests']} ({fallbacks} without history)")
+    print(f"Predicted makespan: {makespan:.2f}s (default order: {default_makespan:.2f}s, "
+          f"total: {report['total_duration']:.2f}s, {processes} processes)")
+    return report
+
+
+def main():
+    """
+    Main function for command-line execution.
+
+    Command-line arguments:
+        test_dir: Folder with the test suites (default: tests)
+        --processes: Number of pabot processes (default: 4)
+        --history: Previous output.xml, repeat for each file
+        --history-db: Run history database created by run_history.py
+        --group-tag: Tag whose tests must share a worker, repeat for each tag (default: database)
+        --output: Path of the ordering file (default: reports/pabot_ordering.txt)
+        --report: Path of a JSON file to save the schedule report
+
+    Example usage:
+        python tools/pabot_scheduler.py tests --history-db reports/history/run_history.db --processes 4
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Duration-aware pabot ordering file')
+    parser.add_argument('test_dir', nargs='?', default='tests', help='Folder with the test suites')
+    parser.add_argument('--processes', type=int, default=4, help='Number of pabot processes')
+    parser.add_argument('--history', action='append', default=[], help='Previous output.xml (repeatable)')
+    parser.add_argument('--history-db', help='Run history database created by run_history.py')
+    parser.add_argument('--group-tag', action='append', dest='group_tags',
+                        help='Tag whose tests must share a worker (repeatable, default: database)')
+    parser.add_argument('--output', default='reports/pabot_ordering.txt', help='Path of the ordering file')
+    parser.add_argument('--report', help='Path of a JSON file to save the schedule report')
+    args = parser.parse_args()
+
+    report = schedule(args.test_dir, args.processes, args.history, args.history_db, args.group_tags, args.output)
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
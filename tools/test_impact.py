@@ -0,0 +1,506 @@
+"""
+Test Impact Analysis Script
+
+This script selects the tests affected by a git diff, so a push only runs the tests that can
+be impacted by its changes:
+1. All .robot/.resource files and Python libraries are parsed into a dependency graph:
+   test -> keywords -> resource files and Python libraries (and the files they import)
+2. The parsed data of each file is cached by its SHA-256, so only changed files are parsed again
+3. Changed lines of the diff are mapped to the keywords and tests that contain them. Changes
+   outside a keyword or test (settings, variables, module level code) impact the whole file
+4. Data files (JSON, SQL, ...) impact the keywords and tests that mention their name, or their
+   folder followed by a variable file name
+5. The affected tests are written as a robot/pabot argument file (--test <full name>)
+
+Changes to dependency files (pyproject.toml, uv.lock) or to files that cannot be mapped
+select all tests (empty argument file).
+
+Usage:
+    python tools/test_impact.py --base origin/main --output reports/impact_args.txt
+    pabot --argumentfile reports/impact_args.txt tests
+"""
+
+import ast
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+from robot.api import TestSuite
+from robot.api.parsing import Token, get_init_model, get_model, get_resource_model
+from robot.utils import normalize
+
+project_root = Path(__file__).parent.parent
+
+CACHE_VERSION = 1
+SOURCE_DIRS = ['tests', 'resources']
+ROBOT_SUFFIXES = ('.robot', '.resource')
+RUN_ALL_FILES = ['pyproject.toml', 'uv.lock']
+IGNORED_PREFIXES = ['.github/', 'documentation/', 'tools/', 'reports/']
+IGNORED_SUFFIXES = ('.md',)
+FIXTURE_SETTINGS = ('SuiteSetup', 'SuiteTeardown', 'TestSetup', 'TestTeardown', 'TestTemplate')
+IGNORED_STATEMENTS = ('Documentation', 'Arguments', 'Tags', 'Timeout', 'Comment')
+NO_TESTS_ARGUMENTS = ['--include', 'no-affected-tests', '--runemptysuite']
+PATH_TOKEN = re.compile(r'[\w.${}\[\]-]+(?:/[\w.${}\[\]-]+)+|[\w-]+\.(?:json|sql|txt|csv|xlsx|js|env|har|png|jpg)\b')
+VARIABLE = re.compile(r'\$\{[^}]*\}')
+
+
+def file_hash(path):
+    """Return the SHA-256 of a file."""
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def mentions_of(values):
+    """
+    Return the file names, and the folders of variable file names, mentioned by argument values.
+
+    Args:
+        values (list): Argument values
+
+    Returns:
+        list: Sorted names, without the variable parts of the paths
+    """
+    mentions = set()
+    for value in values:
+        for match in PATH_TOKEN.findall(value):
+            parts = [part for part in match.split('/') if part and part not in ('.', '..')]
+            for index, part in enumerate(parts):
+                if VARIABLE.search(part):
+                    continue
+                # A folder is only a mention when the rest of the path is variable (e.g. jsonSchema/${name})
+                if index == len(parts) - 1 or VARIABLE.search(parts[index + 1]):
+                    mentions.add(part.lower())
+    return sorted(mentions)
+
+
+def parse_robot_file(path):
+    """
+    Parse a .robot/.resource file into imports, keywords, tests and suite fixtures.
+
+    Args:
+        path (Path): File path
+
+    Returns:
+        dict: Parsed data stored in the cache
+    """
+    if path.name == '__init__.robot':
+        model = get_init_model(str(path))
+    elif path.suffix == '.resource':
+        model = get_resource_model(str(path))
+    else:
+        model = get_model(str(path))
+
+    data = {'type': 'robot', 'imports': [], 'keywords': [], 'tests': [], 'fixtures': [], 'mentions': []}
+    file_values = []
+    for node in ast.walk(model):
+        node_type = type(node).__name__
+        if node_type in ('ResourceImport', 'LibraryImport', 'VariablesImport'):
+            data['imports'].append({'kind': node_type, 'name': node.name, 'args': list(getattr(node, 'args', ()))})
+        elif node_type in FIXTURE_SETTINGS:
+            data['fixtures'].extend(token.value for token in node.get_tokens(Token.NAME, Token.ARGUMENT))
+        elif node_type in ('Keyword', 'TestCase'):
+            calls, values = [], []
+            for statement in ast.walk(node):
+                if hasattr(statement, 'get_tokens') and statement is not node.header \
+                        and type(statement).__name__ not in IGNORED_STATEMENTS:
+                    calls.extend(token.value for token in statement.get_tokens(Token.KEYWORD, Token.NAME))
+                    arguments = [token.value for token in statement.get_tokens(Token.ARGUMENT)]
+                    calls.extend(arguments)
+                    values.extend(arguments)
+            definition = {'name': node.name, 'start': node.lineno, 'end': node.end_lineno,
+                          'calls': sorted(set(calls)), 'mentions': mentions_of(values)}
+            data['keywords' if node_type == 'Keyword' else 'tests'].append(definition)
+        elif node_type == 'Variable':
+            file_values.extend(node.value)
+    data['mentions'] = mentions_of(file_values + data['fixtures'] +
+                                   [arg for item in data['imports'] for arg in [item['name']] + item['args']])
+    return data
+
+
+def parse_python_file(path):
+    """
+    Parse a Python library into its keywords and its imports of other local modules.
+
+    Args:
+        path (Path): File path
+
+    Returns:
+        dict: Parsed data stored in the cache
+    """
+    tree = ast.parse(path.read_text(encoding='utf-8'))
+    data = {'type': 'python', 'imports': [], 'keywords': [], 'mentions': []}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            data['imports'].extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            data['imports'].append(node.module)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            decorators = {ast.unparse(decorator) for decorator in node.decorator_list}
+            if node.name.startswith('_') or 'not_keyword' in decorators:
+                continue
+            name = node.name.replace('_', ' ')
+            for decorator in node.decorator_list:
+                if isinstance(decorator, ast.Call) and getattr(decorator.func, 'id', '') == 'keyword' \
+                        and decorator.args and isinstance(decorator.args[0], ast.Constant):
+                    name = decorator.args[0].value
+            start = min([node.lineno] + [decorator.lineno for decorator in node.decorator_list])
+            data['keywords'].append({'name': name, 'start': start, 'end': node.end_lineno, 'calls': [],
+                                     'mentions': []})
+    return data
+
+
+def list_source_files():
+    """Return the relative paths of the .robot/.resource files and Python libraries."""
+    files = []
+    for source_dir in SOURCE_DIRS:
+        for path in (project_root / source_dir).rglob('*'):
+            if path.suffix in ROBOT_SUFFIXES or (path.suffix == '.py' and source_dir == 'resources'):
+                files.append(path.relative_to(project_root).as_posix())
+    return sorted(files)
+
+
+def load_graph(cache_file):
+    """
+    Load the parsed data of every source file, parsing only the files whose hash changed.
+
+    Args:
+        cache_file (Path): JSON cache of the parsed files
+
+    Returns:
+        tuple: Parsed data by relative path and the number of files parsed again
+    """
+    cache = {}
+    if cache_file.exists():
+        try:
+            cache = json.loads(cache_file.read_text(encoding='utf-8'))
+        except ValueError:
+            cache = {}
+    if cache.get('version') != CACHE_VERSION:
+        cache = {'version': CACHE_VERSION, 'files': {}}
+
+    files = {}
+    parsed = 0
+    for relative_path in list_source_files():
+        path = project_root / relative_path
+        digest = file_hash(path)
+        cached = cache['files'].get(relative_path)
+        if cached and cached['hash'] == digest:
+            files[relative_path] = cached['data']
+            continue
+        try:
+            data = parse_python_file(path) if path.suffix == '.py' else parse_robot_file(path)
+        except (SyntaxError, UnicodeDecodeError) as e:
+            print(f"Warning: could not parse {relative_path}: {e}")
+            data = {'type': 'unknown', 'imports': [], 'keywords': [], 'mentions': []}
+        files[relative_path] = data
+        cache['files'][relative_path] = {'hash': digest, 'data': data}
+        parsed += 1
+
+    if parsed or set(cache['files']) != set(files):
+        cache['files'] = {path: cache['files'][path] for path in files}
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        cache_file.write_text(json.dumps(cache), encoding='utf-8')
+    return files, parsed
+
+
+def resolve_import(name, importer, files):
+    """
+    Resolve an import name or path to a repository file.
+
+    Args:
+        name (str): Import name or path (e.g. ${EXECDIR}/resources/libraries/Files.py or Collections)
+        importer (str): Relative path of the importing file
+        files (dict): Parsed data by relative path
+
+    Returns:
+        str: Relative path of the imported file, or None for libraries outside the repository
+    """
+    value = name.replace('${EXECDIR}', str(project_root)).replace('${CURDIR}', str((project_root / importer).parent))
+    is_path = '/' in value or value.endswith(('.py', '.resource', '.robot'))
+    if not is_path:
+        module = value.replace('.', '/') + '.py'
+        candidates = [(project_root / importer).parent / module, project_root / 'resources/libraries' / module]
+    else:
+        path = Path(value)
+        candidates = [path] if path.is_absolute() else [(project_root / importer).parent / path, project_root / path]
+    for candidate in candidates:
+        try:
+            relative_path = candidate.resolve().relative_to(project_root.resolve()).as_posix()
+        except ValueError:
+            continue
+        # Paths to missing files are kept, so the importers of a deleted file are selected
+        if relative_path in files or is_path and candidate.suffix and not VARIABLE.search(relative_path) \
+                and candidate == candidates[0]:
+            return relative_path
+    basename = os.path.basename(VARIABLE.sub('', value))
+    matches = [path for path in files if path.endswith('/' + basename)] if basename else []
+    return matches[0] if len(matches) == 1 else None
+
+
+def import_dependencies(relative_path, files):
+    """Return the repository files imported by a file, including files given as library arguments."""
+    data = files.get(relative_path, {})
+    dependencies = set()
+    for item in data.get('imports', []):
+        if data['type'] == 'python':
+            resolved = resolve_import(item, relative_path, files)
+            if resolved and resolved in files:
+                dependencies.add(resolved)
+            continue
+        for value in [item['name']] + item['args']:
+            value = value.split('=', 1)[1] if item['kind'] == 'LibraryImport' and '=' in value else value
+            if value is item['name'] or '/' in value:
+                resolved = resolve_import(value, relative_path, files)
+                if resolved:
+                    dependencies.add(resolved)
+    return dependencies
+
+
+def import_closure(relative_path, files, cache):
+    """Return the file and everything it imports, directly or indirectly."""
+    if relative_path in cache:
+        return cache[relative_path]
+    closure = {relative_path}
+    cache[relative_path] = closure
+    for dependency in import_dependencies(relative_path, files):
+        closure |= import_closure(dependency, files, cache)
+    return closure
+
+
+def suite_closure(test_file, files, cache):
+    """Return the import closure of a test file and of the __init__.robot files of its folders."""
+    closure = set(import_closure(test_file, files, cache))
+    folder = Path(test_file).parent
+    while folder.parts:
+        init_file = (folder / '__init__.robot').as_posix()
+        if init_file in files:
+            closure |= import_closure(init_file, files, cache)
+        folder = folder.parent
+    return closure
+
+
+def keyword_matcher(name):
+    """Return a function matching call names against a keyword name (with embedded arguments)."""
+    if '${' not in name:
+        normalized = normalize(name, ignore='_')
+        return lambda call: normalize(call, ignore='_') == normalized
+    pattern = re.compile(''.join('.*?' if VARIABLE.fullmatch(part) else re.escape(part)
+                                 for part in re.split(r'(\$\{[^}]*\})', name)), re.IGNORECASE)
+    return lambda call: bool(pattern.fullmatch(call))
+
+
+def parse_git_diff(base):
+    """
+    Return the changed files and changed line ranges between a git revision and the working tree.
+
+    Args:
+        base (str): Git revision, e.g. origin/main or the SHA before a push
+
+    Returns:
+        dict: Changed line ranges (new file side) by relative path, None for deleted files
+    """
+    output = subprocess.run(['git', 'diff', '--unified=0', '--no-color', '--no-renames', base],
+                            cwd=project_root, capture_output=True, text=True, check=True).stdout
+    output += ''.join(f"+++ b/{path}\n@@ -0,0 +1 @@\n" for path in subprocess.run(
+        ['git', 'ls-files', '--others', '--exclude-standard'], cwd=project_root, capture_output=True,
+        text=True, check=True).stdout.splitlines())
+
+    changes = {}
+    old_path = current = None
+    for line in output.splitlines():
+        if line.startswith('--- '):
+            old_path = line[6:] if line.startswith('--- a/') else None
+        elif line.startswith('+++ '):
+            current = line[6:] if line.startswith('+++ b/') else None
+            if current is None:
+                changes[old_path] = None
+            else:
+                changes.setdefault(current, [])
+        elif line.startswith('@@') and current is not None:
+            match = re.match(r'@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@', line)
+            start, count = int(match.group(1)), int(match.group(2) or 1)
+            changes[current].append((start, start + max(count, 1) - 1))
+    return changes
+
+
+def select_affected_tests(changes, files, test_dir='tests'):
+    """
+    Select the tests affected by the changes.
+
+    Args:
+        changes (dict): Changed line ranges by relative path (None for deleted files)
+        files (dict): Parsed data by relative path
+        test_dir (str): Folder with the test suites
+
+    Returns:
+        tuple: Affected test full names (None means all tests) and the reason of each selection
+    """
+    changed_files = set()
+    changed_definitions = set()
+    changed_names = set()
+    reasons = []
+
+    for path, ranges in changes.items():
+        if path in RUN_ALL_FILES:
+            return None, [f"{path} changed: running all tests"]
+        if path.startswith(tuple(IGNORED_PREFIXES)) or path.endswith(IGNORED_SUFFIXES):
+            continue
+        if path in files and ranges is not None:
+            data = files[path]
+            definitions = data.get('keywords', []) + data.get('tests', [])
+            for start, end in ranges:
+                touched = [d for d in definitions if d['start'] <= end and start <= d['end']]
+                if not touched:
+                    changed_files.add(path)
+                changed_definitions.update((path, d['name']) for d in touched)
+        elif path.endswith(ROBOT_SUFFIXES + ('.py',)) or path in files:
+            changed_files.add(path)
+        elif path.startswith(tuple(f"{source_dir}/" for source_dir in SOURCE_DIRS)):
+            # File name and its folder: the upper folders (e.g. resources/files) are mentioned everywhere
+            changed_names.update(part.lower() for part in Path(path).parts[-2:])
+            mentioned = any(set(data.get('mentions', [])) & changed_names or
+                            any(set(d['mentions']) & changed_names for d in data.get('keywords', []) + data.get('tests', []))
+                            for data in files.values())
+            if not mentioned:
+                return None, [f"{path} changed and is not referenced by name: running all tests"]
+
+    # Python libraries importing a changed module change as a whole
+    for path, data in files.items():
+        if data['type'] == 'python' and import_dependencies(path, files) & changed_files:
+            changed_files.add(path)
+    for path, data in files.items():
+        if set(data.get('mentions', [])) & changed_names:
+            changed_files.add(path)
+
+    closure_cache = {}
+    definitions = {}
+    for path, data in files.items():
+        for definition in data.get('keywords', []):
+            definitions.setdefault(path, []).append((definition, keyword_matcher(definition['name'])))
+
+    affected = []
+    root = Path(test_dir)
+    for test_file in sorted(path for path in files if path.startswith(f"{root.as_posix()}/")
+                            and path.endswith('.robot') and not path.endswith('__init__.robot')):
+        data = files[test_file]
+        closure = suite_closure(test_file, files, closure_cache)
+        suite_name = '.'.join(TestSuite.name_from_source(Path(*Path(test_file).parts[:index + 1]))
+                              for index in range(len(root.parts) - 1, len(Path(test_file).parts)))
+        file_changes = closure & changed_files
+        if file_changes:
+            affected.extend(f"{suite_name}.{test['name']}" for test in data['tests'])
+            reasons.append(f"{test_file}: all tests ({', '.join(sorted(file_changes))} changed)")
+            continue
+
+        scope = [(path, definition, matcher) for path in sorted(closure) for definition, matcher in
+                 definitions.get(path, [])]
+        reached_cache = {}
+        fixtures = [value for path in closure for value in files.get(path, {}).get('fixtures', [])]
+        for test in data['tests']:
+            reached = reach(test['calls'] + fixtures, scope, reached_cache)
+            reached.add((test_file, test['name']))
+            hits = reached & changed_definitions
+            mentions = set(test['mentions']).union(*[set(definition['mentions']) for path, definition, _ in scope
+                                                      if (path, definition['name']) in reached])
+            if hits or mentions & changed_names:
+                affected.append(f"{suite_name}.{test['name']}")
+                reasons.append(f"{suite_name}.{test['name']}: " +
+                               ', '.join(sorted(f"{path}::{name}" for path, name in hits) or sorted(mentions & changed_names)))
+    return affected, reasons
+
+
+def reach(calls, scope, cache):
+    """Return the keyword definitions reached from the calls, following the keywords they call."""
+    reached = set()
+    pending = list(calls)
+    seen = set()
+    while pending:
+        call = pending.pop()
+        if call in seen:
+            continue
+        seen.add(call)
+        if call in cache:
+            reached |= cache[call]
+            continue
+        for path, definition, matcher in scope:
+            if matcher(call) or ('.' in call and matcher(call.rsplit('.', 1)[1])):
+                key = (path, definition['name'])
+                if key not in reached:
+                    reached.add(key)
+                    pending.extend(definition['calls'])
+    return reached
+
+
+def save_argument_file(affected, output_path):
+    """
+    Save the robot/pabot argument file.
+
+    Args:
+        affected (list): Affected test full names, None for all tests
+        output_path (str): Path of the argument file
+
+    Returns:
+        str: Path of the generated file
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        if affected is None:
+            f.write('# All tests are affected\n')
+        elif not affected:
+            f.write('# No affected tests\n' + '\n'.join(NO_TESTS_ARGUMENTS) + '\n')
+        else:
+            f.writelines(f"--test {name}\n" for name in affected)
+    print(f"Argument file generated at: {output_path}")
+    return output_path
+
+
+def main():
+    """
+    Main function for command-line execution.
+
+    Command-line arguments:
+        --base: Git revision compared with the working tree (default: origin/main)
+        --test-dir: Folder with the test suites (default: tests)
+        --output: Path of the argument file (default: reports/impact_args.txt)
+        --cache: Path of the parsed files cache (default: .test_impact_cache.json)
+        --verbose: Print why each test was selected
+
+    Example usage:
+        python tools/test_impact.py --base HEAD~1 --output reports/impact_args.txt --verbose
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Test impact analysis')
+    parser.add_argument('--base', default='origin/main', help='Git revision compared with the working tree')
+    parser.add_argument('--test-dir', default='tests', help='Folder with the test suites')
+    parser.add_argument('--output', default='reports/impact_args.txt', help='Path of the argument file')
+    parser.add_argument('--cache', default=str(project_root / '.test_impact_cache.json'),
+                        help='Path of the parsed files cache')
+    parser.add_argument('--verbose', action='store_true', help='Print why each test was selected')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    files, parsed = load_graph(Path(args.cache))
+    try:
+        changes = parse_git_diff(args.base)
+    except subprocess.CalledProcessError as e:
+        print(f"Could not diff against {args.base} ({e.stderr.strip()}): running all tests")
+        affected, reasons = None, []
+    else:
+        affected, reasons = select_affected_tests(changes, files, args.test_dir)
+
+    save_argument_file(affected, args.output)
+    elapsed = time.perf_counter() - start
+    if args.verbose:
+        for reason in reasons:
+            print(f"  {reason}")
+    selected = 'all' if affected is None else len(affected)
+    print(f"Affected tests: {selected} ({len(files)} files, {parsed} parsed, {elapsed:.3f}s)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())